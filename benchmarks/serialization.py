@@ -0,0 +1,90 @@
+# Copyright (C) 2022 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark of json codecs on documents decoded by the serialization module.
+
+Compares decoding by json and orjson of the json documents MI loads through
+srcopsmetrics.entities.tools.serialization: plain json documents (manifests,
+processed knowledge, metrics) and records of checkpoint spill files, and checks
+that both codecs give the same values. Json lines knowledge files are parsed
+by pandas read_json and are not affected by the codec, so they are skipped.
+Files are found in KNOWLEDGE_PATH if no files are given.
+
+Usage:
+    python -m benchmarks.serialization [file ...]
+"""
+
+import os
+import sys
+import timeit
+from pathlib import Path
+from typing import List, Optional
+
+from srcopsmetrics.entities.tools import serialization
+from srcopsmetrics.entities.tools.compression import decompress
+from srcopsmetrics.entities.tools.storage import read_spill_lines
+from srcopsmetrics.enums import JsonBackendEnum, StoragePath
+
+
+def find_files() -> List[Path]:
+    """Find all json documents and checkpoint spill files in knowledge path."""
+    location = Path(os.getenv(StoragePath.LOCATION_VAR.value, StoragePath.DEFAULT.value))
+    return sorted(location.glob("**/*.json")) + sorted(location.glob("**/*.jsonl.gz"))
+
+
+def get_documents(file_path: Path) -> Optional[List[str]]:
+    """Get json documents decoded by the serialization module from file, None for json lines knowledge."""
+    if file_path.name.endswith(".jsonl.gz"):
+        return list(read_spill_lines(file_path))
+
+    data = decompress(file_path.read_bytes()).decode()
+    if data.strip().count("\n") > 0:
+        return None
+    return [data]
+
+
+def decode(documents: List[str], backend: JsonBackendEnum) -> list:
+    """Decode documents with the serialization module using given backend."""
+    with serialization.use_json_backend(backend):
+        return [serialization.loads(document) for document in documents]
+
+
+def main(file_paths: List[Path]):
+    """Run the benchmark and print timings."""
+    if serialization.orjson is None:
+        print("orjson is not installed, nothing to compare")
+        return
+
+    for file_path in file_paths:
+        documents = get_documents(file_path)
+        if documents is None:
+            print(f"{str(file_path):>60} json lines knowledge parsed by pandas, skipped")
+            continue
+
+        assert decode(documents, JsonBackendEnum.JSON) == decode(documents, JsonBackendEnum.ORJSON)
+
+        size = sum(len(document) for document in documents)
+        baseline = min(timeit.repeat(lambda: decode(documents, JsonBackendEnum.JSON), number=1, repeat=3))
+        duration = min(timeit.repeat(lambda: decode(documents, JsonBackendEnum.ORJSON), number=1, repeat=3))
+        print(
+            f"{str(file_path):>60} {size / 1e6:8.1f}MB {len(documents):>8} documents: "
+            f"json {baseline:7.3f}s  orjson {duration:7.3f}s  ({baseline / duration:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main([Path(p) for p in sys.argv[1:]] or find_files())
@@ -0,0 +1,93 @@
+# Copyright (C) 2022 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark of stored entities validation.
+
+Compares voluptuous validation of the whole entities schema with compiled
+schema validation on synthetic pull request knowledge.
+
+Usage:
+    python -m benchmarks.validation [number_of_pull_requests]
+"""
+
+import random
+import sys
+import timeit
+
+from srcopsmetrics.entities.pull_request import PullRequest
+from srcopsmetrics.entities.tools.validation import validate_entities
+from srcopsmetrics.enums import ValidationModeEnum
+
+
+def generate_pull_requests(number: int):
+    """Generate pull request knowledge consistent with PullRequest schema."""
+    pull_requests = {}
+    for idx in range(number):
+        files = [f"src/module_{i}.py" for i in range(random.randint(1, 10))]
+        pull_requests[str(idx)] = {
+            "title": f"Pull request {idx}",
+            "body": "word " * random.randint(0, 200),
+            "size": "M",
+            "labels": ["size/M", "approved"],
+            "created_by": f"user_{idx % 50}",
+            "created_at": 1600000000 + idx,
+            "closed_at": 1600003600 + idx,
+            "closed_by": f"user_{idx % 7}",
+            "merged_at": None,
+            "merged_by": None,
+            "commits_number": 3,
+            "changed_files": files,
+            "changed_files_number": len(files),
+            "changed_files_changes": {f: random.randint(1, 100) for f in files},
+            "interactions": {f"user_{i}": random.randint(1, 100) for i in range(random.randint(0, 5))},
+            "reviews": {
+                str(idx * 10 + i): {
+                    "author": f"user_{i}",
+                    "words_count": 10,
+                    "submitted_at": 1600001000 + idx,
+                    "state": "APPROVED",
+                }
+                for i in range(random.randint(0, 3))
+            },
+            "commits": ["0123456789abcdef"] * 3,
+            "files": files,
+            "first_review_at": 1600001000 + idx,
+            "first_approve_at": 1600001000 + idx,
+        }
+    return pull_requests
+
+
+def main(number: int):
+    """Run the benchmark and print timings."""
+    pull_requests = generate_pull_requests(number)
+
+    timings = {
+        "voluptuous": lambda: PullRequest.entities_schema()(pull_requests),
+        "compiled": lambda: validate_entities(PullRequest.entity_schema, pull_requests, mode=ValidationModeEnum.FULL),
+        "sampled": lambda: validate_entities(PullRequest.entity_schema, pull_requests, mode=ValidationModeEnum.SAMPLE),
+    }
+
+    print(f"Validation of {number} pull requests (best of 3)")
+    baseline = None
+    for name, validation in timings.items():
+        duration = min(timeit.repeat(validation, number=1, repeat=3))
+        baseline = baseline or duration
+        print(f"{name:>12}: {duration:8.3f}s  ({baseline / duration:6.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -18,14 +18,16 @@
 """Create, Visualize, Use bot knowledge from different Software Development Platforms."""
 
 import logging
+import os
 from importlib import import_module
 from pathlib import Path
 from pkgutil import iter_modules
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from srcopsmetrics.entities import Entity, NOT_FOR_INSPECTION
 from srcopsmetrics.exceptions import NotKnownEntitiesError
 from srcopsmetrics.github_knowledge import GitHubKnowledge
+from srcopsmetrics.processing import Processing
 from srcopsmetrics import utils
 from srcopsmetrics import entities
 
@@ -57,13 +59,33 @@ def _get_all_entities():
     return entities_classes
 
 
-def analyse_projects(repositories: List[str], is_local: bool = False, entities: Optional[List[str]] = None) -> None:
+def _get_inspected_entities(entities: Optional[List[str]] = None):
+    """Return specified entities, all of the entities if none is specified."""
+    allowed_entities = _get_all_entities()
+
+    specified_entities = []
+    if entities:
+        specified_entities = [e for e in allowed_entities if e.__name__ in entities]
+        if specified_entities == []:
+            raise NotKnownEntitiesError(message="", specified_entities=entities, available_entities=allowed_entities)
+
+    return specified_entities or allowed_entities
+
+
+def analyse_projects(
+    repositories: List[str],
+    is_local: bool = False,
+    entities: Optional[List[str]] = None,
+    process_knowledge: bool = False,
+) -> None:
     """Run Issues (that are not PRs), PRs, PR Reviews analysis on specified projects.
 
     Arguments:
         projects {List[Tuple[str, str]]} -- one tuple should be in format (project_name, repository_name)
         is_local {bool} -- if set to False, Ceph will be used
         entities {Optional[List[str]]} -- entities that will be analysed. If not specified, all are used.
+        process_knowledge {bool} -- if set, newly extracted issues and pull requests are folded
+            into the processed knowledge of the project
 
     """
     path = Path.cwd().joinpath("./srcopsmetrics/bot_knowledge")
@@ -74,25 +96,59 @@ def analyse_projects(repositories: List[str], is_local: bool = False, entities:
         project_path = path.joinpath("./" + github_repo.full_name)
         utils.check_directory(project_path)
 
-        allowed_entities = _get_all_entities()
-
-        specified_entities = []
-        if entities:
-            specified_entities = [e for e in allowed_entities if e.__name__ in entities]
-            if specified_entities == []:
-                raise NotKnownEntitiesError(
-                    message="", specified_entities=entities, available_entities=allowed_entities
-                )
-
-        inspected_entities = specified_entities or allowed_entities
+        inspected_entities = _get_inspected_entities(entities)
 
+        new_entities: Dict[str, Dict[str, Any]] = {}
         for entity in inspected_entities:
             _LOGGER.info("%s inspection" % entity.__name__)
-            github_knowledge.analyse_entity(
+            new_entities[entity.__name__] = github_knowledge.analyse_entity(
                 github_repo=github_repo, project_path=project_path, entity_cls=entity, is_local=is_local
             )
             _LOGGER.info("\n")
 
+        if process_knowledge:
+            os.environ["PROJECT"] = github_repo.full_name
+            Processing(
+                issues=new_entities.get("Issue", {}), pull_requests=new_entities.get("PullRequest", {})
+            ).update()
+
+
+def compact_projects(repositories: List[str], is_local: bool = False, entities: Optional[List[str]] = None) -> None:
+    """Compact stored knowledge of specified projects and report bytes saved and load time improvement.
+
+    Arguments:
+        repositories {List[str]} -- repositories whose knowledge is compacted
+        is_local {bool} -- if set to False, Ceph will be used
+        entities {Optional[List[str]]} -- entities that will be compacted. If not specified, all are used.
+
+    """
+    inspected_entities = _get_inspected_entities(entities)
+
+    size_saved = 0
+    for repo in repositories:
+        _LOGGER.info("######################## Compacting %s ########################\n" % repo)
+
+        for entity in inspected_entities:
+            stats = entity(repository_name=repo).compact_knowledge(is_local=is_local)
+            if not stats:
+                continue
+
+            size_saved += stats["size_before"] - stats["size_after"]
+            _LOGGER.info(
+                "%s: %d -> %d entities, %d -> %d bytes, load time %.2fs -> %.2fs"
+                % (
+                    entity.__name__,
+                    stats["entities_before"],
+                    stats["entities_after"],
+                    stats["size_before"],
+                    stats["size_after"],
+                    stats["load_time_before"],
+                    stats["load_time_after"],
+                )
+            )
+
+    _LOGGER.info("Compaction saved %d bytes in total" % size_saved)
+
 
 def visualize_project_results(project: str, is_local: bool = False):
     """Visualize results for a project."""
@@ -19,14 +19,16 @@
 
 import logging
 import os
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from typing import List, Optional
 
 import click
 from tqdm.contrib.logging import logging_redirect_tqdm
 
-from srcopsmetrics.bot_knowledge import analyse_projects
+from srcopsmetrics.bot_knowledge import analyse_projects, compact_projects
+from srcopsmetrics.entities.tools.storage import map_concurrently
 from srcopsmetrics.enums import EntityTypeEnum, StoragePath
+from srcopsmetrics.evaluate_scores import suggest_reviewers
 from srcopsmetrics.github_knowledge import GitHubKnowledge
 from srcopsmetrics.kebechet_metrics import KebechetMetrics
 from srcopsmetrics.kebechet_sli_slo_metrics import KebechetSliSloMetrics
@@ -104,6 +106,21 @@ def _set_env_vars(is_local: bool, knowledge_path: Optional[str], merge_path: Opt
             Storage location is {StoragePath.KNOWLEDGE.value}
             Removes all previously processed storage""",
 )
+@click.option(
+    "--process-knowledge",
+    "-p",
+    is_flag=True,
+    help="""Fold issues and pull requests newly extracted by knowledge creation
+            into processed knowledge of a project repository.
+            Must be used in conjunction with -c""",
+)
+@click.option(
+    "--compact",
+    is_flag=True,
+    help="""Compact stored knowledge of a project repository.
+            Duplicate entities are removed and entities are sorted by id,
+            knowledge is saved partitioned if MI_PARTITION_KNOWLEDGE is set.""",
+)
 @click.option(
     "--is-local",
     "-l",
@@ -140,6 +157,20 @@ def _set_env_vars(is_local: bool, knowledge_path: Optional[str], merge_path: Opt
     required=False,
     help="""Launch performance analysis of Thoth Kebechet managers for specified repository for yesterday.""",
 )
+@click.option(
+    "--since",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    required=False,
+    help="""Backfill Kebechet metrics for every day since this date (e.g. 2021-01-01).
+            Must be used in conjunction with -t""",
+)
+@click.option(
+    "--until",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    required=False,
+    help="""Last day of Kebechet metrics backfill, yesterday by default.
+            Must be used in conjunction with -t and --since""",
+)
 @click.option(
     "--metrics",
     "-x",
@@ -161,6 +192,14 @@ def _set_env_vars(is_local: bool, knowledge_path: Optional[str], merge_path: Opt
     default=StoragePath.MERGE_PATH.value,
     help="""Data/statistics are stored under this path.""",
 )
+@click.option(
+    "--reviewers",
+    "-R",
+    type=int,
+    required=False,
+    help="""Suggest this number of the best reviewers for specified repositories.
+            Reviewer scores are kept in an index stored with the processed knowledge.""",
+)
 @click.option(
     "--sli-slo",
     is_flag=True,
@@ -171,16 +210,34 @@ def cli(
     repository: Optional[str],
     organization: Optional[str],
     create_knowledge: bool,
+    process_knowledge: bool,
+    compact: bool,
     is_local: bool,
     entities: Optional[str],
     knowledge_path: str,
     thoth: bool,
+    since: Optional[datetime],
+    until: Optional[datetime],
     metrics: bool,
     merge: bool,
     merge_path: str,
     sli_slo: bool,
+    reviewers: Optional[int],
 ):
     """Command Line Interface for SrcOpsMetrics."""
+    if (since or until) and not thoth:
+        raise click.BadParameter("can be used only in conjunction with -t", param_hint="--since/--until")
+
+    today = date.today()
+    yesterday = today - timedelta(days=1)
+
+    first_day = since.date() if since else yesterday
+    last_day = until.date() if until else yesterday
+    if first_day > last_day:
+        raise click.BadParameter(f"{first_day} is after the last day {last_day}", param_hint="--since")
+
+    days = [first_day + timedelta(days=i) for i in range((last_day - first_day).days + 1)]
+
     _check_env_vars(is_local=is_local)
     _set_env_vars(is_local=is_local, knowledge_path=knowledge_path, merge_path=merge_path)
 
@@ -188,35 +245,43 @@ def cli(
     entities_args = _parse_entities(entities)
 
     if create_knowledge:
-        analyse_projects(repositories=repos, is_local=is_local, entities=entities_args)
+        analyse_projects(
+            repositories=repos, is_local=is_local, entities=entities_args, process_knowledge=process_knowledge
+        )
+
+    if compact:
+        compact_projects(repositories=repos, is_local=is_local, entities=entities_args)
+
+    if reviewers:
+        suggest_reviewers(repositories=repos, number_reviewer=reviewers, is_local=is_local)
 
     # for project in repos:
     #     os.environ["PROJECT"] = project
 
-    today = date.today()
-    yesterday = today - timedelta(days=1)
-
     if thoth:
         _LOGGER.info("#### Launching thoth data analysis ####")
 
         if repos and not merge and not sli_slo:
-            for repo in repos:
+
+            def _evaluate_and_store(repo: str):
                 _LOGGER.info("Creating metrics for repository %s" % repo)
-                kebechet_metrics = KebechetMetrics(repository=repo, day=yesterday, is_local=is_local)
-                kebechet_metrics.evaluate_and_store_kebechet_metrics()
+                kebechet_metrics = KebechetMetrics(repository=repo, day=last_day, is_local=is_local)
+                kebechet_metrics.evaluate_and_store_kebechet_metrics(since=first_day, until=last_day)
+
+            map_concurrently(_evaluate_and_store, repos, description="Creating metrics")
 
         if sli_slo:
             _LOGGER.info("#### Inspecting kebechet repositories and creating SLI/SLO metrics ####")
             keb_sli_slo = KebechetSliSloMetrics(repositories=repos, is_local=is_local)
             keb_sli_slo.evaluate_and_store_sli_slo_kebechet_metrics()
-            # keb_sli_slo.evaluate_and_store_usage_timestamp_sli_slo_kebechet_metrics()
+            keb_sli_slo.evaluate_and_store_usage_timestamp_sli_slo_kebechet_metrics()
 
     if merge:
         if thoth:
-            _LOGGER.info("Merging kebechet metrics for %s" % yesterday)
+            _LOGGER.info("Merging kebechet metrics from %s to %s" % (first_day, last_day))
 
             ## TODO: merge action omitted ?
-            KebechetMetrics.merge_kebechet_metrics_per_day(day=yesterday, is_local=is_local)
+            KebechetMetrics.merge_kebechet_metrics(days=days, is_local=is_local)
         else:
             raise NotImplementedError
 
@@ -20,9 +20,10 @@
 
 import logging
 import os
+import time
 from abc import ABCMeta, abstractmethod
 from pathlib import Path
-from typing import Collection, Optional
+from typing import Any, Collection, Dict, List, Optional
 
 import pandas as pd
 from github.Repository import Repository
@@ -30,7 +31,14 @@ from voluptuous.error import MultipleInvalid
 from voluptuous.schema_builder import Schema
 
 from srcopsmetrics import utils
-from srcopsmetrics.entities.tools.storage import KnowledgeStorage
+from srcopsmetrics.entities.tools.storage import (
+    DateLike,
+    KnowledgeStorage,
+    StoredEntities,
+    normalize_timestamps,
+    repair_timestamps,
+)
+from srcopsmetrics.entities.tools.validation import validate_entities
 from srcopsmetrics.enums import StoragePath
 
 _LOGGER = logging.getLogger(__name__)
@@ -39,6 +47,9 @@ _LOGGER = logging.getLogger(__name__)
 class Entity(metaclass=ABCMeta):
     """This class defines interface every entity class should implement."""
 
+    # date column by which the knowledge can be partitioned, see MI_PARTITION_KNOWLEDGE
+    partition_column: Optional[str] = None
+
     def __init__(self, repository_name: Optional[str] = None, repository: Optional[Repository] = None):
         """Initialize entity with github repository.
 
@@ -113,6 +124,21 @@ class Entity(metaclass=ABCMeta):
         appendix = ".json"  # if as_csv else ".json" TODO implement as_csv bool
         return project_path.joinpath("./" + self.filename + appendix)
 
+    @property
+    def partitions_path(self) -> Path:
+        """Get directory with time partitions of entity knowledge."""
+        return self.file_path.with_suffix("")
+
+    @property
+    def is_partitioned(self) -> bool:
+        """Check if entity knowledge is saved in time partitions."""
+        return self.partition_column is not None and os.getenv("MI_PARTITION_KNOWLEDGE") == "True"
+
+    @property
+    def date_columns(self) -> List[str]:
+        """Get columns of the entity with dates, stored as POSIX timestamps."""
+        return [key for key in self.entity_schema.schema if isinstance(key, str) and key.endswith("_at")]
+
     def save_knowledge(
         self,
         file_path: Path = None,
@@ -120,18 +146,28 @@ class Entity(metaclass=ABCMeta):
         as_csv: bool = False,
         from_dataframe: bool = False,
         from_singleton: bool = False,
-    ):
-        """Save collected knowledge as json."""
+    ) -> bool:
+        """Save collected knowledge as json.
+
+        Returns:
+            bool -- False if stored entities could not be saved, they are kept for the next attempt
+
+        """
         if self.stored_entities is None or len(self.stored_entities) == 0:
             _LOGGER.info("Nothing to store.")
             _LOGGER.info("\n")
-            return
+            return True
 
         if not file_path:
             file_path = self.file_path
 
+        stored_entities = self.stored_entities
+        if isinstance(stored_entities, StoredEntities):
+            # entities spilled during extraction are loaded only for saving
+            stored_entities = stored_entities.to_dict()
+
         try:
-            self.entities_schema()(self.stored_entities)  # check for entities schema
+            validate_entities(self.entity_schema, stored_entities)  # check for entities schema
         except MultipleInvalid as e:
             _LOGGER.warning("Data found to be inconsistent with its schema, original message:")
             _LOGGER.warning(str(e))
@@ -143,44 +179,81 @@ class Entity(metaclass=ABCMeta):
                 raise NotImplementedError
         else:
             try:
-                new_data = pd.DataFrame.from_dict(self.stored_entities).T
-                to_save = pd.concat([new_data, self.previous_knowledge])
+                new_data = pd.DataFrame.from_dict(stored_entities).T
+                # previous knowledge saved with dates in mixed units is repaired the first time it is saved again
+                previous_knowledge = repair_timestamps(self.previous_knowledge, self.date_columns)
+                to_save = pd.concat([new_data, previous_knowledge])
+                # entities resumed from checkpoint are in both new data and previous knowledge
+                to_save = to_save[~to_save.index.astype(str).duplicated(keep="first")]
             except Exception as e:
                 _LOGGER.warning("There was an error converting the stored entity to a DataFrame.")
                 _LOGGER.warning(str(e))
-                return
+                return False
 
         _LOGGER.info("Knowledge file %s", (os.path.basename(file_path)))
         _LOGGER.info("new %d entities", len(self.stored_entities))
         _LOGGER.info("(overall %d entities)", len(to_save))
 
-        if as_csv:
-            to_save = to_save.to_csv()
-        else:
-            # index labels not preserved with records encoding
-            # therefore duplicating index column
-            to_save["id"] = to_save.index
-            to_save = to_save.to_json(orient="records", lines=True)
+        storage = KnowledgeStorage(is_local=is_local)
 
-        if not is_local:
-            ceph_filename = os.path.relpath(file_path).replace("./", "")
-            s3 = KnowledgeStorage().get_ceph_store()
+        if as_csv:
+            storage.save_serialized(to_save.to_csv(), file_path, as_blob=True)
+            return True
+
+        # previous knowledge dates are saved in the same unit as the new ones
+        to_save = normalize_timestamps(to_save)
+
+        # index labels not preserved with records encoding
+        # therefore duplicating index column
+        to_save["id"] = to_save.index
+
+        if self.is_partitioned and not from_dataframe:
+            storage.save_partitioned_data(
+                self.partitions_path,
+                self.partition_column,
+                to_save,
+                updated_ids=set(str(key) for key in stored_entities.keys()),
+            )
+            # knowledge saved as a single file before is part of the partitions now
+            storage.remove(file_path)
+            return True
+
+        storage.save_serialized(to_save.to_json(orient="records", lines=True), file_path)
+        return True
+
+    def load_previous_knowledge(
+        self,
+        is_local: bool = False,
+        date_column: Optional[str] = None,
+        since: Optional[DateLike] = None,
+        until: Optional[DateLike] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """Load previously collected repo knowledge. If a repo was not inspected before, create its directory.
+
+        Arguments:
+            is_local {bool} -- load knowledge from local storage instead of Ceph
+            date_column {Optional[str]} -- date column of the time window, partition column by default
+            since {Optional[DateLike]} -- load only entities with date column at or after this date
+            until {Optional[DateLike]} -- load only entities with date column before this date
+            columns {Optional[List[str]]} -- load only given columns
+
+        If the knowledge is saved in time partitions, only partitions matching the time window are read.
+        Knowledge is loaded from the same layout it is saved to, see is_partitioned.
 
-            if as_csv:
-                s3.store_blob(to_save, ceph_filename)
-            else:
-                s3.store_document(to_save, ceph_filename)
+        """
+        storage = KnowledgeStorage(is_local=is_local)
+        date_column = date_column or self.partition_column
 
-            _LOGGER.info("Saved on CEPH at %s/%s%s" % (s3.bucket, s3.prefix, ceph_filename))
-        else:
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, "w") as f:
-                f.write(str(to_save))
-            _LOGGER.info("Saved locally at %s" % file_path)
+        df = None
+        if self.is_partitioned or (self.partition_column is not None and storage.get_size(self.file_path) == 0):
+            # knowledge partitioned before MI_PARTITION_KNOWLEDGE was unset is used until it is saved as a single file
+            df = storage.load_partitioned_data(
+                self.partitions_path, date_column=date_column, since=since, until=until, columns=columns
+            )
 
-    def load_previous_knowledge(self, is_local: bool = False) -> pd.DataFrame:
-        """Load previously collected repo knowledge. If a repo was not inspected before, create its directory."""
-        df = KnowledgeStorage(is_local=is_local).load_data(self.file_path)
+        if df is None:
+            df = storage.load_data(self.file_path, date_column=date_column, since=since, until=until, columns=columns)
 
         if df.empty:
             _LOGGER.info("No previous knowledge of type %s found" % self.name())
@@ -191,6 +264,59 @@ class Entity(metaclass=ABCMeta):
         )
         return df
 
+    def get_knowledge_size(self, is_local: bool = False) -> int:
+        """Get size of stored knowledge in bytes, including all of its partitions."""
+        storage = KnowledgeStorage(is_local=is_local)
+        paths = [self.file_path] + storage.get_partition_paths(self.partitions_path)
+        return sum(storage.get_size(path) for path in paths)
+
+    def compact_knowledge(self, is_local: bool = False) -> Dict[str, Any]:
+        """Rewrite stored knowledge without duplicate entities and sorted by id.
+
+        Knowledge is saved partitioned if MI_PARTITION_KNOWLEDGE is set, otherwise as a single
+        file, files of the other form are removed. Dates saved in mixed units are repaired.
+
+        Returns:
+            Dict[str, Any] -- entities, size in bytes and load time in seconds before and after compaction
+
+        """
+        size_before = self.get_knowledge_size(is_local=is_local)
+        start = time.perf_counter()
+        knowledge = self.load_previous_knowledge(is_local=is_local)
+        load_time_before = time.perf_counter() - start
+
+        if knowledge.empty:
+            return {}
+
+        compacted = knowledge[~knowledge.index.astype(str).duplicated(keep="first")]
+        compacted = compacted.sort_index(key=_get_id_sort_key, kind="stable")
+        compacted = normalize_timestamps(repair_timestamps(compacted.copy(), self.date_columns))
+        compacted = compacted.assign(id=compacted.index)
+
+        storage = KnowledgeStorage(is_local=is_local)
+        if self.is_partitioned:
+            storage.save_partitioned_data(self.partitions_path, self.partition_column, compacted)
+            storage.remove(self.file_path)
+        else:
+            partition_paths = storage.get_partition_paths(self.partitions_path)
+            storage.save_serialized(compacted.to_json(orient="records", lines=True), self.file_path)
+            for path in partition_paths:
+                storage.remove(path)
+
+        size_after = self.get_knowledge_size(is_local=is_local)
+        start = time.perf_counter()
+        self.load_previous_knowledge(is_local=is_local)
+        load_time_after = time.perf_counter() - start
+
+        return {
+            "entities_before": len(knowledge),
+            "entities_after": len(compacted),
+            "size_before": size_before,
+            "size_after": size_after,
+            "load_time_before": load_time_before,
+            "load_time_after": load_time_after,
+        }
+
     @abstractmethod
     def get_raw_github_data(self) -> pd.DataFrame:
         """Get all entities method from github using PyGithub."""
@@ -218,3 +344,9 @@ class Entity(metaclass=ABCMeta):
         else:
             _LOGGER.debug("New ids to be examined are %s" % only_new_ids)
         return [x for x in new_data if x.number in only_new_ids]
+
+
+def _get_id_sort_key(index: pd.Index) -> pd.Index:
+    """Sort numeric ids by their value, other ids as strings."""
+    numeric = pd.Index(pd.to_numeric(index.astype(str), errors="coerce"))
+    return index.astype(str) if numeric.isna().any() else numeric
@@ -26,6 +26,7 @@ from voluptuous.schema_builder import Schema
 from voluptuous.validators import Any
 
 from srcopsmetrics.entities import Entity
+from srcopsmetrics.entities.tools.github_object import memoize
 from srcopsmetrics.entities.tools.knowledge import GitHubKnowledge
 
 _LOGGER = logging.getLogger(__name__)
@@ -35,6 +36,8 @@ CROSS_REFERENCE_EVENT_KEYWORD = "cross-referenced"
 class Issue(Entity):
     """GitHub Issue entity."""
 
+    partition_column = "created_at"
+
     entity_schema = Schema(
         {
             "title": str,
@@ -63,14 +66,14 @@ class Issue(Entity):
         if issue.pull_request is not None:
             return  # we analyze issues and prs differentely
 
-        comments = issue.get_comments()
-        comments_list = [
-            {"created_at": int(com.created_at.timestamp()), "created_by": com.user.login, "body": com.body}
-            for com in comments
-        ]
+        issue = memoize(issue)
+
+        # timeline contains comments, labels and cross references, fetch it only once
+        timeline = list(issue.get_timeline())
+
+        comments_list = GitHubKnowledge.get_timeline_comments(timeline)
         commenters = set([com["created_by"] for com in comments_list])
 
-        timeline = issue.get_timeline()
         cross_references = [
             entry.source.issue.url for entry in timeline if entry.event == CROSS_REFERENCE_EVENT_KEYWORD
         ]
@@ -85,8 +88,8 @@ class Issue(Entity):
             "created_at": int(issue.created_at.timestamp()),
             "closed_by": issue.closed_by.login if issue.closed_by is not None else None,
             "closed_at": int(issue.closed_at.timestamp()) if issue.closed_at is not None else None,
-            "labels": GitHubKnowledge.get_labels(issue),
-            "interactions": GitHubKnowledge.get_interactions(comments),
+            "labels": GitHubKnowledge.get_timeline_labels(timeline),
+            "interactions": GitHubKnowledge.get_comments_interactions(comments_list),
             "first_response": first_response,
             "first_response_at": first_response_at,
             "commenters_number": len(commenters),
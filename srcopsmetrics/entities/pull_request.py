@@ -19,15 +19,19 @@
 """Pull Request entity class."""
 
 import logging
+from pathlib import Path
 from typing import Dict, Generator, List, Optional
 
+import pandas as pd
 from github.PaginatedList import PaginatedList
 from github.PullRequest import PullRequest as GithubPullRequest
 from voluptuous.schema_builder import Schema
 from voluptuous.validators import Any
 
 from srcopsmetrics.entities import Entity
+from srcopsmetrics.entities.tools.github_object import memoize
 from srcopsmetrics.entities.tools.knowledge import GitHubKnowledge
+from srcopsmetrics.entities.tools.storage import KnowledgeStorage, StoredEntities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,6 +40,8 @@ PullRequestReviews = Schema({str: PullRequestReview})
 
 ISSUE_KEYWORDS = {"close", "closes", "closed", "fix", "fixes", "fixed", "resolve", "resolves", "resolved"}
 
+PULL_REQUEST_FILES_COLUMNS = ["pr_id", "filename", "changes"]
+
 
 def get_first_review_time(reviews: Dict[Any, Any]) -> Optional[int]:
     """Return timestamp of the first PR review."""
@@ -49,9 +55,34 @@ def get_approve_time(reviews: Dict[Any, Any]) -> Optional[int]:
     return min(approvals) if approvals else None
 
 
+def get_pull_request_files(pull_requests: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """Get long format table of files changed by the pull requests.
+
+    Arguments:
+        pull_requests {Optional[pd.DataFrame]} -- pull requests knowledge indexed by pull request id
+
+    Returns:
+        pd.DataFrame -- one row with pr_id, filename and changes for every file changed by a pull request
+
+    """
+    if pull_requests is None or pull_requests.empty or "changed_files_changes" not in pull_requests.columns:
+        return pd.DataFrame(columns=PULL_REQUEST_FILES_COLUMNS)
+
+    changes = pull_requests.changed_files_changes.map(
+        lambda files: list(files.items()) if isinstance(files, dict) else []
+    ).explode()
+    changes = changes[changes.notna()]
+
+    files = pd.DataFrame(changes.tolist(), columns=["filename", "changes"])
+    files.insert(0, "pr_id", changes.index.astype(int))
+    return files
+
+
 class PullRequest(Entity):
     """GitHub PullRequest entity."""
 
+    partition_column = "created_at"
+
     entity_schema = Schema(
         {
             "title": str,
@@ -77,10 +108,77 @@ class PullRequest(Entity):
         }
     )
 
+    @property
+    def files_path(self) -> Path:
+        """Get path of the table of files changed by the pull requests, stored alongside the knowledge."""
+        return self.file_path.with_name(f"{self.filename}Files.json")
+
     def analyse(self) -> PaginatedList:
         """Override :func:`~Entity.analyse`."""
         return self.get_raw_github_data()
 
+    def save_knowledge(
+        self,
+        file_path: Path = None,
+        is_local: bool = False,
+        as_csv: bool = False,
+        from_dataframe: bool = False,
+        from_singleton: bool = False,
+    ) -> bool:
+        """Override :func:`~Entity.save_knowledge`, table of changed files is updated once the knowledge is saved."""
+        saved = super().save_knowledge(
+            file_path=file_path,
+            is_local=is_local,
+            as_csv=as_csv,
+            from_dataframe=from_dataframe,
+            from_singleton=from_singleton,
+        )
+
+        if not saved or file_path is not None or as_csv or from_dataframe or not self.stored_entities:
+            return saved
+
+        stored_entities = self.stored_entities
+        if isinstance(stored_entities, StoredEntities):
+            stored_entities = stored_entities.to_dict()
+
+        self.save_files(pd.DataFrame.from_dict(stored_entities, orient="index"), is_local=is_local)
+        return saved
+
+    def save_files(self, pull_requests: pd.DataFrame, is_local: bool = False):
+        """Update table of changed files with files of the given pull requests.
+
+        If the table was not stored yet, files of all previously collected pull requests are added as well.
+        """
+        storage = KnowledgeStorage(is_local=is_local)
+
+        files = storage.load_data(self.files_path)
+        if files.empty:
+            previous_knowledge = self.previous_knowledge
+            files = get_pull_request_files(previous_knowledge if isinstance(previous_knowledge, pd.DataFrame) else None)
+
+        new_files = get_pull_request_files(pull_requests)
+        files = pd.concat([new_files, files[~files.pr_id.isin(new_files.pr_id)]], ignore_index=True)
+
+        # id of the pull request is the index when the table is loaded
+        files["id"] = files.pr_id
+        storage.save_serialized(files.to_json(orient="records", lines=True), self.files_path)
+
+    def load_files(self, is_local: bool = False) -> pd.DataFrame:
+        """Load table of files changed by the pull requests.
+
+        The table is derived from the knowledge if it was collected before the table was stored.
+
+        Returns:
+            pd.DataFrame -- one row with pr_id, filename and changes for every file changed by a pull request
+
+        """
+        files = KnowledgeStorage(is_local=is_local).load_data(self.files_path)
+        if files.empty:
+            knowledge = self.load_previous_knowledge(is_local=is_local, columns=["changed_files_changes"])
+            return get_pull_request_files(knowledge)
+
+        return files.reset_index(drop=True)[PULL_REQUEST_FILES_COLUMNS]
+
     def store(self, pull_request: GithubPullRequest):
         """Override :func:`~Entity.store`."""
         _LOGGER.info("Extracting PR #%d", pull_request.number)
@@ -89,6 +187,10 @@ class PullRequest(Entity):
             _LOGGER.debug("PullRequest %s already analysed, skipping")
             return
 
+        # attributes like merged_by or additions are not part of pull request listing
+        # and would trigger a completion request on every access
+        pull_request = memoize(pull_request)
+
         created_at = int(pull_request.created_at.timestamp())
         closed_at = int(pull_request.closed_at.timestamp()) if pull_request.closed_at is not None else None
         merged_at = int(pull_request.merged_at.timestamp()) if pull_request.merged_at is not None else None
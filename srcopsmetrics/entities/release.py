@@ -19,9 +19,12 @@
 
 import logging
 from datetime import datetime
-from typing import Any, List, Union
+from typing import Any, Dict, Iterator, List, Optional
 
+from github.Commit import Commit
 from github.GitRelease import GitRelease
+from github.PullRequest import PullRequest as GithubPullRequest
+from github.Repository import Repository
 from github.Tag import Tag
 from semver import VersionInfo
 from voluptuous.schema_builder import Schema
@@ -30,9 +33,19 @@ from srcopsmetrics.entities import Entity
 
 _LOGGER = logging.getLogger(__name__)
 
+# tags without a GitHub release above which closed pull requests are listed instead of looked up per commit
+BULK_LOOKUP_MIN_TAGS = 30
+
 
 class Release(Entity):
-    """Release entity."""
+    """Release entity.
+
+    Tags and GitHub releases pointing to the same tag are merged into a single
+    release keyed by the tagged commit SHA. Tags without a GitHub release are
+    matched to the pull request that produced their commit, memoized per commit SHA.
+    If there are many of such tags, closed pull requests are listed page by page
+    only until the commit is found, otherwise the commit pull requests are requested.
+    """
 
     entity_schema = Schema(
         {
@@ -41,15 +54,25 @@ class Release(Entity):
         }
     )
 
+    def __init__(self, repository_name: Optional[str] = None, repository: Optional[Repository] = None):
+        """Initialize with empty release and commit to pull request caches."""
+        super().__init__(repository_name=repository_name, repository=repository)
+        self._releases: Dict[str, GitRelease] = {}
+        self._commit_pull_requests: Dict[str, Optional[GithubPullRequest]] = {}
+        self._closed_pull_requests: Optional[Iterator[GithubPullRequest]] = None
+
     def analyse(self) -> List[Any]:
         """Override :func:`~Entity.analyse`."""
-        return [tag for tag in self.get_raw_github_data() if tag.commit.sha not in self.previous_knowledge]
+        tags = [tag for tag in self.get_raw_github_data() if tag.commit.sha not in self.previous_knowledge.index]
 
-    def store(self, release: Union[Tag, GitRelease]):
-        """Override :func:`~Entity.store`."""
-        is_tag = issubclass(Tag, type(release))
+        if sum(tag.name not in self._releases for tag in tags) >= BULK_LOOKUP_MIN_TAGS:
+            self._closed_pull_requests = iter(self.repository.get_pulls(state="closed"))
 
-        version_name = release.name
+        return tags
+
+    def store(self, release_tag: Tag):
+        """Override :func:`~Entity.store`."""
+        version_name = release_tag.name
         name = version_name[1:] if len(version_name) > 0 and version_name[0] == "v" else version_name
 
         try:
@@ -58,35 +81,74 @@ class Release(Entity):
             _LOGGER.info("Found tag is not a valid release, skipping")
             return
 
-        self.stored_entities[release.commit.sha] = {
+        release = self._releases.get(release_tag.name)
+        if release is not None:
+            release_date = release.created_at.timestamp()
+            note = release.body
+        else:
+            pull_request = self.get_commit_pull_request(release_tag.commit)
+            release_date = self.__class__.get_tag_release_date(release_tag, pull_request)
+            note = self.__class__.get_tag_release_note(release_tag, pull_request)
+
+        self.stored_entities[release_tag.commit.sha] = {
             "major": version.major,
             "minor": version.minor,
             "patch": version.patch,
             "prerelease": version.prerelease,
             "build": version.build,
-            "release_date": self.__class__.get_tag_release_date(release) if is_tag else release.created_at.timestamp(),
-            "note": self.__class__.get_tag_release_note(release) if is_tag else release.body,
+            "release_date": release_date,
+            "note": note,
         }
 
+    def get_commit_pull_request(self, commit: Commit) -> Optional[GithubPullRequest]:
+        """Get pull request that produced the given commit.
+
+        Listing of closed pull requests is shared by all of the tags and continues only
+        until a pull request merged as the commit is found. Commits that were not merged
+        by a pull request merge commit are looked up by the pull requests of the commit.
+        """
+        if commit.sha in self._commit_pull_requests:
+            return self._commit_pull_requests[commit.sha]
+
+        if self._closed_pull_requests is not None:
+            for pull_request in self._closed_pull_requests:
+                if pull_request.merge_commit_sha and pull_request.merged_at is not None:
+                    self._commit_pull_requests[pull_request.merge_commit_sha] = pull_request
+                    if pull_request.merge_commit_sha == commit.sha:
+                        return pull_request
+
+        pull_request = next(iter(commit.get_pulls()), None)
+        self._commit_pull_requests[commit.sha] = pull_request
+        return pull_request
+
     @staticmethod
-    def get_tag_release_date(release_tag: Tag):
+    def get_tag_release_date(release_tag: Tag, pull_request: Optional[GithubPullRequest] = None):
         """Get release date from regular Tag."""
-        if release_tag.commit.get_pulls().totalCount == 0:
+        if pull_request is None:
             return datetime.strptime(release_tag.commit.last_modified, "%a, %d %b %Y %X %Z").timestamp()
 
-        return release_tag.commit.get_pulls()[0].closed_at.timestamp()
+        return pull_request.closed_at.timestamp()
 
     @staticmethod
-    def get_tag_release_note(release_tag: Tag):
+    def get_tag_release_note(release_tag: Tag, pull_request: Optional[GithubPullRequest] = None):
         """Get release note from regular Tag."""
-        if release_tag.commit.get_pulls().totalCount == 0:
+        if pull_request is None:
             return release_tag.commit.commit.message
 
-        return release_tag.commit.get_pulls()[0].body
+        return pull_request.body
 
     def get_raw_github_data(self):
-        """Override :func:`~Entity.get_raw_github_data`."""
-        releases = [r for r in self.repository.get_releases()]
-        releases.extend([t for t in self.repository.get_tags()])
+        """Override :func:`~Entity.get_raw_github_data`.
+
+        GitHub releases are indexed by their tag name, so that every tagged commit
+        is inspected only once no matter whether it has a release, a tag or both.
+        """
+        self._releases = {r.tag_name: r for r in self.repository.get_releases() if not r.draft}
+
+        tags: Dict[str, Tag] = {}
+        for tag in self.repository.get_tags():
+            known = tags.get(tag.commit.sha)
+            if known is None or (known.name not in self._releases and tag.name in self._releases):
+                tags[tag.commit.sha] = tag
 
-        return releases
+        return list(tags.values())
@@ -0,0 +1,165 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Local read-through cache of knowledge stored on Ceph."""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+import botocore.client
+import botocore.exceptions
+from thoth.storages.ceph import CephStore
+from thoth.storages.exceptions import NotFoundError
+
+from srcopsmetrics.enums import StoragePath
+
+_LOGGER = logging.getLogger(__name__)
+
+CEPH_CACHE_SIZE_MB = int(os.getenv("MI_CEPH_CACHE_SIZE_MB", 1024))
+
+_ENTRY_SUFFIX = ".entry"
+
+
+class CephCache:
+    """Local disk cache of Ceph objects validated by their ETag.
+
+    Cached object is retrieved with conditional request, so it is downloaded
+    only if it has changed on Ceph. Every cached object is a single file with
+    the ETag on its first line followed by the object content, so the content
+    and its ETag are always replaced together. When the cache exceeds its size,
+    least recently used objects are evicted.
+    """
+
+    _lock = threading.Lock()
+    _clients: Dict[Tuple[Optional[str], ...], Any] = {}
+
+    def __init__(self, cache_path: Optional[Path] = None, max_size: int = CEPH_CACHE_SIZE_MB * 1024 * 1024):
+        """Initialize cache in given directory, by default in the knowledge path."""
+        location = os.getenv(StoragePath.LOCATION_VAR.value, StoragePath.DEFAULT.value)
+        self.cache_path = cache_path or Path(location).joinpath(StoragePath.CEPH_CACHE.value)
+        self.max_size = max_size
+
+    @classmethod
+    def get_default(cls) -> Optional["CephCache"]:
+        """Get cache configured by MI_CEPH_CACHE_SIZE_MB environment variable, None if it is disabled."""
+        return cls() if CEPH_CACHE_SIZE_MB > 0 else None
+
+    @classmethod
+    def get_client(cls, s3: CephStore) -> Any:
+        """Get S3 client for the Ceph store configuration, clients are created once and shared by threads."""
+        key = (s3.host, s3.key_id, s3.secret_key, s3.region)
+        with cls._lock:
+            client = cls._clients.get(key)
+            if client is None:
+                session = boto3.session.Session(
+                    aws_access_key_id=s3.key_id, aws_secret_access_key=s3.secret_key, region_name=s3.region
+                )
+                client = session.client(
+                    "s3",
+                    config=botocore.client.Config(connect_timeout=180, signature_version="s3v4"),
+                    endpoint_url=s3.host,
+                )
+                cls._clients[key] = client
+        return client
+
+    def _get_entry_path(self, s3: CephStore, object_key: str) -> Path:
+        """Get path of cached object, unique for the object in the bucket."""
+        name = hashlib.sha256(f"{s3.host}/{s3.bucket}/{s3.prefix}{object_key}".encode()).hexdigest()
+        return self.cache_path.joinpath(name + _ENTRY_SUFFIX)
+
+    @staticmethod
+    def _read(entry_path: Path) -> Tuple[Optional[str], Optional[bytes]]:
+        """Read ETag and content of cached object, None if it is not cached."""
+        try:
+            with open(entry_path, "rb") as f:
+                etag = f.readline().rstrip(b"\n").decode()
+                blob = f.read()
+        except FileNotFoundError:
+            return None, None
+
+        os.utime(entry_path)
+        return etag, blob
+
+    def retrieve_blob(self, s3: CephStore, object_key: str) -> bytes:
+        """Retrieve object content, from the cache if the object has not changed on Ceph."""
+        entry_path = self._get_entry_path(s3, object_key)
+        etag, blob = self._read(entry_path)
+
+        client = self.get_client(s3)
+        request = {"Bucket": s3.bucket, "Key": f"{s3.prefix}{object_key}"}
+
+        try:
+            response = client.get_object(IfNoneMatch=etag, **request) if etag else client.get_object(**request)
+        except botocore.exceptions.ClientError as exc:
+            code = exc.response["Error"]["Code"]
+            if code in ("304", "NotModified"):
+                _LOGGER.debug("Knowledge %s served from cache" % object_key)
+                return blob
+            if code in ("404", "NoSuchKey"):
+                self._remove(entry_path)
+                raise NotFoundError(f"Failed to retrieve object, object {object_key!r} does not exist") from exc
+            raise
+
+        blob = response["Body"].read()
+        self._store(entry_path, blob, response["ETag"])
+        return blob
+
+    def _store(self, entry_path: Path, blob: bytes, etag: str):
+        """Store object content with its ETag and evict least recently used objects if needed."""
+        os.makedirs(self.cache_path, exist_ok=True)
+
+        # written to temporary file first so that readers never see partial content
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_path, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(etag.encode() + b"\n")
+            f.write(blob)
+        os.replace(tmp_path, entry_path)
+
+        self.evict()
+
+    @staticmethod
+    def _remove(entry_path: Path):
+        """Remove cached object."""
+        try:
+            os.remove(entry_path)
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        """Evict least recently used objects until the cache fits its size."""
+        with self._lock:
+            entries = []
+            for entry_path in self.cache_path.glob(f"*{_ENTRY_SUFFIX}"):
+                try:
+                    stat = entry_path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+            size = sum(entry_size for _, entry_size, _ in entries)
+            for _, entry_size, entry_path in sorted(entries):
+                if size <= self.max_size:
+                    break
+                self._remove(entry_path)
+                size -= entry_size
+                _LOGGER.debug("Evicted %s from Ceph cache" % entry_path.name)
@@ -0,0 +1,108 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compression of knowledge files with detection of compressed content on load."""
+
+import gzip
+import io
+import logging
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from srcopsmetrics.enums import CompressionEnum
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+_LOGGER = logging.getLogger(__name__)
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def get_compression() -> CompressionEnum:
+    """Get compression set by MI_COMPRESSION environment variable, knowledge is not compressed by default.
+
+    zstd falls back to gzip if zstandard package is not installed.
+    """
+    compression = CompressionEnum(os.getenv("MI_COMPRESSION", CompressionEnum.NONE.value))
+    if compression == CompressionEnum.ZSTD and zstandard is None:
+        _warn_zstd_missing()
+        return CompressionEnum.GZIP
+    return compression
+
+
+@lru_cache(maxsize=1)
+def _warn_zstd_missing():
+    """Warn only once about missing zstandard package."""
+    _LOGGER.warning("zstandard package is not installed, using gzip compression")
+
+
+def detect_compression(data: bytes) -> CompressionEnum:
+    """Detect compression of the content by its magic number."""
+    if data.startswith(GZIP_MAGIC):
+        return CompressionEnum.GZIP
+    if data.startswith(ZSTD_MAGIC):
+        return CompressionEnum.ZSTD
+    return CompressionEnum.NONE
+
+
+def compress(data: bytes, compression: Optional[CompressionEnum] = None) -> bytes:
+    """Compress data, compression given by MI_COMPRESSION is used if not specified."""
+    compression = compression or get_compression()
+
+    if compression == CompressionEnum.GZIP:
+        # mtime fixed so the same knowledge gives the same object
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if compression == CompressionEnum.ZSTD:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return data
+
+
+def decompress(data: bytes) -> bytes:
+    """Decompress data if compressed, uncompressed data are returned as they are."""
+    compression = detect_compression(data)
+
+    if compression == CompressionEnum.GZIP:
+        return gzip.decompress(data)
+    if compression == CompressionEnum.ZSTD:
+        if zstandard is None:
+            raise ImportError("zstandard package is required to load zstd compressed knowledge")
+        # content size is not stored in frame header when compressing in streaming mode
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+def open_decompressed(file_path: Path) -> BinaryIO:
+    """Open compressed file for streaming read of decompressed content."""
+    with open(file_path, "rb") as f:
+        compression = detect_compression(f.read(4))
+
+    if compression == CompressionEnum.GZIP:
+        return gzip.open(file_path, "rb")
+    if compression == CompressionEnum.ZSTD:
+        if zstandard is None:
+            raise ImportError("zstandard package is required to load zstd compressed knowledge")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(file_path, "rb")))
+    return open(file_path, "rb")
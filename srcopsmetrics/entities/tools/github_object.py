@@ -0,0 +1,152 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Memoized access to PyGithub objects."""
+
+import logging
+from collections import Counter
+from functools import wraps
+from typing import Any, Callable, Dict, Tuple
+
+from github.GithubObject import CompletableGithubObject, GithubObject
+from github.PaginatedList import PaginatedList
+
+_LOGGER = logging.getLogger(__name__)
+
+_LAZY_COMPLETIONS: Counter = Counter()
+
+
+def get_lazy_completions() -> Dict[str, int]:
+    """Return number of lazy completions per triggering '<class>.<attribute>' since last reset."""
+    return dict(_LAZY_COMPLETIONS)
+
+
+def reset_lazy_completions():
+    """Reset lazy completions instrumentation."""
+    _LAZY_COMPLETIONS.clear()
+
+
+class MaterializedList(list):
+    """Already fetched PaginatedList that keeps its totalCount interface without another request."""
+
+    @property
+    def totalCount(self) -> int:  # noqa: N802 - keep PaginatedList interface
+        """Return number of fetched elements."""
+        return len(self)
+
+
+def memoize(value: Any) -> Any:
+    """Wrap PyGithub objects so their attributes and method results are requested at most once."""
+    if isinstance(value, MemoizedGithubObject):
+        return value
+    if isinstance(value, GithubObject):
+        return MemoizedGithubObject(value)
+    if isinstance(value, PaginatedList):
+        return MaterializedList(memoize(element) for element in value)
+    if isinstance(value, list):
+        return [memoize(element) for element in value]
+    return value
+
+
+class MemoizedGithubObject:
+    """Thin wrapper around PyGithub object used by entities during extraction.
+
+    PyGithub objects obtained from listings are only partially initialized and
+    accessing a missing attribute (e.g. merged_by, additions) triggers a GET of
+    the whole object. The wrapper caches every accessed attribute and method
+    result, so the object is completed at most once, and records which attribute
+    triggered the lazy completion.
+    """
+
+    def __init__(self, github_object: GithubObject):
+        """Initialize with the wrapped PyGithub object."""
+        self.__dict__["_github_object"] = github_object
+        self.__dict__["_memo"] = {}
+        self.__dict__["_completions"] = 0
+
+        if isinstance(github_object, CompletableGithubObject):
+            self._count_completions(github_object)
+
+    def _count_completions(self, github_object: CompletableGithubObject):
+        """Count requests of the wrapped object to complete its attributes.
+
+        PyGithub requests the whole object in _complete, the method is wrapped
+        on the instance, so other objects of the same class are not affected.
+        """
+        complete = github_object._complete
+
+        @wraps(complete)
+        def counted_complete(*args, **kwargs):
+            self.__dict__["_completions"] += 1
+            return complete(*args, **kwargs)
+
+        github_object._complete = counted_complete
+
+    @property
+    def github_object(self) -> GithubObject:
+        """Return wrapped PyGithub object."""
+        return self._github_object
+
+    def __getattr__(self, name: str) -> Any:
+        """Return memoized attribute, fetching it from wrapped object only once."""
+        memo = self.__dict__["_memo"]
+        if name in memo:
+            return memo[name]
+
+        github_object = self.__dict__["_github_object"]
+        completions = self.__dict__["_completions"]
+
+        value = getattr(github_object, name)
+
+        if callable(value):
+            value = self._memoize_method(value)
+        else:
+            if self.__dict__["_completions"] > completions:
+                trigger = f"{type(github_object).__name__}.{name}"
+                _LAZY_COMPLETIONS[trigger] += 1
+                _LOGGER.debug("Lazy completion of %s triggered by %s", getattr(github_object, "url", None), trigger)
+            value = memoize(value)
+
+        memo[name] = value
+        return value
+
+    def __setattr__(self, name: str, value: Any):
+        """Disallow modification of wrapped object."""
+        raise AttributeError("Memoized GitHub objects are read-only")
+
+    def __repr__(self) -> str:
+        """Return representation of wrapped object."""
+        return f"Memoized{repr(self._github_object)}"
+
+    @staticmethod
+    def _memoize_method(method: Callable) -> Callable:
+        """Memoize results of method calls per arguments, calls with unhashable arguments are not memoized."""
+        results: Dict[Tuple[Any, ...], Any] = {}
+
+        @wraps(method)
+        def _wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            try:
+                if key in results:
+                    return results[key]
+            except TypeError:
+                return memoize(method(*args, **kwargs))
+
+            results[key] = memoize(method(*args, **kwargs))
+            return results[key]
+
+        return _wrapper
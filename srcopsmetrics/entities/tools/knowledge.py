@@ -19,15 +19,19 @@
 
 import logging
 import os
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 from github import Github, PaginatedList
 from github.Issue import Issue
+from github.TimelineEvent import TimelineEvent
 
 _LOGGER = logging.getLogger(__name__)
 
 STANDALONE_LABELS = {"size"}
 
+COMMENTED_EVENT_KEYWORD = "commented"
+LABELED_EVENT_KEYWORD = "labeled"
+
 _GITHUB_ACCESS_TOKEN = os.getenv("GITHUB_ACCESS_TOKEN")
 
 
@@ -134,17 +138,51 @@ class GitHubKnowledge:
             interactions[comment.user.login] += len(comment.body.split(" "))
         return interactions
 
+    @staticmethod
+    def get_comments_interactions(comments: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Get overall word count for already extracted comments per author."""
+        interactions = {comment["created_by"]: 0 for comment in comments}
+        for comment in comments:
+            # we count by the num of words in comment
+            interactions[comment["created_by"]] += len(comment["body"].split(" "))
+        return interactions
+
+    @staticmethod
+    def get_timeline_comments(timeline: Iterable[TimelineEvent]) -> List[Dict[str, Any]]:
+        """Get comments from issue timeline, so that comments do not have to be requested separately."""
+        comments = []
+        for event in timeline:
+
+            if event.event != COMMENTED_EVENT_KEYWORD:
+                continue
+
+            comment = event.raw_data
+            comments.append(
+                {
+                    "created_at": int(event.created_at.timestamp()),
+                    "created_by": comment["user"]["login"],
+                    "body": comment["body"],
+                }
+            )
+
+        return comments
+
     @staticmethod
     def get_labels(issue: Issue) -> Dict[str, Dict[str, Union[int, str]]]:
         """Get non standalone labels by filtering them from all of the labels."""
+        return GitHubKnowledge.get_timeline_labels(issue.get_timeline())
+
+    @staticmethod
+    def get_timeline_labels(timeline: Iterable[TimelineEvent]) -> Dict[str, Dict[str, Union[int, str]]]:
+        """Get labels with their first labeling event from already fetched issue timeline."""
         labels: Dict[str, Dict[str, Union[int, str]]] = {}
 
-        for event in issue.get_timeline():
+        for event in timeline:
 
-            if event.event != "labeled":
+            if event.event != LABELED_EVENT_KEYWORD:
                 continue
 
-            label = event.__dict__.get("_rawData")["label"]
+            label = event.raw_data["label"]
             if label["name"] in labels.keys():
                 continue
 
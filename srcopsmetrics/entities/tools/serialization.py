@@ -0,0 +1,81 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Json serialization of knowledge with orjson when available and stdlib json fallback."""
+
+import json
+import logging
+import os
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Union
+
+from srcopsmetrics.enums import JsonBackendEnum
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_json_backend() -> JsonBackendEnum:
+    """Get json codec set by MI_JSON_BACKEND environment variable, orjson by default if installed."""
+    default = JsonBackendEnum.JSON if orjson is None else JsonBackendEnum.ORJSON
+    backend = JsonBackendEnum(os.getenv("MI_JSON_BACKEND", default.value))
+
+    if backend == JsonBackendEnum.ORJSON and orjson is None:
+        _LOGGER.debug("orjson package is not installed, using json")
+        return JsonBackendEnum.JSON
+    return backend
+
+
+@contextmanager
+def use_json_backend(backend: JsonBackendEnum) -> Iterator[None]:
+    """Decode json documents with given codec inside the context, previous MI_JSON_BACKEND is restored on exit."""
+    previous = os.environ.get("MI_JSON_BACKEND")
+    os.environ["MI_JSON_BACKEND"] = backend.value
+    try:
+        yield
+    finally:
+        if previous is None:
+            del os.environ["MI_JSON_BACKEND"]
+        else:
+            os.environ["MI_JSON_BACKEND"] = previous
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Deserialize json document.
+
+    Documents orjson does not accept (e.g. NaN values) are parsed by json. Note orjson
+    decodes integers over 64 bits as floats, knowledge does not contain such numbers.
+    """
+    if get_json_backend() == JsonBackendEnum.ORJSON:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Serialize object to json document.
+
+    Documents are always serialized by json, orjson formatting (separators, escaping,
+    NaN as null) differs and saved knowledge has to stay byte to byte the same.
+    """
+    return json.dumps(obj, default=default)
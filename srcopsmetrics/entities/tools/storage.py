@@ -17,22 +17,58 @@
 
 """Knowledge storage tools and classes."""
 
+import gzip
+import io
 import logging
+import mmap
 import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from pathlib import Path
-from typing import Optional, Dict, Any, Union
-
-import json
+from datetime import date, datetime
+from typing import Optional, Callable, Dict, Any, Iterable, Iterator, List, MutableMapping, Set, Tuple, TypeVar, Union
 
 from thoth.storages.ceph import CephStore
 from thoth.storages.exceptions import NotFoundError
-
-from srcopsmetrics.enums import StoragePath
+from tqdm import tqdm
+
+from srcopsmetrics.entities.tools import serialization
+from srcopsmetrics.entities.tools.cache import CephCache
+from srcopsmetrics.entities.tools.compression import (
+    compress,
+    decompress,
+    detect_compression,
+    get_compression,
+    open_decompressed,
+)
+from srcopsmetrics.enums import CompressionEnum, StoragePath
 
 import pandas as pd
 
 _LOGGER = logging.getLogger(__name__)
 
+SPILL_BATCH_SIZE = 100
+# knowledge dates before are timestamps in seconds misparsed in milliseconds
+MISPARSED_DATES_BEFORE = pd.Timestamp("1971-01-01")
+# key under which entities that are not records are spilled
+SPILLED_VALUE_KEY = "value"
+
+LOAD_CHUNK_SIZE = int(os.getenv("MI_LOAD_CHUNK_SIZE", 10000))
+
+PARTITIONS_MANIFEST = "partitions.json"
+UNKNOWN_PARTITION = "unknown"
+
+BULK_WORKERS = int(os.getenv("MI_BULK_WORKERS", 16))
+CEPH_RETRIES = int(os.getenv("MI_CEPH_RETRIES", 3))
+CEPH_BACKOFF_SECONDS = float(os.getenv("MI_CEPH_BACKOFF_SECONDS", 1))
+
+DateLike = Union[date, datetime, pd.Timestamp]
+
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 def load_data_frame(path_or_buf: Union[Path, Any]) -> pd.DataFrame:
     """Load DataFrame from either string data or path."""
@@ -47,13 +83,240 @@ def load_data_frame(path_or_buf: Union[Path, Any]) -> pd.DataFrame:
     return df
 
 
+def repair_timestamps(df: pd.DataFrame, date_columns: List[str]) -> pd.DataFrame:
+    """Repair dates of knowledge that mixed POSIX timestamps in seconds and milliseconds.
+
+    Such a date column is parsed in milliseconds, so timestamps in seconds become dates
+    in January 1970, these are converted again in seconds. Knowledge is repaired when it is saved
+    or compacted, only the given date columns are repaired.
+    """
+    for column in df.columns.intersection(date_columns):
+        if not pd.api.types.is_datetime64_any_dtype(df[column]):
+            continue
+
+        misparsed = df[column] < MISPARSED_DATES_BEFORE
+        if misparsed.any():
+            seconds = (df.loc[misparsed, column] - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)
+            df.loc[misparsed, column] = pd.to_datetime(seconds, unit="s")
+
+    return df
+
+
+def normalize_timestamps(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert dates of knowledge to POSIX timestamps in seconds, the unit of newly stored entities.
+
+    Loaded knowledge contains datetimes, which would be saved in milliseconds next to new entities in seconds.
+    """
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            timestamps = series
+        elif series.dtype == object and series.map(lambda x: isinstance(x, datetime)).any():
+            timestamps = get_timestamps(series)
+        else:
+            continue
+
+        df[column] = ((timestamps - pd.Timestamp(0, tz=timestamps.dt.tz)) // pd.Timedelta(seconds=1)).astype("Int64")
+
+    return df
+
+
+def iter_lines(file_path: Path) -> Iterator[bytes]:
+    """Iterate lines of local knowledge file without reading the whole file into memory.
+
+    Uncompressed files are memory-mapped, compressed files are decompressed as a stream.
+    """
+    if os.path.getsize(file_path) == 0:
+        return
+
+    with open(file_path, "rb") as f:
+        is_compressed = detect_compression(f.read(4)) != CompressionEnum.NONE
+
+        if not is_compressed:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield from iter(mm.readline, b"")
+            return
+
+    with open_decompressed(file_path) as stream:
+        yield from stream
+
+
+def read_data_frame_chunks(lines: Iterable[bytes], chunk_size: int = LOAD_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Parse json lines knowledge records to DataFrames of at most chunk size records."""
+    lines = (line for line in lines if line.strip())
+    for chunk in iter(lambda: list(islice(lines, chunk_size)), []):
+        yield load_data_frame(io.BytesIO(b"".join(chunk)))
+
+
+def concat_data_frame_chunks(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate knowledge chunks to the same DataFrame as if the knowledge was loaded at once."""
+    chunks = [chunk for chunk in chunks if not chunk.empty]
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0]
+
+    df = pd.concat(chunks)
+
+    # columns without any value in some chunk are parsed with different dtype than in the others
+    typed_columns = {column for chunk in chunks for column, dtype in chunk.dtypes.items() if dtype != object}
+    for column in df.select_dtypes(include="object").columns:
+        if column in typed_columns:
+            df[column] = df[column].infer_objects()
+        if df[column].dtype == object:
+            df[column] = df[column].where(df[column].notna(), None)
+    return df
+
+
+def filter_data_frame(
+    df: pd.DataFrame,
+    date_column: Optional[str] = None,
+    since: Optional[DateLike] = None,
+    until: Optional[DateLike] = None,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """Filter knowledge DataFrame by time window [since, until) on date column and select columns."""
+    if df.empty:
+        return df
+
+    if date_column and (since is not None or until is not None):
+        dates = get_timestamps(df[date_column])
+        mask = dates.notna()
+        if since is not None:
+            mask &= dates >= pd.Timestamp(since)
+        if until is not None:
+            mask &= dates < pd.Timestamp(until)
+        df = df[mask.values]
+
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+
+    return df
+
+
+def get_timestamps(series: pd.Series) -> pd.Series:
+    """Convert knowledge date column to timestamps.
+
+    Newly stored entities contain POSIX timestamps in seconds, loaded knowledge
+    contains datetimes converted by pandas.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+
+    return series.apply(
+        lambda x: pd.NaT
+        if x is None or (isinstance(x, float) and pd.isna(x))
+        else pd.Timestamp(x, unit="s")
+        if isinstance(x, (int, float))
+        else pd.Timestamp(x)
+    )
+
+
+def get_partition_name(timestamp: Any) -> str:
+    """Get name of monthly partition for given timestamp."""
+    if pd.isna(timestamp):
+        return UNKNOWN_PARTITION
+    return pd.Timestamp(timestamp).strftime("%Y-%m")
+
+
+def select_partitions(
+    partitions: List[str],
+    since: Optional[DateLike] = None,
+    until: Optional[DateLike] = None,
+    is_partition_column: bool = True,
+) -> List[str]:
+    """Select partitions that can contain entities from time window [since, until).
+
+    If the time window is not given by the partition column itself (e.g. closed_at
+    for entities partitioned by created_at), the date is expected to be later than
+    the partition date, therefore only partitions after the window can be pruned.
+    """
+    selected = []
+    for partition in partitions:
+        if partition == UNKNOWN_PARTITION:
+            selected.append(partition)
+            continue
+
+        if until is not None and partition > get_partition_name(pd.Timestamp(until) - pd.Timedelta(microseconds=1)):
+            continue
+
+        if is_partition_column and since is not None and partition < get_partition_name(since):
+            continue
+
+        selected.append(partition)
+
+    return selected
+
+
+def call_with_retries(
+    func: Callable[..., R], *args: Any, retries: int = CEPH_RETRIES, backoff: float = CEPH_BACKOFF_SECONDS
+) -> R:
+    """Call function, retry with exponential backoff and jitter if it fails.
+
+    Missing knowledge (NotFoundError) is not retried.
+    """
+    attempt = 0
+    while True:
+        try:
+            return func(*args)
+        except NotFoundError:
+            raise
+        except Exception as e:
+            if attempt >= retries:
+                raise
+
+            delay = backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+            attempt += 1
+            _LOGGER.warning("Attempt %d failed: %s, retrying in %.1fs" % (attempt, str(e), delay))
+            time.sleep(delay)
+
+
+def map_concurrently(
+    func: Callable[[T], R], items: Iterable[T], description: Optional[str] = None, max_workers: int = BULK_WORKERS
+) -> List[R]:
+    """Call function for all items in a bounded thread pool with a progress bar.
+
+    Returns:
+        List[R] -- results in the same order as items
+
+    """
+    items = list(items)
+    results: List[Any] = [None] * len(items)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(func, item): i for i, item in enumerate(items)}
+        with tqdm(total=len(items), desc=description, disable=not items) as progressbar:
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                progressbar.update()
+
+    return results
+
+
 def load_json(path_or_buf: Union[Path, str]) -> Any:
     """Load json data from string or filepath."""
     if isinstance(path_or_buf, Path):
-        with open(path_or_buf, "r") as f:
-            return json.loads(f.read())
+        with open(path_or_buf, "rb") as f:
+            return serialization.loads(f.read())
+
+    return serialization.loads(path_or_buf)
+
+
+def read_spill_lines(file_path: Path) -> Iterator[str]:
+    """Read complete json lines from gzipped spill file.
 
-    return json.loads(path_or_buf)
+    If the process writing the file was killed, everything before the broken block is returned.
+    """
+    if not file_path.exists():
+        return
+
+    try:
+        with gzip.open(file_path, "rt") as f:
+            for line in f:
+                if line.endswith("\n"):
+                    yield line
+    except (EOFError, OSError) as e:
+        _LOGGER.warning("Spill file %s is truncated: %s" % (file_path, str(e)))
 
 
 class KnowledgeStorage:
@@ -89,6 +352,14 @@ class KnowledgeStorage:
         s3.connect()
         return s3
 
+    def retrieve_blob(self, ceph_filename: str) -> bytes:
+        """Retrieve object from Ceph through the local cache if it is enabled."""
+        s3 = self.get_ceph_store()
+        cache = CephCache.get_default()
+        if cache is None:
+            return s3.retrieve_blob(ceph_filename)
+        return cache.retrieve_blob(s3, ceph_filename)
+
     def save_data(self, file_path: Path, data: Dict[str, Any]):
         """Save data as json.
 
@@ -99,17 +370,239 @@ class KnowledgeStorage:
         """
         _LOGGER.info("Saving knowledge file %s of size %d" % (os.path.basename(file_path), len(data)))
 
+        if get_compression() != CompressionEnum.NONE:
+            self.save_compressed(serialization.dumps(data), file_path)
+            return
+
+        if not self.is_local:
+            ceph_filename = os.path.relpath(file_path).replace("./", "")
+            s3 = self.get_ceph_store()
+            call_with_retries(s3.store_document, data, ceph_filename)
+            _LOGGER.info("Saved on CEPH at %s/%s%s" % (s3.bucket, s3.prefix, ceph_filename))
+        else:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "w") as f:
+                f.write(serialization.dumps(data))
+            _LOGGER.info("Saved locally at %s" % file_path)
+
+    def save_serialized(self, data: str, file_path: Path, as_blob: bool = False):
+        """Save already serialized knowledge (json lines or csv).
+
+        Arguments:
+            data {str} -- serialized knowledge
+            file_path {Path} -- where the knowledge should be saved
+            as_blob {bool} -- store on Ceph as a blob instead of document (e.g. csv)
+
+        """
+        if get_compression() != CompressionEnum.NONE:
+            self.save_compressed(data, file_path)
+            return
+
         if not self.is_local:
             ceph_filename = os.path.relpath(file_path).replace("./", "")
             s3 = self.get_ceph_store()
-            s3.store_document(data, ceph_filename)
+
+            if as_blob:
+                call_with_retries(s3.store_blob, data, ceph_filename)
+            else:
+                call_with_retries(s3.store_document, data, ceph_filename)
+
             _LOGGER.info("Saved on CEPH at %s/%s%s" % (s3.bucket, s3.prefix, ceph_filename))
         else:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
             with open(file_path, "w") as f:
-                json.dump(data, f)
+                f.write(str(data))
+            _LOGGER.info("Saved locally at %s" % file_path)
+
+    def load_many(
+        self, file_paths: List[Path], as_json: bool = False, max_workers: int = BULK_WORKERS
+    ) -> Dict[Path, Any]:
+        """Load many knowledge files concurrently.
+
+        Arguments:
+            file_paths {List[Path]} -- paths to previously stored knowledge
+            as_json {bool} -- load data as plain json files
+            max_workers {int} -- maximal number of concurrent loads
+
+        Returns:
+            Dict[Path, Any] -- loaded knowledge for each of the paths
+
+        """
+        results = map_concurrently(
+            lambda file_path: self.load_data(file_path, as_json=as_json),
+            file_paths,
+            description="Loading knowledge",
+            max_workers=max_workers,
+        )
+        return dict(zip(file_paths, results))
+
+    def save_many(self, documents: Dict[Path, Any], max_workers: int = BULK_WORKERS):
+        """Save many json documents concurrently.
+
+        Arguments:
+            documents {Dict[Path, Any]} -- json compatible data for each of the paths
+            max_workers {int} -- maximal number of concurrent saves
+
+        """
+        map_concurrently(
+            lambda document: self.save_data(*document),
+            documents.items(),
+            description="Saving knowledge",
+            max_workers=max_workers,
+        )
+
+    def save_compressed(self, data: str, file_path: Path):
+        """Save serialized knowledge compressed by compression given by MI_COMPRESSION.
+
+        The file name is kept, compression is detected from the content when loading.
+        """
+        compression = get_compression()
+        blob = compress(data.encode(), compression)
+        _LOGGER.debug("Compressed %s with %s to %d bytes" % (os.path.basename(file_path), compression.value, len(blob)))
+
+        if not self.is_local:
+            ceph_filename = os.path.relpath(file_path).replace("./", "")
+            s3 = self.get_ceph_store()
+            call_with_retries(s3.store_blob, blob, ceph_filename)
+            _LOGGER.info("Saved on CEPH at %s/%s%s" % (s3.bucket, s3.prefix, ceph_filename))
+        else:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "wb") as f:
+                f.write(blob)
             _LOGGER.info("Saved locally at %s" % file_path)
 
-    def load_data(self, file_path: Optional[Path] = None, as_json: bool = False) -> pd.DataFrame:
+    def save_partitioned_data(
+        self, partitions_path: Path, partition_column: str, df: pd.DataFrame, updated_ids: Optional[Set[str]] = None
+    ):
+        """Save knowledge split to monthly partitions by partition column.
+
+        If the knowledge is already partitioned, only partitions containing updated
+        entities are rewritten, list of all partitions is kept in the partitions manifest.
+
+        Arguments:
+            partitions_path {Path} -- directory with partitions of the knowledge
+            partition_column {str} -- date column by which the knowledge is partitioned
+            df {pd.DataFrame} -- whole knowledge with id column to be saved
+            updated_ids {Optional[Set[str]]} -- ids of updated entities, all partitions are saved if None
+
+        """
+        if df.empty:
+            return
+
+        manifest_path = partitions_path.joinpath(PARTITIONS_MANIFEST)
+        manifest = self.load_data(manifest_path, as_json=True)
+        partitions = set(manifest["partitions"]) if isinstance(manifest, dict) else set()
+
+        partition_names = get_timestamps(df[partition_column]).apply(get_partition_name).values
+        if partitions and updated_ids is not None:
+            to_save = set(partition_names[df.index.astype(str).isin(updated_ids)])
+        else:
+            to_save = set(partition_names)
+
+        for partition, partition_df in df.groupby(partition_names):
+            if partition not in to_save:
+                continue
+
+            self.save_serialized(
+                normalize_timestamps(partition_df.copy()).to_json(orient="records", lines=True),
+                partitions_path.joinpath(f"{partition}.json"),
+            )
+            partitions.add(partition)
+
+        self.save_data(manifest_path, {"partition_column": partition_column, "partitions": sorted(partitions)})
+
+    def get_size(self, file_path: Path) -> int:
+        """Get size of stored knowledge file in bytes, 0 if the file does not exist."""
+        if self.is_local:
+            return os.path.getsize(file_path) if file_path.exists() else 0
+
+        ceph_filename = os.path.relpath(file_path).replace("./", "")
+        s3 = self.get_ceph_store()
+        if not s3.document_exists(ceph_filename):
+            return 0
+        return s3.retrieve_document_attr(ceph_filename, "ContentLength")
+
+    def list_paths(self, directory: Path) -> List[Path]:
+        """List paths of all knowledge files stored under the directory, empty if there are none."""
+        if self.is_local:
+            return sorted(path for path in directory.rglob("*") if path.is_file())
+
+        ceph_prefix = os.path.relpath(directory).replace("./", "") + "/"
+        s3 = self.get_ceph_store()
+        return sorted(Path(ceph_filename) for ceph_filename in s3.get_document_listing(ceph_prefix))
+
+    def remove(self, file_path: Path):
+        """Remove stored knowledge file if it exists."""
+        if self.is_local:
+            if file_path.exists():
+                os.remove(file_path)
+                _LOGGER.info("Removed %s" % file_path)
+            return
+
+        ceph_filename = os.path.relpath(file_path).replace("./", "")
+        s3 = self.get_ceph_store()
+        if s3.document_exists(ceph_filename):
+            s3.delete(ceph_filename)
+            _LOGGER.info("Removed %s/%s%s from CEPH" % (s3.bucket, s3.prefix, ceph_filename))
+
+    def get_partition_paths(self, partitions_path: Path) -> List[Path]:
+        """Get paths of all partitions and the partitions manifest, empty if the knowledge is not partitioned."""
+        manifest_path = partitions_path.joinpath(PARTITIONS_MANIFEST)
+        manifest = self.load_data(manifest_path, as_json=True)
+        if not isinstance(manifest, dict):
+            return []
+
+        return [partitions_path.joinpath(f"{partition}.json") for partition in manifest["partitions"]] + [manifest_path]
+
+    def load_partitioned_data(
+        self,
+        partitions_path: Path,
+        date_column: Optional[str] = None,
+        since: Optional[DateLike] = None,
+        until: Optional[DateLike] = None,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[pd.DataFrame]:
+        """Load only partitions that can contain entities from time window [since, until) on date column.
+
+        Returns:
+            Optional[pd.DataFrame] -- filtered knowledge or None if the knowledge is not partitioned
+
+        """
+        manifest = self.load_data(partitions_path.joinpath(PARTITIONS_MANIFEST), as_json=True)
+        if not isinstance(manifest, dict):
+            return None
+
+        partition_column = manifest["partition_column"]
+        date_column = date_column or partition_column
+        partitions = select_partitions(
+            manifest["partitions"], since=since, until=until, is_partition_column=date_column == partition_column
+        )
+        _LOGGER.info("Loading %d of %d knowledge partitions" % (len(partitions), len(manifest["partitions"])))
+
+        dfs = []
+        for partition in partitions:
+            dfs.append(
+                self.load_data(
+                    partitions_path.joinpath(f"{partition}.json"),
+                    date_column=date_column,
+                    since=since,
+                    until=until,
+                    columns=columns,
+                )
+            )
+
+        dfs = [df for df in dfs if not df.empty]
+        return pd.concat(dfs) if dfs else pd.DataFrame()
+
+    def load_data(
+        self,
+        file_path: Optional[Path] = None,
+        as_json: bool = False,
+        date_column: Optional[str] = None,
+        since: Optional[DateLike] = None,
+        until: Optional[DateLike] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
         """Load previously collected repo knowledge. If a repo was not inspected before, create its directory.
 
         Arguments:
@@ -118,6 +611,10 @@ class KnowledgeStorage:
                                be :value:`~enums.StoragePath.DEFAULT`
 
             as_json {bool} -- load data as a plain json file
+            date_column {Optional[str]} -- date column of the time window
+            since {Optional[DateLike]} -- load only entities with date column at or after this date
+            until {Optional[DateLike]} -- load only entities with date column before this date
+            columns {Optional[List[str]]} -- load only given columns
 
         Returns:
             Dict[str, Any] -- previusly collected knowledge.
@@ -127,17 +624,29 @@ class KnowledgeStorage:
         if file_path is None:
             raise ValueError("Filepath is required.")
 
-        results = (
-            self.load_locally(file_path, as_json=as_json)
-            if self.is_local
-            else self.load_remotely(file_path, as_json=as_json)
-        )
+        filters = dict(date_column=date_column, since=since, until=until, columns=columns)
+
+        if self.is_local:
+            return self.load_locally(file_path, as_json=as_json, **filters)
 
-        return results
+        results = self.load_remotely(file_path, as_json=as_json)
+        return results if as_json else filter_data_frame(results, **filters)
 
     @staticmethod
-    def load_locally(file_path: Path, as_json: bool = False) -> pd.DataFrame:
-        """Load knowledge file from local storage."""
+    def load_locally(
+        file_path: Path,
+        as_json: bool = False,
+        date_column: Optional[str] = None,
+        since: Optional[DateLike] = None,
+        until: Optional[DateLike] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """Load knowledge file from local storage.
+
+        Knowledge records are parsed in chunks from memory-mapped (or stream decompressed)
+        file and filtered chunk by chunk, so neither the whole file content nor the
+        unfiltered knowledge is held in memory.
+        """
         _LOGGER.info("Loading knowledge locally")
 
         if not file_path.exists():
@@ -145,8 +654,17 @@ class KnowledgeStorage:
             return pd.DataFrame()
 
         if as_json:
-            return load_json(file_path)
-        return load_data_frame(file_path)
+            with open(file_path, "rb") as f:
+                data = f.read()
+            return serialization.loads(decompress(data))
+
+        chunks = read_data_frame_chunks(iter_lines(file_path))
+        return concat_data_frame_chunks(
+            [
+                filter_data_frame(chunk, date_column=date_column, since=since, until=until, columns=columns)
+                for chunk in chunks
+            ]
+        )
 
     def load_remotely(self, file_path: Path, as_json: bool = False) -> pd.DataFrame:
         """Load knowledge file from Ceph storage."""
@@ -154,11 +672,162 @@ class KnowledgeStorage:
 
         ceph_filename = os.path.relpath(file_path).replace("./", "")
         try:
-            data = self.get_ceph_store().retrieve_document(ceph_filename)
+            blob = call_with_retries(self.retrieve_blob, ceph_filename)
+
+            if detect_compression(blob) != CompressionEnum.NONE:
+                data = decompress(blob).decode()
+                return serialization.loads(data) if as_json else load_data_frame(io.StringIO(data))
+
+            # uncompressed knowledge is stored as json document
+            data = serialization.loads(blob)
             if not as_json:
-                data = load_data_frame(data)
+                data = load_data_frame(io.StringIO(data) if isinstance(data, str) else data)
             return data
 
         except NotFoundError:
             _LOGGER.info("Knowledge %s not found on Ceph" % ceph_filename)
             return pd.DataFrame()
+
+
+class StoredEntities(MutableMapping[str, Any]):
+    """Mapping of stored entities with bounded memory.
+
+    Entities are kept in memory only until the batch is full, then they are
+    appended to a gzipped json lines spill file in the knowledge records format.
+    Entity can still modify its last stored record in place, as the batch is
+    spilled only when a new entity is stored. Spilled records are read back only
+    when the whole knowledge is about to be saved, so memory is bounded during
+    extraction, not when saving. Entities that are not records (e.g. fork timestamps)
+    are spilled under the value key.
+    """
+
+    def __init__(self, spill_path: Path, batch_size: int = SPILL_BATCH_SIZE):
+        """Initialize with spill file, records already present in the file are adopted."""
+        self.spill_path = spill_path
+        self.batch_size = batch_size
+        self._buffer: Dict[str, Any] = {}
+        self._spilled: Set[str] = {key for key, _ in self._read_spilled()}
+
+    def _read_spilled(self) -> Iterator[Tuple[str, Any]]:
+        """Iterate through spilled records, later records of the same key override former ones."""
+        for line in read_spill_lines(self.spill_path):
+            record = serialization.loads(line)
+            key = str(record.pop("id"))
+            yield key, record[SPILLED_VALUE_KEY] if record.keys() == {SPILLED_VALUE_KEY} else record
+
+    def __getitem__(self, key: str) -> Any:
+        """Get stored entity, spilled ones are read from the spill file."""
+        if key in self._buffer:
+            return self._buffer[key]
+
+        if key not in self._spilled:
+            raise KeyError(key)
+
+        value = None
+        for spilled_key, record in self._read_spilled():
+            if spilled_key == key:
+                value = record
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        """Store entity, spill the batch to file if it is full."""
+        if key not in self._buffer and len(self._buffer) >= self.batch_size:
+            self.flush()
+        self._buffer[key] = value
+
+    def __delitem__(self, key: str):
+        """Remove entity that was not spilled yet."""
+        if key in self._spilled:
+            raise NotImplementedError("Spilled entities cannot be removed")
+        del self._buffer[key]
+
+    def __contains__(self, key: object) -> bool:
+        """Check if entity is stored without reading the spill file."""
+        return key in self._buffer or key in self._spilled
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate through keys of all stored entities."""
+        yield from self._spilled
+        yield from (key for key in self._buffer if key not in self._spilled)
+
+    def __len__(self) -> int:
+        """Return number of all stored entities."""
+        return len(self._spilled) + len([key for key in self._buffer if key not in self._spilled])
+
+    def flush(self) -> int:
+        """Append in-memory batch to the spill file.
+
+        Returns:
+            int -- number of spilled entities
+
+        """
+        if not self._buffer:
+            return 0
+
+        os.makedirs(self.spill_path.parent, exist_ok=True)
+        with gzip.open(self.spill_path, "at") as f:
+            for key, record in self._buffer.items():
+                if not isinstance(record, dict):
+                    record = {SPILLED_VALUE_KEY: record}
+                f.write(serialization.dumps({**record, "id": key}, default=str) + "\n")
+
+        spilled = len(self._buffer)
+        self._spilled.update(self._buffer.keys())
+        self._buffer = {}
+
+        _LOGGER.debug("Spilled %d entities to %s" % (spilled, self.spill_path))
+        return spilled
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Load all stored entities into memory with a single read of the spill file."""
+        entities = dict(self._read_spilled())
+        entities.update(self._buffer)
+        return entities
+
+    def clear(self):
+        """Remove all stored entities together with the spill file."""
+        if self.spill_path.exists():
+            os.remove(self.spill_path)
+        self._buffer = {}
+        self._spilled = set()
+
+
+class KnowledgeCheckpoint:
+    """Local checkpoint with entities extracted by an analysis that has not been saved yet.
+
+    Checkpoint file is the spill file of the entity stored entities, written in
+    the same records format as the knowledge files, so it can be loaded as
+    previous knowledge when the interrupted analysis is run again.
+    """
+
+    def __init__(self, entity_name: str, repository_name: str):
+        """Initialize checkpoint location for entity of given repository."""
+        location = os.getenv(StoragePath.LOCATION_VAR.value, StoragePath.DEFAULT.value)
+        self.file_path = (
+            Path(location)
+            .joinpath(StoragePath.CHECKPOINT.value)
+            .joinpath(repository_name)
+            .joinpath(f"{entity_name}.jsonl.gz")
+        )
+
+    def exists(self) -> bool:
+        """Check if there is a checkpoint left by previous analysis."""
+        return self.file_path.exists()
+
+    def get_stored_entities(self, batch_size: int = SPILL_BATCH_SIZE) -> StoredEntities:
+        """Get stored entities mapping that spills into this checkpoint."""
+        return StoredEntities(self.file_path, batch_size=batch_size)
+
+    def load(self) -> pd.DataFrame:
+        """Load checkpointed entities as DataFrame indexed the same way as knowledge files."""
+        lines = list(read_spill_lines(self.file_path))
+        if not lines:
+            return pd.DataFrame()
+
+        df = load_data_frame(io.StringIO("".join(lines)))
+        return df[~df.index.duplicated(keep="last")]
+
+    def remove(self):
+        """Remove checkpoint once its entities are saved in knowledge."""
+        if self.exists():
+            os.remove(self.file_path)
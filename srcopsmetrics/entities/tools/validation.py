@@ -0,0 +1,219 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Fast validation of stored entities against their voluptuous schema."""
+
+import logging
+import os
+import random
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from voluptuous.error import Invalid, MultipleInvalid
+from voluptuous.schema_builder import PREVENT_EXTRA, Schema
+from voluptuous.validators import Any as AnyOf
+
+from srcopsmetrics.enums import ValidationModeEnum
+
+_LOGGER = logging.getLogger(__name__)
+
+VALIDATION_SAMPLE_SIZE = int(os.getenv("MI_VALIDATION_SAMPLE_SIZE", 1000))
+
+_LITERAL_TYPES = (str, int, float, bool)
+
+_COMPILED: Dict[int, Callable[[Any], bool]] = {}
+
+
+def get_validation_mode() -> ValidationModeEnum:
+    """Get validation mode set by MI_VALIDATION environment variable, full validation by default."""
+    return ValidationModeEnum(os.getenv("MI_VALIDATION", ValidationModeEnum.FULL.value))
+
+
+def _compile_fallback(schema: Any) -> Callable[[Any], bool]:
+    """Use voluptuous itself for validators that cannot be compiled."""
+    fallback = Schema(schema)
+
+    def _check(value: Any) -> bool:
+        try:
+            fallback(value)
+        except Invalid:
+            return False
+        return True
+
+    return _check
+
+
+def _get_types(schema: Any) -> Optional[Tuple[type, ...]]:
+    """Get tuple of types if schema is satisfied by isinstance check only."""
+    if isinstance(schema, Schema) and not schema.required:
+        return _get_types(schema.schema)
+
+    if schema is None:
+        return (type(None),)
+
+    if isinstance(schema, type):
+        return (schema,)
+
+    if isinstance(schema, AnyOf):
+        types: Tuple[type, ...] = ()
+        for validator in schema.validators:
+            validator_types = _get_types(validator)
+            if validator_types is None:
+                return None
+            types += validator_types
+        return types
+
+    return None
+
+
+def _compile_mapping(schema: Dict[Any, Any], allow_extra: bool) -> Callable[[Any], bool]:
+    """Compile dict schema with literal keys and key types."""
+    literal_types = {}
+    literal_checks = {}
+    for key, value in schema.items():
+        if isinstance(key, type):
+            continue
+        types = _get_types(value)
+        if types is not None:
+            literal_types[key] = types
+        else:
+            literal_checks[key] = compile_schema(value)
+
+    typed_keys = [(key, compile_schema(value)) for key, value in schema.items() if isinstance(key, type)]
+
+    def _check(value: Any) -> bool:
+        if not isinstance(value, dict):
+            return False
+
+        for key, item in value.items():
+            types = literal_types.get(key)
+            if types is not None:
+                if not isinstance(item, types):
+                    return False
+                continue
+
+            check_literal = literal_checks.get(key)
+            if check_literal is not None:
+                if not check_literal(item):
+                    return False
+                continue
+
+            for key_type, check_typed in typed_keys:
+                if isinstance(key, key_type) and check_typed(item):
+                    break
+            else:
+                if not allow_extra:
+                    return False
+
+        return True
+
+    return _check
+
+
+def compile_schema(schema: Any) -> Callable[[Any], bool]:
+    """Compile voluptuous schema into a plain predicate.
+
+    Types, literals, None, Any, lists and dicts (the building blocks of entity schemas)
+    are compiled into nested closures and plain isinstance checks, which is much faster
+    than voluptuous validation that builds paths and error objects for every value.
+    Every other validator falls back to voluptuous.
+
+    Compiled predicate is never more permissive than the schema, if it rejects a value,
+    the value has to be validated by voluptuous to get the error.
+    """
+    types = _get_types(schema)
+    if types is not None:
+        return lambda value: isinstance(value, types)
+
+    if isinstance(schema, Schema):
+        if schema.required:
+            return _compile_fallback(schema)
+        if isinstance(schema.schema, dict):
+            return _compile_mapping(schema.schema, allow_extra=schema.extra != PREVENT_EXTRA)
+        return compile_schema(schema.schema)
+
+    if isinstance(schema, _LITERAL_TYPES):
+        return lambda value: value == schema
+
+    if isinstance(schema, AnyOf):
+        checks = [compile_schema(validator) for validator in schema.validators]
+        return lambda value: any(check(value) for check in checks)
+
+    if isinstance(schema, dict):
+        return _compile_mapping(schema, allow_extra=False)
+
+    if isinstance(schema, list) and schema:
+        item_types = _get_types(AnyOf(*schema))
+        if item_types is not None:
+            return lambda value: isinstance(value, list) and all(isinstance(i, item_types) for i in value)
+
+        checks = [compile_schema(validator) for validator in schema]
+        return lambda value: isinstance(value, list) and all(any(check(i) for check in checks) for i in value)
+
+    return _compile_fallback(schema)
+
+
+def get_compiled_schema(schema: Schema) -> Callable[[Any], bool]:
+    """Get compiled single entity schema, every schema is compiled only once."""
+    compiled = _COMPILED.get(id(schema))
+    if compiled is None:
+        compiled = compile_schema(schema)
+        _COMPILED[id(schema)] = compiled
+    return compiled
+
+
+def validate_entities(
+    entity_schema: Schema,
+    entities: Dict[str, Any],
+    mode: Optional[ValidationModeEnum] = None,
+    sample_size: int = VALIDATION_SAMPLE_SIZE,
+):
+    """Validate stored entities against single entity schema.
+
+    Arguments:
+        entity_schema {Schema} -- schema of a single entity
+        entities {Dict[str, Any]} -- entities stored by their ids
+        mode {Optional[ValidationModeEnum]} -- validate all entities, random sample of entities
+                                              or skip validation (e.g. for knowledge loaded from own storage).
+                                              If None is passed, mode is set by environment variable.
+
+    Raises:
+        MultipleInvalid -- if any of the validated entities is inconsistent with the schema
+
+    """
+    mode = mode or get_validation_mode()
+    if mode == ValidationModeEnum.SKIP:
+        return
+
+    if not isinstance(entities, dict):
+        Schema({str: entity_schema})(entities)
+        return
+
+    keys = list(entities.keys())
+    if mode == ValidationModeEnum.SAMPLE and len(keys) > sample_size:
+        keys = random.sample(keys, sample_size)
+
+    check = get_compiled_schema(entity_schema)
+    for key in keys:
+        if isinstance(key, str) and check(entities[key]):
+            continue
+
+        # compiled check is stricter than voluptuous, let voluptuous decide and build the error
+        try:
+            Schema({str: entity_schema})({key: entities[key]})
+        except MultipleInvalid as e:
+            _LOGGER.debug("Entity %s is inconsistent with its schema" % key)
+            raise e
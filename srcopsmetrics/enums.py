@@ -42,6 +42,29 @@ class StatisticalQuantityEnum(Enum):
     MEDIAN = "Median"
 
 
+class ValidationModeEnum(Enum):
+    """Class for the validation of stored entities against their schema."""
+
+    FULL = "full"
+    SAMPLE = "sample"
+    SKIP = "skip"
+
+
+class CompressionEnum(Enum):
+    """Class for the compression of knowledge files."""
+
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+class JsonBackendEnum(Enum):
+    """Class for the json codec used for knowledge loading and saving."""
+
+    ORJSON = "orjson"
+    JSON = "json"
+
+
 class StoragePath(Enum):
     """Enum with predefined storage locations."""
 
@@ -51,6 +74,8 @@ class StoragePath(Enum):
     KNOWLEDGE = "bot_knowledge"
     MERGE = "metrics"
     PROCESSED = "processed"
+    CHECKPOINT = "checkpoints"
+    CEPH_CACHE = "ceph_cache"
 
     KNOWLEDGE_PATH = DEFAULT + KNOWLEDGE
     MERGE_PATH = DEFAULT + MERGE
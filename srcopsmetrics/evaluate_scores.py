@@ -18,299 +18,484 @@
 """Reviewer Technical and Social Score."""
 
 import logging
+import os
+import threading
 from datetime import datetime, timedelta
-from typing import Any, List, Optional, Tuple, Union
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from srcopsmetrics.entities.pull_request import PullRequest
-from srcopsmetrics.processing import Processing
-from srcopsmetrics.storage import KnowledgeStorage
+from srcopsmetrics.entities.tools.storage import KnowledgeStorage, get_timestamps
+from srcopsmetrics.enums import StoragePath
+from srcopsmetrics.utils import convert_num2label, convert_score2num
 
 _LOGGER = logging.getLogger(__name__)
 
 BOTS_NAMES = ["sesheta", "dependencies[bot]", "dependabot[bot]", "review-notebook-app[bot]"]
 
+PULL_REQUEST_COLUMNS = ["created_by", "created_at", "closed_at", "commits_number", "size", "reviews"]
+
+REVIEWS_COLUMNS = ["pr_id", "author", "words_count", "submitted_at", "state"]
+
+SCORES_COLUMNS = [
+    "Contributor",
+    "PRs reviewed score",
+    "MTTR score",
+    "PR length score",
+    "Commits score",
+    "Time Last review score",
+    "Issue score",
+    "TTCI score",
+    "Technical score",  # Contributor Final TechnicalScore
+]
+
+REVIEWER_SCORES_FILE = "reviewer_scores.json"
+
 pd.set_option("display.max_columns", 500)
 
 
+def get_seconds(series: pd.Series) -> pd.Series:
+    """Convert knowledge date column to POSIX timestamps in seconds."""
+    return get_timestamps(series).astype("datetime64[s]").astype(np.int64)
+
+
+def get_reviews(pull_requests: pd.DataFrame) -> pd.DataFrame:
+    """Get long format table of reviews, one row per review in the order of the pull request reviews.
+
+    Arguments:
+        pull_requests {pd.DataFrame} -- pull requests knowledge indexed by pull request id
+
+    Returns:
+        pd.DataFrame -- pr_id, author, words_count, submitted_at and state of every review
+
+    """
+    reviews = [
+        (pr_id, review["author"], review["words_count"], review["submitted_at"], review["state"])
+        for pr_id, pr_reviews in pull_requests.reviews.items()
+        if isinstance(pr_reviews, dict)
+        for review in pr_reviews.values()
+    ]
+    return pd.DataFrame(reviews, columns=REVIEWS_COLUMNS)
+
+
+def get_median_pr_length(sizes: pd.Series) -> float:
+    """Get median of encoded pull request sizes."""
+    return sizes.map(convert_score2num).median()
+
+
+def get_reviewers_data(pull_requests: pd.DataFrame, reviews: pd.DataFrame) -> pd.DataFrame:
+    """Get statistics of every reviewer, reviews of pull requests by their authors are not considered.
+
+    Times to (first) review are evaluated in hours only for pull requests approved by the reviewer.
+    """
+    created_at = reviews.pr_id.map(pull_requests.created_at)
+    reviews = reviews[reviews.author != reviews.pr_id.map(pull_requests.created_by)].assign(created_at=created_at)
+
+    approved_at = reviews.submitted_at.where(reviews.state == "APPROVED")
+    per_pr = (
+        reviews.assign(approved_at=approved_at)
+        .groupby(["author", "pr_id"], sort=False)
+        .agg(
+            reviews=("words_count", "size"),
+            words_count=("words_count", "sum"),
+            first_review_at=("submitted_at", "first"),
+            last_review_at=("submitted_at", "max"),
+            approved_at=("approved_at", "max"),
+            created_at=("created_at", "first"),
+        )
+        .reset_index()
+    )
+
+    approved = per_pr[per_pr.approved_at.notna()]
+    approved = approved.assign(
+        ttfr=(approved.first_review_at - approved.created_at) / 3600,
+        ttr=(approved.approved_at - approved.created_at) / 3600,
+        encoded_size=approved.pr_id.map(pull_requests["size"]).map(convert_score2num),
+    )
+
+    reviewers = per_pr.groupby("author").agg(
+        prs_reviewed=("pr_id", "size"),
+        number_reviews=("reviews", "sum"),
+        median_review_length=("words_count", "median"),
+        last_review_time=("last_review_at", "max"),
+    )
+    reviewers = reviewers.join(
+        approved.groupby("author").agg(
+            mttfr=("ttfr", "median"), mttr=("ttr", "median"), encoded_size=("encoded_size", "median")
+        )
+    )
+
+    lengths = reviewers.encoded_size.dropna().map(convert_num2label)
+    reviewers["median_pr_length"] = lengths.str[0]
+    reviewers["median_pr_length_score"] = lengths.str[1]
+
+    return reviewers
+
+
+def prepare_pull_requests(pull_requests: pd.DataFrame) -> pd.DataFrame:
+    """Prepare pull requests knowledge for scoring, creation times are converted to POSIX timestamps."""
+    created_at = get_seconds(pull_requests.created_at)
+    return pull_requests.assign(created_at=created_at, closed=pull_requests.closed_at.notna())
+
+
+def evaluate_scores(
+    project: str, data: pd.DataFrame, reviews: pd.DataFrame, now_time: float
+) -> Optional[Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]]:
+    """Evaluate project statistics, contributors statistics and reviewers technical scores.
+
+    Arguments:
+        project {str} -- repository the pull requests belong to
+        data {pd.DataFrame} -- pull requests prepared by prepare_pull_requests
+        reviews {pd.DataFrame} -- reviews of the pull requests, see get_reviews
+        now_time {float} -- POSIX timestamp the time since last review is evaluated to
+
+    Returns:
+        Optional[Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]] -- project data, contributors data and
+            reviewers technical scores sorted from the best one, None if no pull request was reviewed
+
+    """
+    # Project statistics, closed pull requests reviewed with approval
+    first_review = reviews.groupby("pr_id", sort=False).submitted_at.first()
+    last_approve = reviews[reviews.state == "APPROVED"].groupby("pr_id").submitted_at.max()
+    reviewed = last_approve.index[data.closed.reindex(last_approve.index).values]
+    if reviewed.empty:
+        return None
+
+    project_commits_number = data.commits_number.sum()
+    project_prs_number = len(data)
+    project_prs_reviewed_number = len(reviewed)
+    project_mtfr = ((first_review[reviewed] - data.created_at[reviewed]) / 3600).median()
+    project_mttr = ((last_approve[reviewed] - data.created_at[reviewed]) / 3600).median()
+    _, project_reviews_length_score = convert_num2label(score=get_median_pr_length(data["size"][reviewed]))
+
+    project_last_review = reviews[reviews.pr_id.isin(reviewed)].submitted_at.max()
+    project_time_since_last_review = now_time - project_last_review
+
+    project_data = pd.DataFrame(
+        [
+            (
+                project,
+                project_prs_number,
+                project_commits_number,
+                project_prs_reviewed_number,
+                str(timedelta(hours=project_mtfr)),
+                str(timedelta(hours=project_mttr)),
+            )
+        ],
+        columns=[
+            "Repository",
+            "PullRequest n.",
+            "Commits n.",
+            "PullRequestRev n.",  # Pull requests reviewed
+            "MTTFR",  # Median Time to First Review
+            "MTTR",  # Median Time to Review
+        ],
+    )
+
+    # Contributors are authors of closed pull requests
+    contributors = pd.Index(sorted(data[data.closed].created_by.unique()), name="Contributor")
+    is_bot = contributors.isin(BOTS_NAMES)
+
+    created = data.groupby("created_by").agg(prs_number=("closed", "size"), commits_number=("commits_number", "sum"))
+    created = created.reindex(contributors)
+
+    # Contributors that reviewed and that didn't reviewed
+    reviewers = get_reviewers_data(data, reviews).reindex(contributors)
+    reviewers[is_bot] = np.nan
+    time_last_review = now_time - reviewers.last_review_time
+
+    contributors_data = pd.DataFrame(
+        {
+            "PR n.": created.prs_number,  # Pull Request number
+            "PR %": created.prs_number / project_prs_number * 100,  # Pull Request percentage respect to total
+            "PRRev n.": reviewers.prs_reviewed,  # Pull Request Reviewed number
+            # Pull Request Reviewed percentage respect to total
+            "PRRev %": reviewers.prs_reviewed / project_prs_reviewed_number * 100,
+            "MPRLen": reviewers.median_pr_length,  # Median Pull Request Reviewed Length
+            "Rev n.": reviewers.number_reviews,  # Reviews number
+            "MRL": reviewers.median_review_length,  # Median Review Length (Word count based)
+            "MTTFR": reviewers.mttfr.map(lambda hours: str(timedelta(hours=hours)), na_action="ignore"),
+            "MTTR": reviewers.mttr.map(lambda hours: str(timedelta(hours=hours)), na_action="ignore"),
+            "TLR": pd.to_timedelta(time_last_review, unit="s"),  # Time Last Review [hr]
+            "Comm n.": created.commits_number,  # Commits number
+            "Comm %": created.commits_number / project_commits_number * 100,  # Commits percentage
+            "Bot": np.where(is_bot, "Y", "N"),  # Is a bot?
+        },
+        index=contributors,
+    ).reset_index()
+
+    # Contributions to final score of the reviewers
+    scored = reviewers.prs_reviewed.notna()
+    contributions = pd.DataFrame(
+        {
+            # 1: Number of PR reviewed respect to total number of PR reviewed by the team.
+            "PRs reviewed score": created.prs_number / project_prs_number,
+            # 2: Median time to review a PR by reviewer respect to team repostiory MTTR.
+            "MTTR score": project_mttr / reviewers.mttr,
+            # 3: Median length of PR reviewed respect to the median length of PR in project.
+            "PR length score": reviewers.median_pr_length_score / project_reviews_length_score,
+            # 4: Number of commits respect to the total number of commits in the repository.
+            "Commits score": created.commits_number / project_commits_number,
+            # 5: Time since last review respect to project last review.
+            "Time Last review score": project_time_since_last_review / time_last_review,
+            # TODO: 6 Number of issues closed by a PR reviewed from an author/total number of issues closed.
+            "Issue score": 1.0,
+            # TODO: 7 Median time to close an issue by reviewer respect to team repostiory MTTCI.
+            "TTCI score": 1.0,
+        },
+        index=contributors,
+    )[scored]
+
+    weighting_factors = np.ones(len(contributions.columns))
+    contributions["Technical score"] = 1.0 + contributions.mul(weighting_factors).sum(axis=1)
+    contributors_score_data = contributions.reset_index()[SCORES_COLUMNS]
+
+    sorted_reviewers = contributors_score_data.sort_values(by=["Technical score"], ascending=False)
+
+    return project_data, contributors_data, sorted_reviewers
+
+
 class ReviewerAssigner:
     """Class of methods to analyze bot knowledge for statistics about reviewers."""
 
-    @staticmethod
-    def evaluate_contributor_technical_score(contributions: List[float], weighting_factors: List[float]) -> float:
-        """Evaluate contributor final score."""
-        final_score = 1.0
-        for contribution, w_factor in zip(contributions, weighting_factors):
-            final_score += contribution * w_factor
-        return final_score
-
-    def evaluate_reviewers_scores(self, project: str, number_reviewer: int = 2, is_local: bool = False):
+    def evaluate_reviewers_scores(self, project: str, number_reviewer: int = 2, is_local: bool = False) -> pd.DataFrame:
         """Evaluate statistics from the knowledge of the bot and provide number of reviewers.
 
+        All of the statistics are evaluated with a single pass over the pull requests and their reviews.
+
         :project: repository to be analyzed (e.g. (thoth-station, performance))
         :param number_reviewer: number of reviewers to select
+        :rtype: technical scores of the reviewers sorted from the best one
         """
-        data = KnowledgeStorage(is_local=is_local).load_previous_knowledge(
-            project_name=project, knowledge_type=PullRequest.name()
-        )
-        if not data:
-            return {}
-
-        processing = Processing(issues=None, pull_requests=data)
-
-        now_time = datetime.now()
-
-        projects_reviews_data = processing.process_prs_project_data()
-
-        # Project statistics
-        project_commits_number = sum([pr["commits_number"] for pr in data.values()])
-        project_prs_number = len(data)
-        project_prs_reviewed_number = len(projects_reviews_data["MTTR"])
-        project_mtfr = projects_reviews_data["MTTFR"][-1]
-        project_mttr = projects_reviews_data["MTTR"][-1]
-        project_reviews_length_score = projects_reviews_data["median_pr_length_score"]
-
-        project_last_review = projects_reviews_data["last_review_time"]
-        project_time_since_last_review = now_time - datetime.fromtimestamp(project_last_review)
-
-        project_data = pd.DataFrame(
-            [
-                (
-                    project,
-                    project_prs_number,
-                    project_commits_number,
-                    project_prs_reviewed_number,
-                    str(timedelta(hours=project_mtfr)),
-                    str(timedelta(hours=project_mttr)),
-                )
-            ],
-            columns=[
-                "Repository",
-                "PullRequest n.",
-                "Commits n.",
-                "PullRequestRev n.",  # Pull requests reviewed
-                "MTTFR",  # Median Time to First Review
-                "MTTR",  # Median Time to Review
-            ],
+        data = PullRequest(repository_name=project).load_previous_knowledge(
+            is_local=is_local, columns=PULL_REQUEST_COLUMNS
         )
+        if data.empty:
+            return pd.DataFrame(columns=SCORES_COLUMNS)
+
+        now_time = datetime.now().timestamp()
+
+        result = evaluate_scores(project, prepare_pull_requests(data), get_reviews(data), now_time)
+        if result is None:
+            _LOGGER.warning(f"No reviewed pull requests found for {project}")
+            return pd.DataFrame(columns=SCORES_COLUMNS)
+
+        project_data, contributors_data, sorted_reviewers = result
         _LOGGER.info("-------------------------------------------------------------------------------")
         _LOGGER.info(project_data)
         _LOGGER.info("-------------------------------------------------------------------------------")
+        _LOGGER.info(contributors_data)
+        _LOGGER.info(sorted_reviewers)
 
-        contributors = sorted(projects_reviews_data["contributors"])
-        contributor_data: List[
-            Tuple[
-                str,
-                int,
-                float,
-                Optional[int],
-                Optional[float],
-                Optional[int],
-                Optional[int],
-                Optional[int],
-                Optional[str],
-                Optional[str],
-                Optional[timedelta],
-                Union[Any, int],
-                Union[Any, float],
-                str,
-            ]
-        ] = []
-        scores_data = []
-
-        # Contributors that reviewed and that didn't reviewed
-        contributors_reviews_data = processing.process_contributors_data(
-            contributors=[c for c in contributors if c not in BOTS_NAMES]
-        )
+        _LOGGER.info(f"Number of reviewers requested: {number_reviewer}")
+        _LOGGER.info(f"Reviewers: {sorted_reviewers['Contributor'].head(number_reviewer).values}")
+
+        return sorted_reviewers
+
+
+class ReviewerScoreIndex:
+    """Reviewer scores of a repository kept up to date as new pull requests arrive.
+
+    Pull requests prepared for scoring are kept together with the table of their reviews,
+    new or updated pull requests only replace their own rows. Scores are evaluated when
+    the index is updated, only the time since the last review is evaluated again for every query.
+    """
+
+    _indexes: Dict[Tuple[str, bool], "ReviewerScoreIndex"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, project: str, is_local: bool = False):
+        """Initialize empty index of the repository."""
+        self.project = project
+        self.is_local = is_local
+        self.pull_requests = pd.DataFrame()
+        self.reviews = pd.DataFrame(columns=REVIEWS_COLUMNS)
+        self.scores = pd.DataFrame(columns=SCORES_COLUMNS)
+        self.evaluated_at = 0.0
+        self.time_last_review = pd.Series(dtype=float)
+
+    @property
+    def file_path(self) -> Path:
+        """Get path of the stored index."""
+        location = os.getenv(StoragePath.LOCATION_VAR.value, StoragePath.DEFAULT.value)
+        return Path(location).joinpath(StoragePath.PROCESSED.value, self.project, REVIEWER_SCORES_FILE)
+
+    @classmethod
+    def get(cls, project: str, is_local: bool = False) -> "ReviewerScoreIndex":
+        """Get index of the repository shared in the process.
 
-        for contributor in contributors:
-
-            _LOGGER.debug(f"Analyzing contributor: {contributor}")
-            if contributor in contributors_reviews_data.keys() and contributor not in BOTS_NAMES:
-
-                contributor_commits_number = sum(
-                    [pr["commits_number"] for pr in data.values() if pr["created_by"] == contributor]
-                )
-
-                contributor_prs_number = 0
-                for pr in data.values():
-                    if pr["created_by"] == contributor:
-                        contributor_prs_number += 1
-
-                contributor_prs_reviewed_number = len(contributors_reviews_data[contributor]["reviews"])
-                contributor_median_pr_length = contributors_reviews_data[contributor]["median_pr_length"]
-                contributor_reviews_number = contributors_reviews_data[contributor]["number_reviews"]
-                contributor_reviews_length = contributors_reviews_data[contributor]["median_review_length"]
-                contributor_reviews_length_score = contributors_reviews_data[contributor]["median_pr_length_score"]
-                contributor_mtfr = contributors_reviews_data[contributor]["MTTFR"][-1]
-                contributor_mttr = contributors_reviews_data[contributor]["MTTR"][-1]
-
-                contributor_last_review = contributors_reviews_data[contributor]["last_review_time"]
-
-                contributor_time_last_review = now_time - datetime.fromtimestamp(contributor_last_review)
-
-                contributor_data.append(
-                    (
-                        contributor,
-                        contributor_prs_number,
-                        contributor_prs_number / project_prs_number * 100,
-                        contributor_prs_reviewed_number,
-                        contributor_prs_reviewed_number / project_prs_reviewed_number * 100,
-                        contributor_median_pr_length,
-                        contributor_reviews_number,
-                        contributor_reviews_length,
-                        str(timedelta(hours=contributor_mtfr)),
-                        str(timedelta(hours=contributor_mttr)),
-                        contributor_time_last_review,
-                        contributor_commits_number,
-                        contributor_commits_number / project_commits_number * 100,
-                        "N",
+        The index is loaded from storage the first time it is used, if it was not stored yet,
+        it is built from the pull requests knowledge and stored.
+        """
+        with cls._lock:
+            if (project, is_local) not in cls._indexes:
+                index = cls(project, is_local=is_local)
+                if not index.load():
+                    index.update(
+                        PullRequest(repository_name=project).load_previous_knowledge(
+                            is_local=is_local, columns=PULL_REQUEST_COLUMNS
+                        )
                     )
-                )
+                    index.save()
+                cls._indexes[(project, is_local)] = index
 
-                # Contributions to final score:
-                contributions = []
+            return cls._indexes[(project, is_local)]
 
-                # 1: Number of PR reviewed respect to total number of PR reviewed by the team.
-                contributions.append(contributor_prs_number / project_prs_number)
+    def update(self, pull_requests: pd.DataFrame):
+        """Fold new or updated pull requests into the index and evaluate the scores.
 
-                # 2: Median time to review a PR by reviewer respect to team repostiory MTTR.
-                contributions.append(timedelta(hours=project_mttr) / timedelta(hours=contributor_mttr))
+        Arguments:
+            pull_requests {pd.DataFrame} -- pull requests knowledge indexed by pull request id
 
-                # 3: Median length of PR reviewed respect to the median length of PR in project.
-                contributions.append(contributor_reviews_length_score / project_reviews_length_score)
+        """
+        if pull_requests.empty:
+            return
 
-                # 4: Number of commits respect to the total number of commits in the repository.
-                contributions.append(contributor_commits_number / project_commits_number)
+        prepared = prepare_pull_requests(pull_requests[PULL_REQUEST_COLUMNS]).drop(columns=["closed_at", "reviews"])
+        if not self.pull_requests.empty:
+            prepared = pd.concat([self.pull_requests[~self.pull_requests.index.isin(prepared.index)], prepared])
+        self.pull_requests = prepared
 
-                # 5: Time since last review respect to project last review.
-                contributions.append(
-                    project_time_since_last_review.total_seconds() / contributor_time_last_review.total_seconds()
-                )
+        reviews = get_reviews(pull_requests)
+        if not self.reviews.empty:
+            reviews = pd.concat([self.reviews[~self.reviews.pr_id.isin(pull_requests.index)], reviews])
+        self.reviews = reviews.reset_index(drop=True)
 
-                # TODO: 6 Number of issues closed by a PR reviewed from an author/total number of issues closed.
-                contributions.append(1)
+        self._evaluate()
 
-                # TODO: 7 Median time to close an issue by reviewer respect to team repostiory MTTCI.
-                contributions.append(1)
+    def _evaluate(self):
+        """Evaluate scores of the reviewers from the pull requests in the index."""
+        self.evaluated_at = datetime.now().timestamp()
+        result = evaluate_scores(self.project, self.pull_requests, self.reviews, self.evaluated_at)
+        if result is None:
+            self.scores = pd.DataFrame(columns=SCORES_COLUMNS)
+            self.time_last_review = pd.Series(dtype=float)
+            return
 
-                final_score = self.evaluate_contributor_technical_score(
-                    contributions=contributions, weighting_factors=[1, 1, 1, 1, 1, 1, 1]
-                )
+        _, contributors_data, sorted_reviewers = result
+        self.scores = sorted_reviewers.reset_index(drop=True)
+        # Seconds since the last review of every reviewer at the time of the evaluation
+        time_last_review = contributors_data.set_index("Contributor").TLR.dt.total_seconds()
+        self.time_last_review = self.scores.Contributor.map(time_last_review)
 
-                scores_data.append(
-                    (
-                        contributor,
-                        contributions[0],
-                        contributions[1],
-                        contributions[2],
-                        contributions[3],
-                        contributions[4],
-                        contributions[5],
-                        contributions[6],
-                        final_score,
-                    )
-                )
-
-            elif contributor in BOTS_NAMES:
-
-                bot_contributor_commits_number = sum(
-                    [pr["commits_number"] for pr in data.values() if pr["created_by"] == contributor]
-                )
-
-                bot_contributor_prs_number = 0
-                for pr in data.values():
-                    if pr["created_by"] == contributor:
-                        bot_contributor_prs_number += 1
-
-                contributor_data.append(
-                    (
-                        contributor,
-                        bot_contributor_prs_number,
-                        bot_contributor_prs_number / project_prs_number * 100,
-                        None,
-                        None,
-                        None,
-                        None,
-                        None,
-                        None,
-                        None,
-                        None,
-                        bot_contributor_commits_number,
-                        contributor_commits_number / project_commits_number * 100,
-                        "Y",
-                    )
-                )
-
-            else:
-
-                contributor_commits_number = sum(
-                    [pr["commits_number"] for pr in data.values() if pr["created_by"] == contributor]
-                )
-
-                contributor_prs_number = 0
-                for pr in data.values():
-                    if pr["created_by"] == contributor:
-                        contributor_prs_number += 1
-
-                contributor_data.append(
-                    (
-                        contributor,
-                        contributor_prs_number,
-                        contributor_prs_number / project_prs_number * 100,
-                        None,
-                        None,
-                        None,
-                        None,
-                        None,
-                        None,
-                        None,
-                        None,
-                        contributor_commits_number,
-                        contributor_commits_number / project_commits_number * 100,
-                        "N",
-                    )
-                )
-
-        contributors_data = pd.DataFrame(
-            contributor_data,
-            columns=[
-                "Contributor",
-                "PR n.",  # Pull Request number
-                "PR %",  # Pull Request percentage respect to total
-                "PRRev n.",  # Pull Request Reviewed number
-                "PRRev %",  # Pull Request Reviewed percentage respect to total
-                "MPRLen",  # Median Pull Request Reviewed Length
-                "Rev n.",  # Reviews number
-                "MRL",  # Median Review Length (Word count based)
-                "MTTFR",  # Median Time to First Review
-                "MTTR",  # Median Time to Review
-                "TLR",  # Time Last Review [hr]
-                "Comm n.",  # Commits number
-                "Comm %",  # Commits percentage
-                "Bot",  # Is a bot?
-            ],
+    def scores_at(self, now_time: float) -> pd.DataFrame:
+        """Get technical scores of the reviewers with the time since last review evaluated to the given time.
+
+        Time since the last review of the project and of every reviewer grows by the time elapsed since
+        the scores were evaluated, the rest of the contributions does not depend on time.
+
+        Arguments:
+            now_time {float} -- POSIX timestamp the time since last review is evaluated to
+
+        Returns:
+            pd.DataFrame -- technical scores of the reviewers sorted from the best one
+
+        """
+        elapsed = now_time - self.evaluated_at
+        scores = self.scores.copy()
+        project_time_since_last_review = scores["Time Last review score"] * self.time_last_review
+
+        time_last_review_score = (project_time_since_last_review + elapsed) / (self.time_last_review + elapsed)
+        scores["Technical score"] += time_last_review_score - scores["Time Last review score"]
+        scores["Time Last review score"] = time_last_review_score
+
+        return scores.sort_values(by=["Technical score"], ascending=False)
+
+    def refresh(self):
+        """Update the index with pull requests from knowledge that could have changed since the last update.
+
+        These are pull requests created since the oldest pull request which was still open,
+        or since the last one if all of them were closed.
+        """
+        if self.pull_requests.empty:
+            since = None
+        else:
+            open_pull_requests = self.pull_requests[~self.pull_requests.closed]
+            changing = open_pull_requests if not open_pull_requests.empty else self.pull_requests.tail(1)
+            since = pd.Timestamp(changing.created_at.min(), unit="s")
+
+        self.update(
+            PullRequest(repository_name=self.project).load_previous_knowledge(
+                is_local=self.is_local, since=since, columns=PULL_REQUEST_COLUMNS
+            )
         )
-        _LOGGER.info(contributors_data)
+        self.save()
+
+    def top_reviewers(self, number_reviewer: int = 2, exclude: Iterable[str] = ()) -> List[str]:
+        """Get the best reviewers of the repository.
+
+        Arguments:
+            number_reviewer {int} -- number of reviewers to select
+            exclude {Iterable[str]} -- contributors not to be selected, e.g. the author of the pull request
+
+        Returns:
+            List[str] -- logins of the reviewers sorted from the best one
 
-        contributors_score_data = pd.DataFrame(
-            scores_data,
-            columns=[
-                "Contributor",
-                "PRs reviewed score",
-                "MTTR score",
-                "PR length score",
-                "Commits score",
-                "Time Last review score",
-                "Issue score",
-                "TTCI score",
-                "Technical score",  # Contributor Final TechnicalScore
-            ],
+        """
+        scores = self.scores_at(datetime.now().timestamp())
+        candidates = scores.Contributor[~scores.Contributor.isin(list(exclude))]
+        return candidates.head(number_reviewer).tolist()
+
+    def save(self):
+        """Store the index, scores are evaluated again when it is loaded.
+
+        Empty index is not stored, it is built from the knowledge again the next time it is used.
+        """
+        if self.pull_requests.empty:
+            _LOGGER.debug("Reviewer score index of %s is empty, not storing it" % self.project)
+            return
+
+        KnowledgeStorage(is_local=self.is_local).save_data(
+            self.file_path,
+            {
+                "pull_requests": self.pull_requests.to_dict(orient="split"),
+                "reviews": self.reviews.to_dict(orient="split"),
+            },
         )
 
-        sorted_reviewers = contributors_score_data.sort_values(by=["Technical score"], ascending=False)
-        _LOGGER.info(sorted_reviewers)
+    def load(self) -> bool:
+        """Load stored index.
 
-        _LOGGER.info(f"Number of reviewers requested: {number_reviewer}")
-        _LOGGER.info(f"Reviewers: {sorted_reviewers['Contributor'].head(number_reviewer).values}")
+        Returns:
+            bool -- True if a non-empty index was stored before
+
+        """
+        stored = KnowledgeStorage(is_local=self.is_local).load_data(self.file_path, as_json=True)
+        if not isinstance(stored, dict) or not stored["pull_requests"]["data"]:
+            return False
+
+        self.pull_requests = pd.DataFrame(**stored["pull_requests"])
+        self.reviews = pd.DataFrame(**stored["reviews"])
+
+        self._evaluate()
+        return True
+
+
+def suggest_reviewers(
+    repositories: List[str], number_reviewer: int = 2, is_local: bool = False
+) -> Dict[str, List[str]]:
+    """Suggest the best reviewers of every repository from its reviewer score index.
+
+    Indexes are refreshed with pull requests from knowledge that could have changed since they were stored.
+
+    Arguments:
+        repositories {List[str]} -- repositories to suggest reviewers for
+        number_reviewer {int} -- number of reviewers to suggest for each of the repositories
+        is_local {bool} -- if set to False, Ceph will be used
+
+    Returns:
+        Dict[str, List[str]] -- logins of the reviewers sorted from the best one for each repository
+
+    """
+    suggestions = {}
+    for repository in repositories:
+        index = ReviewerScoreIndex.get(repository, is_local=is_local)
+        index.refresh()
+
+        suggestions[repository] = index.top_reviewers(number_reviewer=number_reviewer)
+        _LOGGER.info("Reviewers suggested for %s: %s" % (repository, ", ".join(suggestions[repository])))
+
+    return suggestions
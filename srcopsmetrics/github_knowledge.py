@@ -84,7 +84,7 @@ class GitHubKnowledge:
 
     def analyse_entity(
         self, github_repo: Repository, project_path: Path, entity_cls: Type[Entity], is_local: bool = False
-    ):
+    ) -> Dict[str, Any]:
         """Load old knowledge and update it with the newly analysed one and save it.
 
         Arguments:
@@ -93,10 +93,13 @@ class GitHubKnowledge:
             github_type {str} -- Currently can be: "Issue", "PullRequest", "ContentFile"
             is_local {bool} -- If true, the local store will be used for knowledge loading and storing.
 
+        Returns:
+            Dict[str, Any] -- entities newly extracted by the analysis
+
         """
         entity = entity_cls(repository=github_repo)
 
         with KnowledgeAnalysis(entity=entity, is_local=is_local) as analysis:
             analysis.init_previous_knowledge()
             analysis.run()
-            analysis.save_analysed_knowledge()
+            return analysis.save_analysed_knowledge()
@@ -21,19 +21,26 @@ import logging
 import os
 import time
 from datetime import datetime, timezone
+from typing import Any, Dict
 
+import pandas as pd
 from github import Github
 from github.GithubException import GithubException
 from github.PaginatedList import PaginatedList
 from tqdm import tqdm
 
 from srcopsmetrics.entities import Entity
+from srcopsmetrics.entities.tools.github_object import get_lazy_completions, reset_lazy_completions
+from srcopsmetrics.entities.tools.storage import KnowledgeCheckpoint
 from srcopsmetrics.github_handling import GithubHandler
 
 _LOGGER = logging.getLogger(__name__)
 
 API_RATE_MINIMAL_REMAINING = 80
 
+CHECKPOINT_ENTITIES = int(os.getenv("MI_CHECKPOINT_ENTITIES", 100))
+CHECKPOINT_SECONDS = int(os.getenv("MI_CHECKPOINT_SECONDS", 300))
+
 
 class KnowledgeAnalysis:
     """Context manager that iterates through all entities in repository and collects them."""
@@ -49,14 +56,27 @@ class KnowledgeAnalysis:
         self,
         entity: Entity,
         is_local: bool = False,
+        checkpoint_entities: int = CHECKPOINT_ENTITIES,
+        checkpoint_seconds: int = CHECKPOINT_SECONDS,
     ):
-        """Initialize with previous and new knowledge of an entity."""
+        """Initialize with previous and new knowledge of an entity.
+
+        Stored entities are kept in memory only in batches of checkpoint_entities,
+        the batch is spilled to a local checkpoint file once it is full or
+        checkpoint_seconds passed since the last checkpoint, whichever comes first.
+        """
         self.entity = entity
         self.knowledge_updated = False
         self.is_local = is_local
         self.github = Github(self._GITHUB_ACCESS_TOKEN)
         self.handler = GithubHandler(self.github)
 
+        self.checkpoint = KnowledgeCheckpoint(entity.name(), entity.repository_name)
+        self.checkpoint_seconds = checkpoint_seconds
+        self._last_checkpoint_time = time.monotonic()
+
+        self.entity.stored_entities = self.checkpoint.get_stored_entities(batch_size=checkpoint_entities)
+
     def __enter__(self):
         """Context manager enter method."""
         return self
@@ -65,10 +85,39 @@ class KnowledgeAnalysis:
         """Context manager exit method."""
         if exc_type is not None:
             _LOGGER.info("Cached knowledge could not be saved")
+            self.save_checkpoint()
 
     def init_previous_knowledge(self, is_local: bool = False):
-        """Every entity must have a previous knowledge initialization method."""
-        self.entity.previous_knowledge = self.entity.load_previous_knowledge(is_local=self.is_local)
+        """Every entity must have a previous knowledge initialization method.
+
+        Entities checkpointed by previously interrupted analysis are already part of stored
+        entities, they are added to the previous knowledge too, so they are not extracted again.
+        """
+        previous_knowledge = self.entity.load_previous_knowledge(is_local=self.is_local)
+
+        checkpointed = self.checkpoint.load()
+        if not checkpointed.empty:
+            _LOGGER.info(
+                "Resuming %s analysis with %d checkpointed entities" % (self.entity.name(), len(checkpointed.index))
+            )
+            previous_knowledge = (
+                checkpointed if previous_knowledge.empty else pd.concat([checkpointed, previous_knowledge])
+            )
+            self.knowledge_updated = True
+
+        self.entity.previous_knowledge = previous_knowledge
+
+    def save_checkpoint(self):
+        """Spill entities stored since the last checkpoint to local checkpoint file."""
+        spilled = self.entity.stored_entities.flush()
+        if spilled:
+            _LOGGER.info("Checkpointed %d entities at %s" % (spilled, self.checkpoint.file_path))
+
+        self._last_checkpoint_time = time.monotonic()
+
+    def _is_checkpoint_due(self) -> bool:
+        """Check if enough time passed since the last checkpoint, full batches are spilled by stored entities."""
+        return time.monotonic() - self._last_checkpoint_time >= self.checkpoint_seconds
 
     def wait_until_api_reset(self):
         """Wait until the GitHub API rate limit is reset."""
@@ -84,6 +133,7 @@ class KnowledgeAnalysis:
     def run(self):
         """Iterate through entities of given repository and accumulate them."""
         _LOGGER.info("-------------%s Analysis-------------" % self.entity.name())
+        reset_lazy_completions()
 
         try:
             entities = self.entity.analyse()
@@ -98,16 +148,45 @@ class KnowledgeAnalysis:
 
                 self.entity.store(entity)
 
+                if self._is_checkpoint_due():
+                    self.save_checkpoint()
+
         except (GithubException, KeyboardInterrupt) as e:
             _LOGGER.warning(str(e))
             _LOGGER.warning("Problem occured, cached data will be saved")
+            self.save_checkpoint()
         except (NotImplementedError) as e:
             _LOGGER.warning(str(e))
             _LOGGER.warning("Entity '" + self.entity.name() + "' has not implemented Entity.analyse. Skipping.")
 
-    def save_analysed_knowledge(self):
-        """Save analysed knowledge if new information was extracted."""
+        lazy_completions = get_lazy_completions()
+        if lazy_completions:
+            _LOGGER.info("Lazy completion requests during %s analysis: %s" % (self.entity.name(), lazy_completions))
+
+    def save_analysed_knowledge(self) -> Dict[str, Any]:
+        """Save analysed knowledge if new information was extracted.
+
+        If the knowledge could not be saved, extracted entities are kept in the checkpoint,
+        so the next analysis resumes them.
+
+        Returns:
+            Dict[str, Any] -- entities newly extracted by the analysis and saved, so they can be processed
+                incrementally
+
+        """
+        new_entities = {}
         if self.knowledge_updated:
-            self.entity.save_knowledge(is_local=self.is_local)
+            if not self.entity.save_knowledge(is_local=self.is_local):
+                self.save_checkpoint()
+                _LOGGER.warning(
+                    "%s knowledge was not saved, extracted entities are kept at %s"
+                    % (self.entity.name(), self.checkpoint.file_path)
+                )
+                return new_entities
+
+            new_entities = self.entity.stored_entities.to_dict()
         else:
             _LOGGER.info("Nothing to store, no update operation needed")
+
+        self.entity.stored_entities.clear()
+        return new_entities
@@ -19,10 +19,12 @@
 
 import logging
 import os
+import re
 import time
 from datetime import date
+from functools import lru_cache, wraps
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Pattern, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -34,6 +36,7 @@ from srcopsmetrics.entities.thoth_metrics import ThothMetrics
 from srcopsmetrics.entities.thoth_sli_slo import ThothSliSlo
 from srcopsmetrics.entities.thoth_version_manager_metrics import ThothVersionManagerMetrics
 from srcopsmetrics.entities.tools.storage import KnowledgeStorage
+from srcopsmetrics.knowledge_session import KnowledgeSession
 from srcopsmetrics.storage import get_merge_path
 
 BOT_NAMES = {"sesheta"}
@@ -60,6 +63,25 @@ VERSION_DATAFRAME_COLUMNS = [
     "issues_rejected",
 ]
 
+UPDATE_MANAGER_STATS_COLUMNS = [
+    "created_pull_requests",
+    "rejected",
+    "rejected_by_kebechet_bot",
+    "rejected_by_other",
+    "merged",
+    "merged_by_kebechet_bot",
+    "merged_by_other",
+    "median_ttm",
+]
+
+METRICS_MANIFESTS = "kebechet_metrics_manifests"
+DAILY_METRICS_PATTERN = re.compile(r"^(?P<repository>.+)/kebechet_(?P<manager>\w+?)_(?P<day>\d{4}-\d{2}-\d{2})\.json$")
+
+REQUEST_TYPES_AND_KEYWORDS = {
+    "update": UPDATE_TYPES_AND_KEYWORDS,
+    "version": VERSION_TYPES_AND_KEYWORDS,
+}
+
 ADVISE_DATAFRAME_COLUMNS = [
     "metrics_type",
     "metrics_day",
@@ -108,30 +130,156 @@ def get_manager_request_type(title: str, manager_keywords: Dict[str, str]) -> Op
     return None
 
 
+@lru_cache(maxsize=None)
+def _compile_keywords_pattern(keywords: Tuple[str, ...]) -> Pattern:
+    """Compile alternation of keywords matching titles that contain any of them."""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+
+def get_request_types(titles: pd.Series, manager_keywords: Dict[str, str]) -> pd.Series:
+    """Get request type of every title, the same as get_manager_request_type gives for a single title.
+
+    Every distinct title is classified only once, titles without any of the keywords
+    are skipped by a single compiled regex search.
+    """
+    request_types = list(manager_keywords.keys())
+    keywords = list(manager_keywords.values())
+    pattern = _compile_keywords_pattern(tuple(keywords))
+
+    codes, unique_titles = pd.factorize(titles)
+
+    # index of request type for every distinct title, len(keywords) stands for no request type
+    unique_types = np.full(len(unique_titles), len(keywords), dtype=np.intp)
+    for i, title in enumerate(unique_titles):
+        if not isinstance(title, str) or not pattern.search(title):
+            continue
+        # first request type wins if the title contains multiple keywords
+        unique_types[i] = next(j for j, keyword in enumerate(keywords) if keyword in title)
+
+    types = np.array(request_types + [None], dtype=object)[unique_types]
+    # missing titles have code -1, which maps to None as the last item
+    return pd.Series(np.append(types, None)[codes], index=titles.index, dtype=object)
+
+
 # TODO: use this method instead of the specific ones for every manager
-def get_annotated_requests(data: pd.DataFrame, keyword_dictionary) -> pd.DataFrame:
+def get_annotated_requests(
+    data: pd.DataFrame, keyword_dictionary, request_types: Optional[pd.Series] = None
+) -> pd.DataFrame:
     """Return annotated requests for specific manager from data.
 
-    data object must have title column
+    data object must have title column, request types of the titles can be passed if already known
     """
     if data.empty:
         return pd.DataFrame()
 
-    data_copy = data.copy()
-    data_copy.request_type = data_copy.title.apply(lambda x: get_manager_request_type(x, keyword_dictionary))
+    if request_types is None:
+        request_types = get_request_types(data.title, keyword_dictionary)
+
+    data_copy = data[request_types.notna()].copy()
+    data_copy["request_type"] = request_types[request_types.notna()]
+
+    return data_copy
+
 
-    return data_copy[~data_copy.request_type.isna()]
+def get_daily_metrics_path(repository: str, manager_name: str, day: Union[date, str]) -> Path:
+    """Get path of daily metrics of the Kebechet manager in repository."""
+    return Path(f"./{get_merge_path()}/{repository}/kebechet_{manager_name}_{str(day)}.json")
+
+
+def get_metrics_manifest_path(repository: str) -> Path:
+    """Get path of the manifest of daily metrics stored for the repository."""
+    return Path(f"./{get_merge_path()}/{METRICS_MANIFESTS}/{repository}.json")
+
+
+def update_metrics_manifest(ks: KnowledgeStorage, repository: str, manager_name: str, day_names: List[str]):
+    """Record stored daily metrics of the manager in the repository manifest.
+
+    Every repository has its own manifest which is written only by the process computing
+    metrics of the repository, so the processes of different repositories never overwrite each other.
+    """
+    manifest_path = get_metrics_manifest_path(repository)
+    manifest = ks.load_data(manifest_path, as_json=True)
+    if not isinstance(manifest, dict):
+        manifest = {}
+
+    manifest[manager_name] = sorted(set(manifest.get(manager_name, [])).union(day_names))
+    ks.save_data(manifest_path, manifest)
+
+
+def rebuild_metrics_manifests(ks: KnowledgeStorage):
+    """Record daily metrics stored before the manifests existed in the repository manifests.
+
+    The merge path is listed only once, a marker is stored next to the manifests afterwards.
+    """
+    merge_path = Path(f"./{get_merge_path()}")
+    _LOGGER.info("Rebuilding kebechet metrics manifests from %s" % merge_path)
+
+    stored: Dict[str, Dict[str, List[str]]] = {}
+    for path in ks.list_paths(merge_path):
+        match = DAILY_METRICS_PATTERN.match(os.path.relpath(path, merge_path))
+        if match is None:
+            continue
+        stored.setdefault(match.group("repository"), {}).setdefault(match.group("manager"), []).append(
+            match.group("day")
+        )
+
+    for repository, managers in stored.items():
+        for manager_name, day_names in managers.items():
+            update_metrics_manifest(ks, repository, manager_name, day_names)
+
+    _LOGGER.info("Recorded stored daily metrics of %d repositories" % len(stored))
+    ks.save_data(Path(f"./{get_merge_path()}/{METRICS_MANIFESTS}.json"), {"rebuilt_at": int(time.time())})
+
+
+def load_metrics_manifests(ks: KnowledgeStorage) -> Dict[str, Dict[str, List[str]]]:
+    """Load manifests of all repositories with stored daily metrics, rebuild them first if they never were."""
+    if not isinstance(ks.load_data(Path(f"./{get_merge_path()}/{METRICS_MANIFESTS}.json"), as_json=True), dict):
+        rebuild_metrics_manifests(ks)
+
+    manifests_path = Path(f"./{get_merge_path()}/{METRICS_MANIFESTS}")
+    manifest_paths = ks.list_paths(manifests_path)
+    return {
+        os.path.splitext(os.path.relpath(manifest_path, manifests_path))[0]: manifest
+        for manifest_path, manifest in ks.load_many(manifest_paths, as_json=True).items()
+        if isinstance(manifest, dict)
+    }
+
+
+def _memoized(method):
+    """Memoize DataFrame derived from repository knowledge in the knowledge session, its copy is returned."""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, self.since) + args + tuple(sorted(kwargs.items()))
+        return self.session.memoize(self.repo_name, key, lambda: method(self, *args, **kwargs)).copy()
+
+    return wrapper
 
 
 class KebechetMetrics:
     """Kebechet Metrics inspected by MI."""
 
-    def __init__(self, repository: str, is_local: bool = False, day: Optional[date] = None):
-        """Initialize with collected knowledge."""
+    def __init__(
+        self,
+        repository: str,
+        is_local: bool = False,
+        day: Optional[date] = None,
+        since: Optional[date] = None,
+        session: Optional[KnowledgeSession] = None,
+    ):
+        """Initialize with collected knowledge.
+
+        If since is set, only pull requests and issues created since that day are loaded,
+        which is enough for metrics of the recent days.
+        If session is given, knowledge and frames derived from it are shared with other
+        metrics using the same session, otherwise they are memoized for this instance only.
+        """
         self.repo_name = repository
+        self.since = since
+        self.session = session or KnowledgeSession(is_local=is_local)
 
-        self.pull_requests = PullRequest(repository_name=repository).load_previous_knowledge(is_local=is_local)
-        self.issues = Issue(repository_name=repository).load_previous_knowledge(is_local=is_local)
+        self.pull_requests = self.session.load_knowledge(PullRequest, repository, since=since)
+        self.issues = self.session.load_knowledge(Issue, repository, since=since)
 
         self.day = day
         self.is_local = is_local
@@ -157,8 +305,20 @@ class KebechetMetrics:
                 return int(comment["created_at"])
         return None
 
+    @_memoized
+    def _get_request_types(self, knowledge_name: str, manager_name: str) -> pd.Series:
+        """Get request types of pull requests or issues for manager, computed once for loaded knowledge."""
+        knowledge = getattr(self, knowledge_name)
+        return get_request_types(knowledge.title, REQUEST_TYPES_AND_KEYWORDS[manager_name])
+
+    @_memoized
     def _get_update_manager_issues(self):
-        update_issues = get_annotated_requests(self.issues, UPDATE_TYPES_AND_KEYWORDS)
+        if self.issues.empty:
+            return pd.DataFrame()
+
+        update_issues = get_annotated_requests(
+            self.issues, UPDATE_TYPES_AND_KEYWORDS, request_types=self._get_request_types("issues", "update")
+        )
 
         if update_issues.empty:
             return pd.DataFrame()
@@ -171,6 +331,7 @@ class KebechetMetrics:
 
         return update_issues.sort_values(by=["created_at"])
 
+    @_memoized
     def get_human_pull_request(self, filter_file=None) -> pd.DataFrame:
         """Get pull requests made by a human."""
         if self.pull_requests.empty:
@@ -179,18 +340,38 @@ class KebechetMetrics:
         requests = self.pull_requests[self.pull_requests["labels"].apply(lambda x: "bot" not in x)]
 
         if filter_file:
-            requests = requests[requests["changed_files"].apply(lambda x: filter_file in x)]
+            requests = requests[requests.index.isin(self.get_file_changes(filter_file).index)]
+
+        return requests.sort_values(by=["created_at"]).rename_axis("id").reset_index()
+
+    def _get_pull_request_files(self) -> pd.DataFrame:
+        """Get table of files changed by the pull requests indexed by file name."""
+        return self.session.memoize(
+            self.repo_name,
+            "pull_request_files",
+            lambda: PullRequest(repository_name=self.repo_name)
+            .load_files(is_local=self.is_local)
+            .set_index("filename")
+            .sort_index(),
+        )
 
-        return requests.sort_values(by=["created_at"]).reset_index(drop=True)
+    @_memoized
+    def get_file_changes(self, filename: str) -> pd.Series:
+        """Get lines of the file changed by each of the pull requests that changed it, indexed by pull request id."""
+        files = self._get_pull_request_files()
+        return files.loc[filename:filename].groupby("pr_id").changes.sum()
 
+    @_memoized
     def _get_update_manager_pull_requests(self) -> pd.DataFrame:
 
         if self.pull_requests.empty:
             return pd.DataFrame()
 
-        self.pull_requests["type"] = self.pull_requests["title"].apply(lambda x: get_update_manager_request_type(x))
+        # knowledge is shared in session, request type is added only to the filtered copy
+        request_types = self._get_request_types("pull_requests", "update")
 
-        requests = self.pull_requests[~self.pull_requests["type"].isnull()].copy()
+        requests = self.pull_requests[~request_types.isnull()].copy()
+        requests["type"] = request_types[~request_types.isnull()]
 
         requests["ttm"] = requests.merged_at.sub(requests.created_at)
         requests["tta"] = requests.first_approve_at - requests.created_at
@@ -202,8 +383,9 @@ class KebechetMetrics:
         requests["merged_by_kebechet_bot"] = requests.merged_by.isin(BOT_NAMES)
         requests["rejected_by_kebechet_bot"] = not_merged & closed_by_bot
 
-        return requests.sort_values(by=["created_at"]).reset_index(drop=True)
+        return requests.sort_values(by=["created_at"]).rename_axis("id").reset_index()
 
+    @_memoized
     def _get_advise_manager_pull_requests(self) -> pd.DataFrame:
 
         if self.pull_requests.empty:
@@ -221,17 +403,20 @@ class KebechetMetrics:
         requests["merged_by_kebechet_bot"] = requests.merged_by.isin(BOT_NAMES)
         requests["rejected_by_kebechet_bot"] = not_merged & closed_by_bot
 
-        return requests.sort_values(by=["created_at"]).reset_index(drop=True)
+        return requests.sort_values(by=["created_at"]).rename_axis("id").reset_index()
 
+    @_memoized
     def _get_version_manager_issues(self) -> pd.DataFrame:
         """Get filtered issues related to version manager."""
         if self.issues.empty:
             return pd.DataFrame()
 
-        version_issues = self.issues.copy()
-        version_issues.version_type = self.issues.title.apply(lambda x: get_version_manager_request_type(x))
+        version_types = self._get_request_types("issues", "version")
+
+        version_issues = self.issues[version_types.notna()].copy()
+        version_issues["version_type"] = version_types[version_types.notna()]
 
-        return version_issues[~version_issues.version_type.isna()]
+        return version_issues
 
     def get_overall_stats_update_manager(self) -> Dict[str, Any]:
         """Return stats over whole repository age."""
@@ -256,82 +441,127 @@ class KebechetMetrics:
 
         return stats
 
+    @_memoized
+    def _get_update_manager_daily_stats(self) -> pd.DataFrame:
+        """Get update manager stats of every day in one pass, median time to merge is in seconds."""
+        prs = self._get_update_manager_pull_requests()
+
+        if prs.empty:
+            return pd.DataFrame()
+
+        prs["date"] = pd.to_datetime(prs.created_at).dt.date
+
+        days = prs.groupby("date", sort=False).agg(
+            created_pull_requests=("ttm", "size"),
+            rejected=("ttm", lambda ttm: ttm.isna().sum()),
+            rejected_by_kebechet_bot=("rejected_by_kebechet_bot", "sum"),
+            merged_by_kebechet_bot=("merged_by_kebechet_bot", "sum"),
+            median_ttm=("ttm", "median"),
+        )
+        days["rejected_by_other"] = days.rejected - days.rejected_by_kebechet_bot
+        days["merged"] = days.created_pull_requests - days.rejected
+        days["merged_by_other"] = days.merged - days.merged_by_kebechet_bot
+        days["median_ttm"] = days.median_ttm.dt.total_seconds().fillna(0)
+
+        return days[UPDATE_MANAGER_STATS_COLUMNS]
+
     def get_daily_stats_update_manager(self) -> Dict[str, Any]:
         """Get daily stats.
 
         If self.day is set, return only stats for that day.
         """
-        prs = self._get_update_manager_pull_requests()
+        days = self._get_update_manager_daily_stats()
 
-        if prs.empty:
+        if days.empty:
             return {}
 
-        prs["date"] = pd.to_datetime(prs.created_at).dt.date
-
-        stats: Dict[str, Any] = {}
-
+        # TODO consider adding median_time to every day statistics (rolling windown maybe?)
         if self.day:
-            prs = prs[prs.date == self.day]
+            days = days[days.index == self.day]
+        else:
+            days = days.drop(columns="median_ttm")
 
-        for specific_date in prs.date.unique():
-            prs_day = prs[prs["days"] == specific_date]
+        days.index = days.index.astype(str).rename(None)
+        return days.to_dict(orient="index")
 
-            day = {}
-            day["created_pull_requests"] = len(prs_day)
+    def _get_daily_metrics_path(self, manager_name: str, day: date) -> Path:
+        """Get path of metrics of the manager for the given day."""
+        return get_daily_metrics_path(self.repo_name, manager_name, day)
 
-            day["rejected"] = len(prs_day[np.isnan(prs_day["ttm"])])
-            day["rejected_by_kebechet_bot"] = len(prs_day[~prs_day["rejected_by_kebechet_bot"].isnull()])
-            day["rejected_by_other"] = day["rejected"] - day["rejected_by_kebechet_bot"]
+    def update_manager_daily_metrics(self, since: date, until: date):
+        """Calculate and store update manager metrics of every day from since to until, one file per day.
 
-            day["merged"] = len(prs_day) - day["rejected"]
-            day["merged_by_kebechet_bot"] = len(prs_day[~prs_day["merged_by_kebechet_bot"].isnull()])
-            day["merged_by_other"] = day["merged"] - day["merged_by_kebechet_bot"]
+        All of the days are computed in one pass over the knowledge, days without any
+        update pull request are not stored. Stored days are recorded in the metrics manifest.
+        """
+        days = self._get_update_manager_daily_stats()
 
-            # TODO consider adding median_time to every day statistics (rolling windown maybe?)
+        if days.empty:
+            return
 
-            if self.day:
-                median_time = prs[prs["days"] == self.day]["ttm"].median()
-                day["median_ttm"] = median_time if not np.isnan(median_time) else 0
-                # return day
+        days = days[(days.index >= since) & (days.index <= until)]
 
-            stats[str(specific_date)] = day
+        documents = {
+            self._get_daily_metrics_path("update_manager", day): {"daily": stats}
+            for day, stats in days.to_dict(orient="index").items()
+        }
+        ks = KnowledgeStorage(is_local=self.is_local)
+        ks.save_many(documents)
 
-        return stats
+        update_metrics_manifest(ks, self.repo_name, "update_manager", [str(day) for day in days.index])
 
     @staticmethod
-    def merge_kebechet_metrics_per_day(day: date, is_local: bool = False):
-        """Merge all the collected metrics under given parent directory."""
-        overall_today = {
-            "created_pull_requests": 0,
-            "rejected": 0,
-            "rejected_by_kebechet_bot": 0,
-            "rejected_by_other": 0,
-            "merged": 0,
-            "merged_by_kebechet_bot": 0,
-            "merged_by_other": 0,
-        }
-        ttms = []
+    def merge_kebechet_metrics(days: List[date], is_local: bool = False):
+        """Merge the collected metrics of all repositories for every given day in one sweep.
 
+        Metrics files are found through the manifests of the repositories instead of listing
+        all of the merge path, so the merge works the same for local and Ceph storage. Manifests
+        are rebuilt from the stored daily metrics the first time, metrics stored before the manifests
+        existed are merged too. All of the files are loaded concurrently and reduced at once.
+        """
         ks = KnowledgeStorage(is_local=is_local)
-        for manager_name in ["update_manager"]:
+        day_names = [str(day) for day in days]
 
-            file_name = f"kebechet_{manager_name}_{str(day)}.json"
+        manifests = load_metrics_manifests(ks)
+        _LOGGER.info("Merging kebechet metrics of %d repositories" % len(manifests))
 
-            for path in Path(Path(f"./{get_merge_path()}/")).rglob(f"*{file_name}"):
-                if path.name == f"overall_{file_name}":
-                    continue
-                data = ks.load_data(file_path=path, as_json=True)
-                for k in data["daily"]:
-                    if k == "median_ttm":
-                        ttms.append(data["daily"][k])
-                    else:
-                        overall_today[k] += data["daily"][k]
+        for manager_name in ["update_manager"]:
 
-            ttm_median = np.nanmedian(ttms)
-            overall_today["median_ttm"] = ttm_median if not np.isnan(ttm_median) else None
+            paths = {}
+            for repository, manifest in manifests.items():
+                for day_name in set(manifest.get(manager_name, [])).intersection(day_names):
+                    paths[get_daily_metrics_path(repository, manager_name, day_name)] = day_name
+
+            missing_days = sorted(set(day_names).difference(paths.values()))
+            if missing_days:
+                _LOGGER.warning(
+                    "No repository has %s metrics stored for %d days: %s"
+                    % (manager_name, len(missing_days), ", ".join(missing_days))
+                )
+
+            records = [
+                {"day": paths[path], **data["daily"]}
+                for path, data in ks.load_many(list(paths), as_json=True).items()
+                if isinstance(data, dict)
+            ]
+            stats = pd.DataFrame.from_records(records, columns=["day"] + UPDATE_MANAGER_STATS_COLUMNS)
+
+            grouped = stats.groupby("day")
+            overall = grouped[UPDATE_MANAGER_STATS_COLUMNS[:-1]].sum().reindex(day_names, fill_value=0).astype(int)
+            # median of the repositories medians, days without any metrics have none
+            overall["median_ttm"] = grouped.median_ttm.median().reindex(day_names).astype(object)
+            overall["median_ttm"] = overall.median_ttm.where(overall.median_ttm.notna(), None)
+
+            documents = {
+                Path(f"./{get_merge_path()}/overall_kebechet_{manager_name}_{day_name}.json"): day_stats
+                for day_name, day_stats in overall.to_dict(orient="index").items()
+            }
+            ks.save_many(documents)
 
-            path = Path(f"./{get_merge_path()}/overall_{file_name}")
-            ks.save_data(path, overall_today)
+    @staticmethod
+    def merge_kebechet_metrics_per_day(day: date, is_local: bool = False):
+        """Merge all the collected metrics under given parent directory."""
+        KebechetMetrics.merge_kebechet_metrics(days=[day], is_local=is_local)
 
     def update_manager(self):
         """Calculate and store update manager metrics."""
@@ -379,35 +609,38 @@ class KebechetMetrics:
             return pd.DataFrame()
 
         prs["date"] = pd.to_datetime(prs.created_at).dt.date
-        metrics = {}
-
-        for specific_date in prs.date.unique():
-
-            pull_requests_per_specific_day = prs[prs.date == specific_date]
-
-            approved = pull_requests_per_specific_day.first_approve_at.notna().sum()
-
-            # Merge stats
-            merged = pull_requests_per_specific_day.merged_at.notna().sum()
-            merged_by_bot = pull_requests_per_specific_day.merged_by_kebechet_bot.sum()
-
-            # Rejection stats
-            rejected = pull_requests_per_specific_day.merged_at.isna().sum()
-            rejected_by_bot = pull_requests_per_specific_day.rejected_by_kebechet_bot.sum()
-
-            metrics[str(specific_date)] = {
-                "created_pull_requests": len(pull_requests_per_specific_day.index),
-                "approved_pull_requests": approved,
-                "merged_pull_requests": merged,
-                "merged_by_bot": merged_by_bot,
-                "merged_by_other": merged - merged_by_bot,
-                "rejected_pull_requests": rejected,
-                "rejected_by_bot": rejected_by_bot,
-                "rejected_by_other": rejected - rejected_by_bot,
-                "daily_mean_time_to_merge": pull_requests_per_specific_day.ttm.mean().seconds,
-            }
-
-        return pd.DataFrame.from_dict(metrics, orient="index")
+        prs["approved"] = prs.first_approve_at.notna()
+        prs["merged"] = prs.merged_at.notna()
+
+        # days in order of their first pull request
+        metrics = prs.groupby("date", sort=False).agg(
+            created_pull_requests=("merged", "size"),
+            approved_pull_requests=("approved", "sum"),
+            merged_pull_requests=("merged", "sum"),
+            merged_by_bot=("merged_by_kebechet_bot", "sum"),
+            rejected_by_bot=("rejected_by_kebechet_bot", "sum"),
+            daily_mean_time_to_merge=("ttm", "mean"),
+        )
+        metrics["merged_by_other"] = metrics.merged_pull_requests - metrics.merged_by_bot
+        metrics["rejected_pull_requests"] = metrics.created_pull_requests - metrics.merged_pull_requests
+        metrics["rejected_by_other"] = metrics.rejected_pull_requests - metrics.rejected_by_bot
+        # seconds component of the mean time as before, not total seconds
+        metrics["daily_mean_time_to_merge"] = metrics.daily_mean_time_to_merge.dt.seconds
+
+        metrics.index = metrics.index.astype(str).rename(None)
+        return metrics[
+            [
+                "created_pull_requests",
+                "approved_pull_requests",
+                "merged_pull_requests",
+                "merged_by_bot",
+                "merged_by_other",
+                "rejected_pull_requests",
+                "rejected_by_bot",
+                "rejected_by_other",
+                "daily_mean_time_to_merge",
+            ]
+        ]
 
     def get_version_metrics_daily(self) -> pd.DataFrame:
         """Get metrics for version manager."""
@@ -416,23 +649,23 @@ class KebechetMetrics:
         if issues.empty:
             return pd.DataFrame()
 
-        issues["date"] = pd.to_datetime(issues.created_at).dt.date
-        metrics = {}
+        created = issues.groupby(pd.to_datetime(issues.created_at).dt.date).size()
 
-        for specific_day in issues.date.unique():
+        # issues are completed or rejected on the day they are closed
+        closed = issues[issues.closed_at.notna()]
+        closed_by_bot = closed.closed_by.isin(BOT_NAMES).groupby(pd.to_datetime(closed.closed_at).dt.date)
 
-            issues_per_specific_day = issues[issues.date == specific_day]
-
-            issues_created = len(issues_per_specific_day.index)
-            issues_completed = len(issues_per_specific_day.closed_by.isin(BOT_NAMES))
-
-            metrics[str(specific_day)] = {
-                "issues_created": issues_created,
-                "issues_completed": issues_completed,
-                "issues_rejected": issues_created - issues_completed,
+        metrics = pd.DataFrame(
+            {
+                "issues_created": created,
+                "issues_completed": closed_by_bot.sum(),
+                "issues_rejected": closed_by_bot.size() - closed_by_bot.sum(),
             }
+        )
+        metrics = metrics.fillna(0).astype(int)
 
-        return pd.DataFrame.from_dict(metrics, orient="index")
+        metrics.index = metrics.index.astype(str).rename(None)
+        return metrics
 
     def save_metrics(self, metrics, metrics_entity: ThothMetrics, metrics_name: str):
         """Save given metrics."""
@@ -475,11 +708,20 @@ class KebechetMetrics:
         """Calculate and store pipfile requirements manager metrics."""
         raise NotImplementedError
 
-    def evaluate_and_store_kebechet_metrics(self):
-        """Calculate and store metrics for every kebechet manager in repository."""
+    def evaluate_and_store_kebechet_metrics(self, since: Optional[date] = None, until: Optional[date] = None):
+        """Calculate and store metrics for every kebechet manager in repository.
+
+        Daily update manager metrics are stored for every day from since to until,
+        both default to the day of the metrics.
+        """
         self.version_manager_daily_metrics()
         self.advise_manager_daily_metrics()
 
+        since = since or self.day
+        until = until or self.day
+        if since and until:
+            self.update_manager_daily_metrics(since=since, until=until)
+
     def _is_advise_manager_used(self):
         """Calculate and store SLI/SLO metrics for advise manager."""
         return not self._get_advise_manager_pull_requests().empty
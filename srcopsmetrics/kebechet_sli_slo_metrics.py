@@ -22,7 +22,9 @@ import pandas as pd
 from typing import Any, Dict, List, Tuple
 
 from srcopsmetrics.entities.thoth_sli_slo import ThothSliSlo
+from srcopsmetrics.entities.tools.storage import map_concurrently
 from srcopsmetrics.kebechet_metrics import KebechetMetrics
+from srcopsmetrics.knowledge_session import KnowledgeSession
 from srcopsmetrics.storage import get_merge_path
 
 import numpy as np
@@ -30,129 +32,167 @@ import numpy as np
 USAGE_TIMESTAMPS_DATAFRAME_COLUMNS = ["repository_name", "manager_name", "timestamp"]
 
 
+REQUEST_KINDS = [
+    "update_pull_requests",
+    "update_issues",
+    "version_issues",
+    "advise_pull_requests",
+    "human_pull_requests",
+    "pull_requests",
+    "issues",
+]
+
+
 def _get_timestamp_from_series(series: pd.Series) -> pd.Series:
-    return series.values.astype(np.int64) // 10**9
+    return series.values.astype("datetime64[s]").astype(np.int64)
+
+
+def _get_file_changes(requests: pd.DataFrame, file_changes: pd.Series) -> pd.Series:
+    """Get lines of the file changed by each of the pull requests, zero for issues.
+
+    File changes are indexed by the pull request id, see KebechetMetrics.get_file_changes.
+    """
+    if "changed_files_changes" not in requests.columns:
+        return pd.Series(0, index=requests.index)
+
+    return requests.id.map(file_changes).fillna(0).astype(int)
 
 
 class KebechetSliSloMetrics:
     """SLI/SLO metrics agregation class for Kebechet managers."""
 
     def __init__(self, repositories: List[str], is_local: bool = False):
-        """Initialize with all kebechet repositories and data location flag."""
-        self.repositories = repositories
+        """Initialize with all kebechet repositories and data location flag, duplicate repositories are dropped."""
+        self.repositories = list(dict.fromkeys(repositories))
         self.is_local = is_local
+        self.session = KnowledgeSession(is_local=is_local)
+
+    def _get_requests_frame(self, repository: str) -> pd.DataFrame:
+        """Get long format frame of Kebechet manager requests of the repository.
 
-    def _get_usage_sli_update_manager(self, kebechet_metrics):
-        is_used_pulls = 0 if kebechet_metrics._get_update_manager_pull_requests().empty else 1
-        is_used_issues = 0 if kebechet_metrics._get_update_manager_issues().empty else 1
-        return {
-            "is_used_in_issues": is_used_issues,
-            "is_used_in_pull_requests": is_used_pulls,
+        Every manager pull request or issue is one row with the kind of the request and
+        lines of Pipfile.lock it changed, all of the rows are tagged with the repository.
+        """
+        kebechet_metrics = KebechetMetrics(repository, is_local=self.is_local, session=self.session)
+
+        frames = {
+            "update_pull_requests": kebechet_metrics._get_update_manager_pull_requests(),
+            "update_issues": kebechet_metrics._get_update_manager_issues(),
+            "version_issues": kebechet_metrics._get_version_manager_issues(),
+            "advise_pull_requests": kebechet_metrics._get_advise_manager_pull_requests(),
+            "human_pull_requests": kebechet_metrics.get_human_pull_request(filter_file="Pipfile.lock"),
         }
 
-    def _get_usage_sli_version_manager(self, kebechet_metrics):
-        is_used = 0 if kebechet_metrics._get_version_manager_issues().empty else 1
-        return {"is_used": is_used}
+        pipfile_lock_changes = kebechet_metrics.get_file_changes("Pipfile.lock")
+        requests = [
+            pd.DataFrame(
+                {
+                    "repository": repository,
+                    "kind": kind,
+                    "pipfile_lock_changes": _get_file_changes(frame, pipfile_lock_changes).values,
+                }
+            )
+            for kind, frame in frames.items()
+            if not frame.empty
+        ]
+        # knowledge itself is recorded by one row, so that repositories with missing knowledge can be counted
+        knowledge = {"pull_requests": kebechet_metrics.pull_requests, "issues": kebechet_metrics.issues}
+        knowledge_kinds = [kind for kind, frame in knowledge.items() if not frame.empty]
+        requests.append(pd.DataFrame({"repository": repository, "kind": knowledge_kinds, "pipfile_lock_changes": 0}))
 
-    def _get_usage_sli_advise_manager(self, kebechet_metrics):
-        is_used = 0 if kebechet_metrics._get_advise_manager_pull_requests().empty else 1
-        return {
-            "is_used": is_used,
-        }
+        return pd.concat(requests, ignore_index=True)
 
-    def _get_source_code_changes_sli(self, kebechet_metrics, bot_prs):
-        human_prs = kebechet_metrics.get_human_pull_request(filter_file="Pipfile.lock")
-        total_lines_changed_by_bot = 0
-        total_lines_changed_by_human = 0
-        for index, pr in bot_prs.iterrows():
-            if "Pipfile.lock" in pr["changed_files_changes"]:
-                total_lines_changed_by_bot += pr["changed_files_changes"]["Pipfile.lock"]
-
-        for index, pr in human_prs.iterrows():
-            if "Pipfile.lock" in pr["changed_files_changes"]:
-                total_lines_changed_by_human += pr["changed_files_changes"]["Pipfile.lock"]
-        return {
-            "total_lines_changed_by_bot": total_lines_changed_by_bot,
-            "percent_by_bot": total_lines_changed_by_bot / (total_lines_changed_by_bot + total_lines_changed_by_human),
-        }
+    def _get_sli_slo_frame(self) -> pd.DataFrame:
+        """Get SLI/SLO of all repositories as a frame indexed by repository.
 
-    def _evaluate_sli_slo(self, repository):
+        Knowledge of the repositories is loaded concurrently, SLI are then computed
+        for all of the repositories at once.
+        """
+        requests = pd.concat(
+            map_concurrently(self._get_requests_frame, self.repositories, description="Evaluating SLI/SLO"),
+            ignore_index=True,
+        )
 
-        kebechet_metrics = KebechetMetrics(repository, is_local=self.is_local)
+        grouped = requests.groupby(["repository", "kind"]).pipfile_lock_changes
+        counts = grouped.size().unstack(fill_value=0).reindex(index=self.repositories, columns=REQUEST_KINDS)
+        changes = grouped.sum().unstack(fill_value=0).reindex(index=self.repositories, columns=REQUEST_KINDS)
+        counts, changes = counts.fillna(0).astype(int), changes.fillna(0).astype(int)
 
-        # get sli/slo for managers
-        usage_sli_update = self._get_usage_sli_update_manager(kebechet_metrics)
-        usage_sli_version = self._get_usage_sli_version_manager(kebechet_metrics)
-        usage_sli_advise = self._get_usage_sli_advise_manager(kebechet_metrics)
+        sli_slo = pd.DataFrame(index=self.repositories)
+        sli_slo["advise_is_used"] = (counts.advise_pull_requests > 0).astype(int)
+        sli_slo["version_is_used"] = (counts.version_issues > 0).astype(int)
+        sli_slo["update_is_used_in_issues"] = (counts.update_issues > 0).astype(int)
+        sli_slo["update_is_used_in_pull_requests"] = (counts.update_pull_requests > 0).astype(int)
 
-        source_code_changes_sli_update = self._get_source_code_changes_sli(
-            kebechet_metrics, kebechet_metrics._get_update_manager_pull_requests()
-        )
-        source_code_changes_sli_advise = self._get_source_code_changes_sli(
-            kebechet_metrics, kebechet_metrics._get_advise_manager_pull_requests()
-        )
+        for manager_name in ["advise", "update"]:
+            by_bot = changes[f"{manager_name}_pull_requests"]
+            sli_slo[f"{manager_name}_total_lines_changed_by_bot"] = by_bot
 
-        # merge data into one dataframe with unique indices
-        data = {
-            "advise": {**usage_sli_advise, **source_code_changes_sli_advise},
-            "version": {**usage_sli_version},
-            "update": {**usage_sli_update, **source_code_changes_sli_update},
-            "missing_issue_metrics": kebechet_metrics.issues.empty,
-            "missing_pull_request_metrics": kebechet_metrics.pull_requests.empty,
-        }
+            # repositories without any Pipfile.lock change have no percent
+            total = by_bot + changes.human_pull_requests
+            sli_slo[f"{manager_name}_total_lines_changed"] = total
+            sli_slo[f"{manager_name}_percent_by_bot"] = by_bot / total.replace(0, np.nan)
 
-        return data
+        sli_slo["missing_issue_metrics"] = counts.issues == 0
+        sli_slo["missing_pull_request_metrics"] = counts.pull_requests == 0
+
+        return sli_slo
 
     def _get_sli_slo_for_all_managers(self) -> Tuple[Any, Any]:
         """Return a tuple of overall aggregated metrics and overall sli metrics for each repository."""
+        sli_slo = self._get_sli_slo_frame()
+        totals = sli_slo.sum()
+
+        # share of all of the changes, not a sum of the shares of the repositories
+        percent_by_bot = {
+            manager_name: float(
+                totals[f"{manager_name}_total_lines_changed_by_bot"] / totals[f"{manager_name}_total_lines_changed"]
+                if totals[f"{manager_name}_total_lines_changed"]
+                else np.nan
+            )
+            for manager_name in ["advise", "update"]
+        }
+
         overall_sli_slo_data: Dict[str, Any] = {
             "advise": {
-                "repository_usage_count": 0,
-                "total_source_code_lines_changed_by_bot": 0,
-                "percent_source_code_changes_by_bot": 0,
+                "repository_usage_count": int(totals.advise_is_used),
+                "total_source_code_lines_changed_by_bot": int(totals.advise_total_lines_changed_by_bot),
+                "percent_source_code_changes_by_bot": percent_by_bot["advise"],
             },
-            "version": {"repository_usage_count": 0},
+            "version": {"repository_usage_count": int(totals.version_is_used)},
             "update": {
-                "repository_usage_count": 0,
-                "total_source_code_lines_changed_by_bot": 0,
-                "percent_source_code_changes_by_bot": 0,
+                # TODO: update manager & other
+                "repository_usage_count": int(
+                    (sli_slo.update_is_used_in_issues | sli_slo.update_is_used_in_pull_requests).sum()
+                ),
+                "total_source_code_lines_changed_by_bot": int(totals.update_total_lines_changed_by_bot),
+                "percent_source_code_changes_by_bot": percent_by_bot["update"],
             },
             "overall_repositories": len(self.repositories),
-            "repositories_missing_issue_metric": 0,
-            "repositories_missing_pull_request_metric": 0,
+            "repositories_missing_issue_metric": int(totals.missing_issue_metrics),
+            "repositories_missing_pull_request_metric": int(totals.missing_pull_request_metrics),
         }
 
         # raw data per repository
-        raw_sli_slo_data = {}
-
-        for repo in self.repositories:
-
-            # for each repo evaluate sli slo
-            data = self._evaluate_sli_slo(repo)
-
-            # add data to overall dict
-            raw_sli_slo_data[repo] = data
-
-            # add data to overall manager metrics count
-            overall_sli_slo_data["advise"]["repository_usage_count"] += data["advise"]["is_used"]
-            overall_sli_slo_data["version"]["repository_usage_count"] += data["version"]["is_used"]
-            overall_sli_slo_data["repositories_missing_issue_metric"] += data["missing_issue_metrics"]
-            overall_sli_slo_data["repositories_missing_pull_request_metric"] += data["missing_pull_request_metrics"]
-
-            # add data to overall code changes count
-            overall_sli_slo_data["advise"]["total_source_code_lines_changed_by_bot"] += data["advise"][
-                "total_lines_changed_by_bot"
-            ]
-            overall_sli_slo_data["advise"]["percent_source_code_changes_by_bot"] += data["advise"]["percent_by_bot"]
-            overall_sli_slo_data["update"]["total_source_code_lines_changed_by_bot"] += data["update"][
-                "total_lines_changed_by_bot"
-            ]
-            overall_sli_slo_data["update"]["percent_source_code_changes_by_bot"] += data["update"]["percent_by_bot"]
-
-            # TODO: update manager & other
-            overall_sli_slo_data["update"]["repository_usage_count"] += (
-                data["update"]["is_used_in_issues"] or data["update"]["is_used_in_pull_requests"]
-            )
+        raw_sli_slo_data = {
+            repo: {
+                "advise": {
+                    "is_used": data["advise_is_used"],
+                    "total_lines_changed_by_bot": data["advise_total_lines_changed_by_bot"],
+                    "percent_by_bot": data["advise_percent_by_bot"],
+                },
+                "version": {"is_used": data["version_is_used"]},
+                "update": {
+                    "is_used_in_issues": data["update_is_used_in_issues"],
+                    "is_used_in_pull_requests": data["update_is_used_in_pull_requests"],
+                    "total_lines_changed_by_bot": data["update_total_lines_changed_by_bot"],
+                    "percent_by_bot": data["update_percent_by_bot"],
+                },
+                "missing_issue_metrics": data["missing_issue_metrics"],
+                "missing_pull_request_metrics": data["missing_pull_request_metrics"],
+            }
+            for repo, data in sli_slo.astype(object).to_dict(orient="index").items()
+        }
 
         return (overall_sli_slo_data, raw_sli_slo_data)
 
@@ -177,48 +217,46 @@ class KebechetSliSloMetrics:
         sli_slo_metrics, _ = self._get_sli_slo_for_all_managers()
         self._store_metrics(sli_slo_metrics, "kebechet_sli_slo")
 
-    def _evaluate_usage(self, repository: str, usage_data: pd.DataFrame):
-        """Evaluate usage timestamps across all managers for specific repository.
-
-        Add usage timestamps to the passed dataframe
-        """
-        kebechet_metrics = KebechetMetrics(repository, is_local=self.is_local)
-
-        advise = pd.DataFrame(columns=USAGE_TIMESTAMPS_DATAFRAME_COLUMNS)
-        advise.timestamp = kebechet_metrics._get_advise_manager_pull_requests().created_at
-        advise["manager_name"] = "advise"
-
-        version = pd.DataFrame(columns=USAGE_TIMESTAMPS_DATAFRAME_COLUMNS)
-        version.timestamp = kebechet_metrics._get_version_manager_issues().created_at
-        version["manager_name"] = "version"
+    def _evaluate_usage(self, repository: str) -> pd.DataFrame:
+        """Evaluate usage timestamps across all managers for specific repository."""
+        kebechet_metrics = KebechetMetrics(repository, is_local=self.is_local, session=self.session)
 
-        update = pd.DataFrame(columns=USAGE_TIMESTAMPS_DATAFRAME_COLUMNS)
-        update.timestamp = kebechet_metrics._get_update_manager_issues().created_at
-        # TODO add PRs
-        version["manager_name"] = "version"
+        requests = {
+            "advise": kebechet_metrics._get_advise_manager_pull_requests(),
+            "version": kebechet_metrics._get_version_manager_issues(),
+            # TODO add PRs
+            "update": kebechet_metrics._get_update_manager_issues(),
+        }
 
+        # add repo column and convert datetime to timestamps
         data_list = [
-            advise,
-            version,
+            pd.DataFrame(
+                {
+                    "repository_name": repository,
+                    "manager_name": manager_name,
+                    "timestamp": _get_timestamp_from_series(data.created_at),
+                },
+                columns=USAGE_TIMESTAMPS_DATAFRAME_COLUMNS,
+            )
+            for manager_name, data in requests.items()
+            if not data.empty
         ]
-        # add repo column and convert datetime to timestamps
-        for data in data_list:
-            data.repository_name = repository
-            data.timestamp = _get_timestamp_from_series(data.timestamp)
 
-        data_list.append(usage_data)
-        return pd.concat(data_list)
+        if not data_list:
+            return pd.DataFrame(columns=USAGE_TIMESTAMPS_DATAFRAME_COLUMNS)
+        return pd.concat(data_list, ignore_index=True)
 
     def _get_usage_counts_for_all_managers(self) -> Any:
-        """Return usage timestamps for each repository."""
-        data = pd.DataFrame(columns=USAGE_TIMESTAMPS_DATAFRAME_COLUMNS)
+        """Return usage timestamps for each repository.
 
-        for repo in self.repositories:
-
-            # for each repo evaluate sli slo
-            data = self._evaluate_usage(repo, data)
+        Usage of the repositories is evaluated concurrently and concatenated once.
+        """
+        data = map_concurrently(self._evaluate_usage, self.repositories, description="Evaluating usage")
+        data = [usage for usage in data if not usage.empty]
 
-        return data
+        if not data:
+            return pd.DataFrame(columns=USAGE_TIMESTAMPS_DATAFRAME_COLUMNS)
+        return pd.concat(data, ignore_index=True)
 
     def evaluate_and_store_usage_timestamp_sli_slo_kebechet_metrics(self):
         """Evaluate ans save SLI usage counts for all kebechet repositories."""
@@ -0,0 +1,88 @@
+# Copyright (C) 2022 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Knowledge loaded once per run and shared by metrics of the repositories."""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Optional, Type, TypeVar
+
+import pandas as pd
+
+from srcopsmetrics.entities import Entity
+
+_LOGGER = logging.getLogger(__name__)
+
+SESSION_MAX_REPOSITORIES = int(os.getenv("MI_SESSION_MAX_REPOSITORIES", 16))
+
+T = TypeVar("T")
+
+
+class KnowledgeSession:
+    """Knowledge of repositories loaded once per run.
+
+    Loaded entities and frames derived from them are memoized per repository,
+    only the most recently used repositories are kept, knowledge of the others
+    is evicted to keep memory bounded.
+    """
+
+    def __init__(self, is_local: bool = False, max_repositories: int = SESSION_MAX_REPOSITORIES):
+        """Initialize empty session for knowledge either from local storage or Ceph."""
+        self.is_local = is_local
+        self.max_repositories = max_repositories
+        self._repositories: "OrderedDict[str, Dict[Hashable, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_repository_cache(self, repository: str) -> Dict[Hashable, Any]:
+        """Get memoized knowledge of repository, evict least recently used repository if needed."""
+        with self._lock:
+            if repository in self._repositories:
+                self._repositories.move_to_end(repository)
+                return self._repositories[repository]
+
+            self._repositories[repository] = {}
+            while len(self._repositories) > self.max_repositories:
+                evicted, _ = self._repositories.popitem(last=False)
+                _LOGGER.debug("Evicted knowledge of %s from session" % evicted)
+
+            return self._repositories[repository]
+
+    def memoize(self, repository: str, key: Hashable, func: Callable[[], T]) -> T:
+        """Get value memoized for repository under the key, compute it by func if it is not memoized."""
+        cache = self._get_repository_cache(repository)
+        if key not in cache:
+            cache[key] = func()
+        return cache[key]
+
+    def load_knowledge(self, entity_cls: Type[Entity], repository: str, since: Optional[date] = None) -> pd.DataFrame:
+        """Load knowledge of entity for repository, the same knowledge is loaded only once.
+
+        Returned DataFrame is shared, it must not be modified in place.
+        """
+        return self.memoize(
+            repository,
+            (entity_cls.name(), since),
+            lambda: entity_cls(repository_name=repository).load_previous_knowledge(is_local=self.is_local, since=since),
+        )
+
+    def clear(self):
+        """Evict knowledge of all repositories."""
+        with self._lock:
+            self._repositories.clear()
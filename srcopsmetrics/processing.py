@@ -20,29 +20,115 @@
 import logging
 import os
 from datetime import datetime
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
 from srcopsmetrics.entities.issue import Issue
 from srcopsmetrics.entities.pull_request import PullRequest
-from srcopsmetrics.storage import ProcessedKnowledge
+from srcopsmetrics.entities.tools import serialization
+from srcopsmetrics.entities.tools.storage import normalize_timestamps
+from srcopsmetrics.entities.tools.validation import validate_entities
+from srcopsmetrics.enums import ValidationModeEnum
+from srcopsmetrics.storage import INCREMENTAL_PROCESSING, ProcessedKnowledge
 from srcopsmetrics.utils import convert_num2label, convert_score2num
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class ContributorInteractions:
+    """Sparse contributors x contributors interaction matrix.
+
+    Only non-zero interactions are kept, contributors are mapped to matrix indices by their login,
+    so memory scales with number of interactions instead of squared number of contributors.
+    """
+
+    def __init__(self, contributors: List[str]):
+        """Initialize empty interactions of given contributors."""
+        self.contributors = list(dict.fromkeys(contributors))
+        self.index = {contributor: i for i, contributor in enumerate(self.contributors)}
+        self._rows: Dict[int, Dict[int, int]] = {}
+
+    def add(self, author: str, contributor: str, interaction: int):
+        """Add interaction of contributor with author, interactions of unknown contributors (bots) are ignored."""
+        if author not in self.index or contributor not in self.index:
+            return
+
+        row = self._rows.setdefault(self.index[author], {})
+        col = self.index[contributor]
+        row[col] = row.get(col, 0) + interaction
+
+    def __getitem__(self, author: str) -> Dict[str, int]:
+        """Get non-zero interactions of author with contributors, keyed by contributor login."""
+        if author not in self.index:
+            raise KeyError(author)
+
+        return {self.contributors[j]: value for j, value in self._rows.get(self.index[author], {}).items() if value}
+
+    def nnz(self) -> int:
+        """Get number of stored non-zero interactions."""
+        return sum(len(row) for row in self._rows.values())
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """Serialize interactions in coordinate format."""
+        coordinates = [(i, j, value) for i, row in self._rows.items() for j, value in row.items() if value]
+        return {
+            "contributors": list(self.contributors),
+            "row": [i for i, _, _ in coordinates],
+            "col": [j for _, j, _ in coordinates],
+            "data": [value for _, _, value in coordinates],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, List[Any]]) -> "ContributorInteractions":
+        """Deserialize interactions stored in coordinate format."""
+        interactions = cls(data["contributors"])
+        for i, j, value in zip(data["row"], data["col"], data["data"]):
+            interactions._rows.setdefault(i, {})[j] = value
+
+        return interactions
+
+
+def load_stored_entities(entity_cls: type, repository: str, is_local: bool = False) -> Dict[str, Dict[str, Any]]:
+    """Load stored knowledge of the repository as entities keyed by id, dates are POSIX timestamps in seconds."""
+    knowledge = entity_cls(repository_name=repository).load_previous_knowledge(is_local=is_local)
+    if knowledge.empty:
+        return {}
+
+    return serialization.loads(normalize_timestamps(knowledge).to_json(orient="index"))
+
+
 class Processing:
     """Pre processing functions for entity extracted."""
 
-    def __init__(self, issues, pull_requests):
+    def __init__(self, issues, pull_requests, validation_mode: ValidationModeEnum = ValidationModeEnum.SKIP):
         """Initialize with issues and pull requests knowledge.
 
         If any of the entities is not specified, the behaviour
         of corresponding process function is undefined.
+
+        Knowledge loaded from MI storage was validated when it was saved,
+        therefore it is not validated again unless validation mode is specified.
         """
-        self.issues = Issue.entities_schema(issues)
-        self.pull_requests = PullRequest.entities_schema(pull_requests)
+        if issues is not None:
+            validate_entities(Issue.entity_schema, issues, mode=validation_mode)
+        if pull_requests is not None:
+            validate_entities(PullRequest.entity_schema, pull_requests, mode=validation_mode)
+
+        self.issues = issues
+        self.pull_requests = pull_requests
+        self._stored_processing: Optional["Processing"] = None
+
+    def get_stored_processing(self, is_local: bool = False) -> "Processing":
+        """Get processing of all of the stored knowledge of the project, the knowledge is loaded once."""
+        if self._stored_processing is None:
+            project = os.environ["PROJECT"]
+            self._stored_processing = Processing(
+                issues=load_stored_entities(Issue, project, is_local=is_local),
+                pull_requests=load_stored_entities(PullRequest, project, is_local=is_local),
+            )
+
+        return self._stored_processing
 
     def regenerate(self):
         """Process stored knowledge and save it."""
@@ -55,6 +141,34 @@ class Processing:
         self.process_issue_labels_to_issue_creators()
         _LOGGER.info("Processed knowledge generated")
 
+    def update(self):
+        """Fold processed knowledge of newly extracted entities into the stored one.
+
+        Issues and pull requests are expected to be only the entities newly extracted
+        by the last analysis, so the cost of processing scales with the daily delta.
+        Only views additive over entities are updated, issues closed by pull request size
+        need the referenced issues which are not part of the new entities, use regenerate for it.
+        Views not processed before are generated from all of the stored knowledge.
+        """
+        process_knowledge = os.getenv("PROCESS_KNOWLEDGE")
+        os.environ["PROCESS_KNOWLEDGE"] = INCREMENTAL_PROCESSING
+        try:
+            self.process_issues_creators()
+            self.process_issues_closers()
+            self.process_issue_interactions()
+            self.process_issue_labels_to_issue_closers()
+            self.process_issue_labels_to_issue_creators()
+        finally:
+            if process_knowledge is None:
+                del os.environ["PROCESS_KNOWLEDGE"]
+            else:
+                os.environ["PROCESS_KNOWLEDGE"] = process_knowledge
+
+        _LOGGER.info(
+            "Processed knowledge updated with %d issues and %d pull requests"
+            % (len(self.issues), len(self.pull_requests))
+        )
+
     def process_issues_project_data(self):
         """Pre process of data for a given project repository."""
         if not self.issues:
@@ -199,10 +313,7 @@ class Processing:
         contributors_reviews_data["reviewers"] = []
         contributors_reviews_data["created_dts"] = []
 
-        interactions = {}
-        for contributor in contributors:
-            contributor_interaction = dict.fromkeys(contributors, 0)
-            interactions[contributor] = contributor_interaction
+        interactions = ContributorInteractions(contributors)
 
         for pr_id in pr_ids:
             pr = self.pull_requests[str(pr_id)]
@@ -246,6 +357,9 @@ class Processing:
             contributors_reviews_data[reviewer]["median_pr_length_score"] = contributor_relative_score
             contributors_reviews_data[reviewer]["interactions"] = interactions[reviewer]
 
+        # GitHub logins can not contain underscores, so the key does not collide with any contributor
+        contributors_reviews_data["contributors_interactions"] = interactions.to_dict()
+
         return contributors_reviews_data
 
     def _analyze_pr_for_contributor_data(self, pr_id: int, pr: Dict[str, Any], extracted_data: Dict[str, Any]):
@@ -366,7 +480,7 @@ class Processing:
 
     @staticmethod
     def _analyze_contributors_interaction(
-        pr_interactions: Dict[str, int], pr_author: str, interactions_data: Dict[str, Dict[str, int]]
+        pr_interactions: Dict[str, int], pr_author: str, interactions_data: ContributorInteractions
     ):
         """Analyze project contributors interactions."""
         if not pr_interactions:
@@ -374,11 +488,8 @@ class Processing:
 
         for contributor, interaction_info in pr_interactions.items():
             if contributor != pr_author:
-                # Check if it is a bot.
-                if contributor not in interactions_data[pr_author].keys():
-                    pass
-                else:
-                    interactions_data[pr_author][contributor] += interaction_info
+                # Interactions of bots are ignored as they are not contributors.
+                interactions_data.add(author=pr_author, contributor=contributor, interaction=interaction_info)
 
         return interactions_data
 
@@ -451,7 +562,7 @@ class Processing:
                 continue
 
             pr_author = self.pull_requests[pr_id]["created_by"]
-            for _ in self.pull_requests[pr_id]["referenced_issues"]:
+            for _ in self.pull_requests[pr_id].get("referenced_issues", []):
                 if pr_author not in closers:
                     closers[pr_author] = 0
                 closers[pr_author] += 1
@@ -544,7 +655,7 @@ class Processing:
             if pr_author not in closers:
                 closers[pr_author] = {}
 
-            for ref_issue in self.pull_requests[pr_id]["referenced_issues"]:
+            for ref_issue in self.pull_requests[pr_id].get("referenced_issues", []):
                 if ref_issue not in self.issues.keys():
                     # TODO: re-implement extracting referenced issues by event @mentioned
                     continue
@@ -17,7 +17,6 @@
 
 """GitHub Knowledge Storage handling."""
 
-import json
 import logging
 import os
 from functools import partial
@@ -28,10 +27,13 @@ from thoth.storages.ceph import CephStore
 from thoth.storages.exceptions import NotFoundError
 
 from srcopsmetrics import utils
+from srcopsmetrics.entities.tools import serialization
 from srcopsmetrics.enums import StoragePath
 
 _LOGGER = logging.getLogger(__name__)
 
+INCREMENTAL_PROCESSING = "Incremental"
+
 
 def get_knowledge_path():
     """Return knowledge path value."""
@@ -43,6 +45,20 @@ def get_merge_path() -> str:
     return os.getenv(StoragePath.MERGE_LOCATION_ENVVAR_NAME.value, StoragePath.MERGE_PATH.value)
 
 
+def merge_processed_knowledge(stored: Any, processed: Any) -> Any:
+    """Fold additive processed knowledge into the stored one.
+
+    Numbers are summed, lists are concatenated and dictionaries are merged key by key.
+    """
+    if isinstance(stored, dict) and isinstance(processed, dict):
+        merged = dict(stored)
+        for key, value in processed.items():
+            merged[key] = merge_processed_knowledge(merged[key], value) if key in merged else value
+        return merged
+
+    return stored + processed
+
+
 class ProcessedKnowledge:
     """Decorator for Processing() methods implemented as a descriptor.
 
@@ -50,6 +66,11 @@ class ProcessedKnowledge:
     if yes it loads it and returns it,
     if not it calls the processing function, stores the processed information
     and returns it
+
+    If PROCESS_KNOWLEDGE is set to Incremental, the processing function is expected
+    to process only newly extracted entities and its result is folded into the stored
+    processed knowledge. If it was not processed before, it is generated from all of
+    the stored knowledge of the project instead.
     """
 
     def __init__(self, f):
@@ -75,8 +96,25 @@ class ProcessedKnowledge:
         storage = KnowledgeStorage(is_local)
 
         knowledge = storage.load_previous_knowledge(file_path=total_path, knowledge_type="Processed Knowledge")
+        # processed knowledge is stored under the results key
+        if isinstance(knowledge, dict) and "results" in knowledge:
+            knowledge = knowledge["results"]
+
+        process_knowledge = os.getenv("PROCESS_KNOWLEDGE")
+
+        if process_knowledge == INCREMENTAL_PROCESSING:
+            # keys are normalized the same way as the stored ones
+            if knowledge is None or knowledge == {}:
+                # new entities are part of the stored knowledge already
+                _LOGGER.info("%s was not processed before, it is generated from stored knowledge" % total_path)
+                processing = args[0].get_stored_processing(is_local=is_local)
+                knowledge = serialization.loads(serialization.dumps(self.func(processing, *args[1:], **kwargs)))
+            else:
+                processed = serialization.loads(serialization.dumps(wrapper()))
+                knowledge = merge_processed_knowledge(knowledge, processed)
+            storage.save_knowledge(file_path=total_path, data=knowledge)
 
-        if knowledge is None or knowledge == {} or os.getenv("PROCESS_KNOWLEDGE") == "True":
+        elif knowledge is None or knowledge == {} or process_knowledge == "True":
             knowledge = wrapper()
             storage.save_knowledge(file_path=total_path, data=knowledge)
 
@@ -142,7 +180,7 @@ class KnowledgeStorage:
             _LOGGER.info("Saved on CEPH at %s/%s%s" % (s3.bucket, s3.prefix, ceph_filename))
         else:
             with open(file_path, "w") as f:
-                json.dump(results, f)
+                f.write(serialization.dumps(results))
             _LOGGER.info("Saved locally at %s" % file_path)
 
     def load_previous_knowledge(
@@ -188,8 +226,8 @@ class KnowledgeStorage:
         if not file_path.exists() or os.path.getsize(file_path) == 0:
             _LOGGER.debug("Knowledge %s not found locally" % file_path)
             return None
-        with open(file_path, "r") as f:
-            data = json.load(f)
+        with open(file_path, "rb") as f:
+            data = serialization.loads(f.read())
         return data
 
     def load_remotely(self, file_path: Path) -> Optional[Dict[str, Any]]:
@@ -197,7 +235,7 @@ class KnowledgeStorage:
         _LOGGER.info("Loading knowledge from Ceph")
         ceph_filename = os.path.relpath(file_path).replace("./", "")
         try:
-            return self.get_ceph_store().retrieve_document(ceph_filename)
+            return serialization.loads(self.get_ceph_store().retrieve_blob(ceph_filename))
         except NotFoundError:
             _LOGGER.debug("Knowledge %s not found on Ceph" % file_path)
             return None
@@ -35,7 +35,7 @@ def check_directory(knowledge_dir: Path):
     """Check if directory exists. If not, create one."""
     if not knowledge_dir.exists():
         _LOGGER.info("No repo identified, creating new directory at %s" % knowledge_dir)
-        os.makedirs(knowledge_dir)
+        os.makedirs(knowledge_dir, exist_ok=True)
 
 
 def remove_previously_processed(project_name: str):
@@ -0,0 +1,48 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Shared fixtures of SrcOpsMetrics tests."""
+
+from typing import Any, Dict, Type
+
+import pandas as pd
+import pytest
+
+from srcopsmetrics.entities import Entity
+from srcopsmetrics.enums import StoragePath
+
+
+@pytest.fixture
+def knowledge_path(tmp_path, monkeypatch):
+    """Store knowledge locally in a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(StoragePath.LOCATION_VAR.value, str(tmp_path / "knowledge"))
+    monkeypatch.setenv(StoragePath.MERGE_LOCATION_ENVVAR_NAME.value, str(tmp_path / "merge"))
+    monkeypatch.setenv("IS_LOCAL", "True")
+    return tmp_path
+
+
+@pytest.fixture
+def save_knowledge(knowledge_path):
+    """Save entities as stored knowledge of a repository."""
+
+    def _save(entity_cls: Type[Entity], repository: str, entities: Dict[str, Dict[str, Any]]):
+        df = pd.DataFrame.from_dict(entities, orient="index")
+        df["id"] = df.index
+        entity_cls(repository_name=repository).file_path.write_text(df.to_json(orient="records", lines=True))
+
+    return _save
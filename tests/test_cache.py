@@ -0,0 +1,96 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of local cache of knowledge stored on Ceph."""
+
+import io
+import os
+from types import SimpleNamespace
+
+import boto3
+import pytest
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+from thoth.storages.exceptions import NotFoundError
+
+from srcopsmetrics.entities.tools.cache import CephCache
+
+S3 = SimpleNamespace(
+    host="http://ceph:8080", key_id="key", secret_key="secret", region=None, bucket="bucket", prefix="mi/"
+)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Stub S3 client used by the cache."""
+    client = boto3.client(
+        "s3", aws_access_key_id="key", aws_secret_access_key="secret", region_name="us-east-1", endpoint_url=S3.host
+    )
+    monkeypatch.setattr(CephCache, "get_client", classmethod(lambda cls, s3: client))
+    with Stubber(client) as stubber:
+        yield stubber
+        stubber.assert_no_pending_responses()
+
+
+def _response(blob: bytes, etag: str):
+    return {"Body": StreamingBody(io.BytesIO(blob), len(blob)), "ETag": etag}
+
+
+def test_not_modified_object_is_served_from_cache(tmp_path, client):
+    """Test that object is downloaded only once while its ETag does not change."""
+    cache = CephCache(tmp_path)
+    request = {"Bucket": "bucket", "Key": "mi/Issue.json"}
+
+    client.add_response("get_object", _response(b"foo", '"1"'), request)
+    client.add_client_error(
+        "get_object", "304", http_status_code=304, expected_params={**request, "IfNoneMatch": '"1"'}
+    )
+    client.add_response("get_object", _response(b"bar", '"2"'), {**request, "IfNoneMatch": '"1"'})
+
+    assert cache.retrieve_blob(S3, "Issue.json") == b"foo"
+    assert cache.retrieve_blob(S3, "Issue.json") == b"foo"
+    assert cache.retrieve_blob(S3, "Issue.json") == b"bar"
+
+    # content and its ETag are stored together
+    assert [p.read_bytes() for p in tmp_path.iterdir()] == [b'"2"\nbar']
+
+
+def test_missing_object_is_removed_from_cache(tmp_path, client):
+    """Test that object removed from Ceph is removed from the cache too."""
+    cache = CephCache(tmp_path)
+
+    client.add_response("get_object", _response(b"foo", '"1"'))
+    client.add_client_error("get_object", "NoSuchKey", http_status_code=404)
+
+    cache.retrieve_blob(S3, "Issue.json")
+    with pytest.raises(NotFoundError):
+        cache.retrieve_blob(S3, "Issue.json")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_least_recently_used_objects_are_evicted(tmp_path, client):
+    """Test that the cache is kept within its size."""
+    cache = CephCache(tmp_path, max_size=10)
+
+    for i in range(3):
+        client.add_response("get_object", _response(b"x" * 5, f'"{i}"'))
+        cache.retrieve_blob(S3, f"{i}.json")
+        for path in tmp_path.iterdir():
+            # objects cached before are older
+            os.utime(path, (i, i))
+
+    assert sorted(p.read_bytes() for p in tmp_path.iterdir()) == [b'"2"\nxxxxx']
@@ -0,0 +1,38 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of the command line interface."""
+
+from click.testing import CliRunner
+
+from srcopsmetrics.cli import cli
+
+
+def test_since_requires_thoth():
+    """Test that backfill range is rejected without Kebechet metrics."""
+    result = CliRunner().invoke(cli, ["-l", "--since", "2021-01-01"])
+
+    assert result.exit_code == 2
+    assert "--since/--until" in result.output
+
+
+def test_since_after_until_is_rejected():
+    """Test that empty backfill range is rejected instead of computing nothing."""
+    result = CliRunner().invoke(cli, ["-tl", "--since", "2021-01-02", "--until", "2021-01-01"])
+
+    assert result.exit_code == 2
+    assert "2021-01-02 is after the last day 2021-01-01" in result.output
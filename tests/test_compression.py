@@ -0,0 +1,65 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of knowledge compression."""
+
+import pytest
+
+from srcopsmetrics.entities.tools import compression
+from srcopsmetrics.entities.tools.compression import compress, decompress, detect_compression, get_compression
+from srcopsmetrics.entities.tools.storage import KnowledgeStorage
+from srcopsmetrics.enums import CompressionEnum
+
+DATA = b'{"title":"foo","id":1}\n{"title":"bar","id":2}\n'
+
+
+@pytest.mark.parametrize("method", [CompressionEnum.NONE, CompressionEnum.GZIP])
+def test_compress_round_trip(method):
+    """Test that compressed data are detected and decompressed."""
+    compressed = compress(DATA, method)
+
+    assert detect_compression(compressed) == method
+    assert decompress(compressed) == DATA
+
+
+def test_gzip_is_deterministic():
+    """Test that the same knowledge gives the same compressed object."""
+    assert compress(DATA, CompressionEnum.GZIP) == compress(DATA, CompressionEnum.GZIP)
+
+
+def test_zstd_falls_back_to_gzip(monkeypatch):
+    """Test that gzip is used if zstandard is not installed."""
+    monkeypatch.setenv("MI_COMPRESSION", CompressionEnum.ZSTD.value)
+    monkeypatch.setattr(compression, "zstandard", None)
+
+    assert get_compression() == CompressionEnum.GZIP
+
+
+@pytest.mark.parametrize("method", [CompressionEnum.NONE, CompressionEnum.GZIP])
+def test_compressed_knowledge_is_loaded(knowledge_path, monkeypatch, method):
+    """Test that knowledge saved with any compression is loaded the same way."""
+    monkeypatch.setenv("MI_COMPRESSION", method.value)
+    storage = KnowledgeStorage(is_local=True)
+    file_path = knowledge_path / "Issue.json"
+
+    storage.save_serialized(DATA.decode(), file_path)
+    df = storage.load_data(file_path)
+    storage.save_data(knowledge_path / "manifest.json", {"partitions": ["2021-01"]})
+
+    assert detect_compression(file_path.read_bytes()) == method
+    assert df.to_dict(orient="index") == {1: {"title": "foo"}, 2: {"title": "bar"}}
+    assert storage.load_data(knowledge_path / "manifest.json", as_json=True) == {"partitions": ["2021-01"]}
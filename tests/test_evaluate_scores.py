@@ -0,0 +1,183 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of reviewer scores."""
+
+from datetime import datetime
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from srcopsmetrics.entities.pull_request import PullRequest
+from srcopsmetrics.evaluate_scores import (
+    ReviewerScoreIndex,
+    evaluate_scores,
+    get_reviews,
+    prepare_pull_requests,
+    suggest_reviewers,
+)
+
+DAY = 24 * 3600
+START = 1609459200  # 2021-01-01
+
+
+def _pull_request(author: str, created_day: int, reviewer: str):
+    created_at = START + created_day * DAY
+    return {
+        "created_by": author,
+        "created_at": created_at,
+        "closed_at": created_at + DAY,
+        "commits_number": 1,
+        "size": "S",
+        "reviews": {
+            "1": {"author": reviewer, "words_count": 3, "submitted_at": created_at + 3600, "state": "APPROVED"}
+        },
+    }
+
+
+def _reviewed_pull_request(author: str, created_day: int, size: str, commits_number: int, reviews, closed=True):
+    created_at = START + created_day * DAY
+    return {
+        "created_by": author,
+        "created_at": created_at,
+        "closed_at": created_at + 2 * DAY if closed else None,
+        "commits_number": commits_number,
+        "size": size,
+        "reviews": {
+            str(i): {
+                "author": reviewer,
+                "words_count": words,
+                "submitted_at": created_at + hours * 3600,
+                "state": state,
+            }
+            for i, (reviewer, words, hours, state) in enumerate(reviews)
+        },
+    }
+
+
+# Pull requests with reviews by several reviewers, comments before the approval,
+# a review by the author, a pull request of a bot and a pull request still open
+PULL_REQUESTS = {
+    "1": _reviewed_pull_request("alice", 0, "S", 2, [("bob", 5, 2, "COMMENTED"), ("bob", 1, 6, "APPROVED")]),
+    "2": _reviewed_pull_request("bob", 1, "L", 5, [("alice", 12, 3, "APPROVED"), ("carol", 4, 10, "APPROVED")]),
+    "3": _reviewed_pull_request(
+        "carol",
+        2,
+        "M",
+        3,
+        [("alice", 7, 1, "CHANGES_REQUESTED"), ("carol", 2, 2, "COMMENTED"), ("alice", 2, 20, "APPROVED")],
+    ),
+    "4": _reviewed_pull_request("alice", 4, "XL", 8, [("carol", 30, 5, "APPROVED"), ("bob", 3, 8, "APPROVED")]),
+    "5": _reviewed_pull_request("sesheta", 5, "XS", 1, [("alice", 1, 1, "APPROVED")]),
+    "6": _reviewed_pull_request("bob", 6, "M", 4, [("alice", 9, 4, "APPROVED")], closed=False),
+    "7": _reviewed_pull_request("carol", 8, "S", 2, [("bob", 6, 12, "APPROVED")]),
+}
+
+# Scores of the pull requests above evaluated by the former per contributor implementation on 2021-02-01
+EXPECTED_SCORES = {
+    "carol": (0.285714, 1.2, 10.0, 0.2, 0.839813, 15.525528),
+    "alice": (0.285714, 2.571429, 4.454545, 0.4, 0.906040, 11.617729),
+    "bob": (0.285714, 1.125, 1.0, 0.36, 1.0, 6.770714),
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_indexes():
+    """Do not share indexes between the tests."""
+    ReviewerScoreIndex._indexes.clear()
+    yield
+    ReviewerScoreIndex._indexes.clear()
+
+
+def test_empty_index_is_not_stored(save_knowledge):
+    """Test that index of a repository without knowledge is built again once the knowledge exists."""
+    index = ReviewerScoreIndex.get("foo/bar", is_local=True)
+
+    assert index.top_reviewers() == []
+    assert not index.file_path.exists()
+
+    pull_requests = {"1": _pull_request("alice", 0, "bob"), "2": _pull_request("bob", 1, "alice")}
+    save_knowledge(PullRequest, "foo/bar", pull_requests)
+    ReviewerScoreIndex._indexes.clear()
+
+    assert sorted(ReviewerScoreIndex.get("foo/bar", is_local=True).top_reviewers()) == ["alice", "bob"]
+
+
+def test_stored_index_is_loaded(save_knowledge):
+    """Test that stored index ranks the reviewers the same as the index built from knowledge."""
+    pull_requests = {"1": _pull_request("alice", 0, "bob"), "2": _pull_request("bob", 1, "alice")}
+    save_knowledge(PullRequest, "foo/bar", pull_requests)
+    built = ReviewerScoreIndex.get("foo/bar", is_local=True)
+
+    loaded = ReviewerScoreIndex("foo/bar", is_local=True)
+
+    assert loaded.load()
+    assert loaded.top_reviewers(exclude=["alice"]) == built.top_reviewers(exclude=["alice"]) == ["bob"]
+
+
+def test_refresh_folds_new_pull_requests(save_knowledge):
+    """Test that pull requests created after the index was stored are folded in by refresh."""
+    pull_requests = {"1": _pull_request("alice", 0, "bob"), "2": _pull_request("bob", 1, "alice")}
+    save_knowledge(PullRequest, "foo/bar", pull_requests)
+    ReviewerScoreIndex.get("foo/bar", is_local=True)
+
+    pull_requests.update({"3": _pull_request("alice", 2, "carol"), "4": _pull_request("carol", 3, "alice")})
+    save_knowledge(PullRequest, "foo/bar", pull_requests)
+
+    assert suggest_reviewers(["foo/bar"], number_reviewer=3, is_local=True)["foo/bar"][0] == "alice"
+    assert sorted(ReviewerScoreIndex.get("foo/bar", is_local=True).top_reviewers(3)) == ["alice", "bob", "carol"]
+
+
+def test_scores_match_per_contributor_evaluation():
+    """Test that reviewer scores are the same as evaluated contributor by contributor."""
+    data = pd.DataFrame.from_dict(PULL_REQUESTS, orient="index")
+
+    _, _, scores = evaluate_scores("foo/bar", prepare_pull_requests(data), get_reviews(data), START + 31 * DAY)
+
+    assert scores.Contributor.tolist() == list(EXPECTED_SCORES)
+    for contributor, expected in EXPECTED_SCORES.items():
+        row = scores[scores.Contributor == contributor].iloc[0]
+        actual = row[["PRs reviewed score", "MTTR score", "PR length score", "Commits score"]].tolist()
+        actual += [row["Time Last review score"], row["Technical score"]]
+        assert actual == pytest.approx(expected, abs=1e-6)
+        assert row["Issue score"] == row["TTCI score"] == 1.0
+
+
+def test_time_last_review_score_is_evaluated_at_query_time():
+    """Test that ranking of the index follows the time since last review without updating the index."""
+    pull_requests = {
+        "1": _reviewed_pull_request("alice", 0, "S", 1, [("bob", 1, 1, "APPROVED")]),
+        "2": _reviewed_pull_request("bob", 1, "S", 2, [("alice", 1, 1, "APPROVED")]),
+    }
+    data = pd.DataFrame.from_dict(pull_requests, orient="index")
+    index = ReviewerScoreIndex("foo/bar", is_local=True)
+
+    with mock.patch("srcopsmetrics.evaluate_scores.datetime") as now:
+        now.now.return_value = datetime.fromtimestamp(START + DAY + 7200)
+        index.update(data)
+        assert index.top_reviewers(1) == ["alice"]
+
+        later = START + 365 * DAY
+        now.now.return_value = datetime.fromtimestamp(later)
+        assert index.top_reviewers(1) == ["bob"]
+
+    _, _, expected = evaluate_scores("foo/bar", prepare_pull_requests(data), get_reviews(data), later)
+    scores = index.scores_at(later)
+    assert scores.Contributor.tolist() == expected.Contributor.tolist()
+    assert scores["Time Last review score"].tolist() == pytest.approx(expected["Time Last review score"].tolist())
+    assert scores["Technical score"].tolist() == pytest.approx(expected["Technical score"].tolist())
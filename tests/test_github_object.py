@@ -0,0 +1,145 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of memoized access to PyGithub objects."""
+
+from unittest.mock import MagicMock
+
+import pandas as pd
+from github.Issue import Issue as GithubIssue
+from github.PullRequest import PullRequest as GithubPullRequest
+from github.TimelineEvent import TimelineEvent
+
+from srcopsmetrics.entities.issue import Issue
+from srcopsmetrics.entities.tools.github_object import (
+    MemoizedGithubObject,
+    get_lazy_completions,
+    memoize,
+    reset_lazy_completions,
+)
+from srcopsmetrics.entities.tools.knowledge import GitHubKnowledge
+
+
+def _timeline():
+    return [
+        TimelineEvent(
+            MagicMock(),
+            {},
+            {
+                "event": "commented",
+                "created_at": "2021-01-01T00:00:00Z",
+                "user": {"login": "foo"},
+                "body": "looks good to me",
+                "actor": {"login": "foo"},
+            },
+        ),
+        TimelineEvent(
+            MagicMock(),
+            {},
+            {
+                "event": "labeled",
+                "created_at": "2021-01-02T00:00:00Z",
+                "label": {"name": "bug", "color": "red"},
+                "actor": {"login": "bar"},
+            },
+        ),
+    ]
+
+
+def test_memoized_timeline_comments_and_labels():
+    """Test that comments and labels are extracted from memoized timeline events."""
+    timeline = memoize(_timeline())
+
+    assert all(isinstance(event, MemoizedGithubObject) for event in timeline)
+    assert GitHubKnowledge.get_timeline_comments(timeline) == [
+        {"created_at": 1609459200, "created_by": "foo", "body": "looks good to me"}
+    ]
+    assert GitHubKnowledge.get_timeline_labels(timeline) == {
+        "bug": {"color": "red", "labeled_at": 1609545600, "labeler": "bar"}
+    }
+
+
+def test_issue_with_comment_and_label_is_stored(monkeypatch):
+    """Test that issue with commented and labeled timeline is stored."""
+    repository = MagicMock()
+    repository.full_name = "foo/bar"
+    entity = Issue(repository=repository)
+    entity.previous_knowledge = pd.DataFrame()
+    entity.stored_entities = {}
+
+    issue = GithubIssue(
+        MagicMock(),
+        {},
+        {
+            "number": 1,
+            "title": "Foo",
+            "body": "Bar",
+            "user": {"login": "foo"},
+            "created_at": "2021-01-01T00:00:00Z",
+            "closed_by": None,
+            "closed_at": None,
+            "pull_request": None,
+        },
+        completed=True,
+    )
+    monkeypatch.setattr(GithubIssue, "get_timeline", lambda self: _timeline())
+
+    entity.store(issue)
+
+    stored = entity.stored_entities["1"]
+    assert stored["comments_number"] == 1
+    assert stored["interactions"] == {"foo": 4}
+    assert list(stored["labels"]) == ["bug"]
+
+
+def test_method_with_unhashable_arguments_is_not_memoized():
+    """Test that method called with unhashable arguments is called every time."""
+    event = memoize(_timeline()[0])
+    github_object = MagicMock()
+    github_object.get.side_effect = lambda **kwargs: len(kwargs["values"])
+    method = MemoizedGithubObject._memoize_method(github_object.get)
+
+    assert event.raw_data["body"] == "looks good to me"
+    assert method(values=[1, 2]) == 2
+    assert method(values=[1, 2]) == 2
+    assert github_object.get.call_count == 2
+
+
+def test_lazy_completion_is_counted_once():
+    """Test that request completing partially initialized object is counted by the attribute that triggered it."""
+    requester = MagicMock()
+    requester.requestJsonAndCheck.return_value = (
+        {},
+        {"number": 1, "url": "https://api.github.com/repos/foo/bar/pulls/1", "additions": 5, "deletions": 2},
+    )
+    github_object = GithubPullRequest(
+        requester, {}, {"number": 1, "url": "https://api.github.com/repos/foo/bar/pulls/1"}, completed=False
+    )
+    pull_request = memoize(github_object)
+    reset_lazy_completions()
+
+    assert pull_request.number == 1
+    assert get_lazy_completions() == {}
+
+    assert (pull_request.additions, pull_request.deletions) == (5, 2)
+    assert get_lazy_completions() == {"PullRequest.additions": 1}
+    assert requester.requestJsonAndCheck.call_count == 1
+
+    # completion is not counted for other objects of the same class
+    memoize(GithubPullRequest(requester, {}, {"number": 2, "additions": 1}, completed=True)).additions
+    assert get_lazy_completions() == {"PullRequest.additions": 1}
+    reset_lazy_completions()
@@ -0,0 +1,114 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of knowledge analysis."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from github.GithubException import GithubException
+
+from srcopsmetrics.entities.issue import Issue
+from srcopsmetrics.iterator import KnowledgeAnalysis
+
+START = 1609459200  # 2021-01-01
+
+
+def _issue(number: int):
+    return {
+        "id": number,
+        "title": f"Issue {number}",
+        "body": None,
+        "created_by": "foo",
+        "created_at": START + number,
+        "closed_by": None,
+        "closed_at": None,
+        "labels": {},
+        "interactions": {},
+    }
+
+
+@pytest.fixture
+def analysed_issues(knowledge_path, monkeypatch):
+    """Analyse issues given by the test instead of GitHub, the analysis fails once they run out."""
+    issues = []
+
+    class FailingIssues(list):
+        def __iter__(self):
+            yield from super().__iter__()
+            raise GithubException(500, "boom", None)
+
+    def analyse(self):
+        return FailingIssues(issues)
+
+    def store(self, issue):
+        if issue["id"] not in self.previous_knowledge.index:
+            self.stored_entities[str(issue["id"])] = {k: v for k, v in issue.items() if k != "id"}
+
+    monkeypatch.setattr(Issue, "analyse", analyse)
+    monkeypatch.setattr(Issue, "store", store)
+    monkeypatch.setattr("srcopsmetrics.iterator.GithubHandler", MagicMock())
+    return issues
+
+
+def _analysis() -> KnowledgeAnalysis:
+    analysis = KnowledgeAnalysis(Issue(repository_name="foo/bar"), is_local=True, checkpoint_entities=1)
+    analysis.init_previous_knowledge()
+    return analysis
+
+
+def test_interrupted_analysis_is_resumed(analysed_issues):
+    """Test that entities of interrupted analysis are checkpointed and saved by the next analysis."""
+    analysed_issues.extend([_issue(1), _issue(2)])
+    interrupted = _analysis()
+    interrupted.run()
+
+    assert interrupted.checkpoint.exists()
+    assert not Issue(repository_name="foo/bar").file_path.exists()
+
+    analysed_issues.append(_issue(3))
+    resumed = _analysis()
+    assert sorted(resumed.entity.previous_knowledge.index) == [1, 2]
+
+    resumed.run()
+    new_entities = resumed.save_analysed_knowledge()
+
+    assert sorted(new_entities) == ["1", "2", "3"]
+    assert sorted(Issue(repository_name="foo/bar").load_previous_knowledge(is_local=True).index) == [1, 2, 3]
+    assert not resumed.checkpoint.exists()
+
+
+def test_unsaved_knowledge_is_kept_in_checkpoint(analysed_issues, monkeypatch):
+    """Test that entities which could not be saved are not reported as new and are resumed by the next analysis."""
+
+    def from_dict(*args, **kwargs):
+        raise ValueError("boom")
+
+    analysed_issues.extend([_issue(1), _issue(2)])
+    failed = _analysis()
+    failed.run()
+
+    with monkeypatch.context() as patch:
+        patch.setattr("srcopsmetrics.entities.interface.pd.DataFrame.from_dict", from_dict)
+        assert failed.save_analysed_knowledge() == {}
+
+    assert failed.checkpoint.exists()
+    assert not Issue(repository_name="foo/bar").file_path.exists()
+
+    resumed = _analysis()
+    assert sorted(resumed.save_analysed_knowledge()) == ["1", "2"]
+    assert not resumed.checkpoint.exists()
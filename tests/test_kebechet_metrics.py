@@ -0,0 +1,250 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of Kebechet metrics."""
+
+import logging
+from datetime import date
+from pathlib import Path
+
+from srcopsmetrics import kebechet_metrics
+from srcopsmetrics.entities.issue import Issue
+from srcopsmetrics.entities.pull_request import PullRequest
+from srcopsmetrics.entities.tools.storage import KnowledgeStorage
+from srcopsmetrics.kebechet_metrics import (
+    KebechetMetrics,
+    get_daily_metrics_path,
+    get_metrics_manifest_path,
+    load_metrics_manifests,
+    update_metrics_manifest,
+)
+from srcopsmetrics.kebechet_sli_slo_metrics import KebechetSliSloMetrics
+from srcopsmetrics.storage import get_merge_path
+
+DAY = 24 * 3600
+START = 1609459200  # 2021-01-01
+
+
+def _issue(title: str, created_day: int, closed_day: int = None, closed_by: str = None):
+    return {
+        "title": title,
+        "created_by": "sesheta",
+        "created_at": START + created_day * DAY,
+        "closed_at": START + closed_day * DAY if closed_day is not None else None,
+        "closed_by": closed_by,
+        "first_response_at": None,
+    }
+
+
+def _pull_request(title: str, created_day: int, merged_by: str = None, changes: int = 10, labels: list = ()):
+    created_at = START + created_day * DAY
+    return {
+        "title": title,
+        "created_by": "sesheta",
+        "created_at": created_at,
+        "closed_at": created_at + 3600,
+        "closed_by": merged_by or "foo",
+        "merged_at": created_at + 3600 if merged_by else None,
+        "merged_by": merged_by,
+        "labels": list(labels),
+        "first_review_at": None,
+        "first_approve_at": None,
+        "changed_files_changes": {"Pipfile.lock": changes},
+    }
+
+
+def test_version_metrics_count_issues_closed_that_day(save_knowledge):
+    """Test that version issues are completed or rejected on the day they are closed."""
+    save_knowledge(
+        Issue,
+        "foo/bar",
+        {
+            "1": _issue("New patch release", 0, 1, "sesheta"),
+            "2": _issue("New minor release", 0, 1, "foo"),
+            "3": _issue("New major release", 1, 3, "sesheta"),
+            "4": _issue("New patch release", 2),
+            "5": _issue("Fix bug", 2, 2, "sesheta"),
+        },
+    )
+    save_knowledge(PullRequest, "foo/bar", {"1": _pull_request("Fix bug", 0)})
+
+    metrics = KebechetMetrics("foo/bar", is_local=True).get_version_metrics_daily()
+
+    assert metrics.to_dict(orient="index") == {
+        "2021-01-01": {"issues_created": 2, "issues_completed": 0, "issues_rejected": 0},
+        "2021-01-02": {"issues_created": 1, "issues_completed": 1, "issues_rejected": 1},
+        "2021-01-03": {"issues_created": 1, "issues_completed": 0, "issues_rejected": 0},
+        "2021-01-04": {"issues_created": 0, "issues_completed": 1, "issues_rejected": 0},
+    }
+
+
+def _daily(created: int, median_ttm: float):
+    return {
+        "daily": {
+            "created_pull_requests": created,
+            "rejected": 0,
+            "rejected_by_kebechet_bot": 0,
+            "rejected_by_other": 0,
+            "merged": created,
+            "merged_by_kebechet_bot": created,
+            "merged_by_other": 0,
+            "median_ttm": median_ttm,
+        }
+    }
+
+
+def test_merge_includes_metrics_stored_before_manifests(knowledge_path):
+    """Test that daily metrics stored without manifests are found by the first merge."""
+    ks = KnowledgeStorage(is_local=True)
+    ks.save_data(get_daily_metrics_path("foo/bar", "update_manager", "2021-01-01"), _daily(1, 10.0))
+    ks.save_data(get_daily_metrics_path("foo/baz", "update_manager", "2021-01-01"), _daily(2, 30.0))
+    ks.save_data(get_daily_metrics_path("foo/baz", "update_manager", "2021-01-02"), _daily(3, 20.0))
+
+    KebechetMetrics.merge_kebechet_metrics(days=["2021-01-01", "2021-01-02"], is_local=True)
+
+    first = ks.load_data(Path(f"./{get_merge_path()}/overall_kebechet_update_manager_2021-01-01.json"), as_json=True)
+    second = ks.load_data(Path(f"./{get_merge_path()}/overall_kebechet_update_manager_2021-01-02.json"), as_json=True)
+    assert (first["created_pull_requests"], first["median_ttm"]) == (3, 20.0)
+    assert (second["created_pull_requests"], second["median_ttm"]) == (3, 20.0)
+    assert load_metrics_manifests(ks) == {
+        "foo/bar": {"update_manager": ["2021-01-01"]},
+        "foo/baz": {"update_manager": ["2021-01-01", "2021-01-02"]},
+    }
+
+
+def test_manifests_are_rebuilt_once(knowledge_path, monkeypatch):
+    """Test that the merge path is listed only the first time the manifests are loaded."""
+    ks = KnowledgeStorage(is_local=True)
+    rebuilds = []
+    rebuild = kebechet_metrics.rebuild_metrics_manifests
+    monkeypatch.setattr(kebechet_metrics, "rebuild_metrics_manifests", lambda ks: rebuilds.append(rebuild(ks)))
+
+    load_metrics_manifests(ks)
+    update_metrics_manifest(ks, "foo/bar", "update_manager", ["2021-01-01"])
+
+    assert load_metrics_manifests(ks) == {"foo/bar": {"update_manager": ["2021-01-01"]}}
+    assert len(rebuilds) == 1
+
+
+def test_repositories_have_own_manifests(knowledge_path):
+    """Test that recording metrics of a repository does not rewrite manifests of other repositories."""
+    ks = KnowledgeStorage(is_local=True)
+    update_metrics_manifest(ks, "foo/bar", "update_manager", ["2021-01-02"])
+    update_metrics_manifest(ks, "foo/bar", "update_manager", ["2021-01-01", "2021-01-02"])
+    update_metrics_manifest(ks, "foo/baz", "update_manager", ["2021-01-03"])
+
+    assert ks.load_data(get_metrics_manifest_path("foo/bar"), as_json=True) == {
+        "update_manager": ["2021-01-01", "2021-01-02"]
+    }
+    assert ks.load_data(get_metrics_manifest_path("foo/baz"), as_json=True) == {"update_manager": ["2021-01-03"]}
+
+
+def test_merge_reports_days_without_metrics(knowledge_path, caplog):
+    """Test that days without metrics of any repository are merged as zeros and reported."""
+    ks = KnowledgeStorage(is_local=True)
+    ks.save_data(get_daily_metrics_path("foo/bar", "update_manager", "2021-01-01"), _daily(1, 10.0))
+
+    with caplog.at_level(logging.WARNING):
+        KebechetMetrics.merge_kebechet_metrics(days=["2021-01-01", "2021-01-02"], is_local=True)
+
+    missing = ks.load_data(Path(f"./{get_merge_path()}/overall_kebechet_update_manager_2021-01-02.json"), as_json=True)
+    assert missing["created_pull_requests"] == 0
+    assert missing["median_ttm"] is None
+    assert "2021-01-02" in caplog.text
+
+
+def test_sli_slo_share_of_all_changes_by_bot(save_knowledge):
+    """Test that the overall share of changes by bot is computed over all changes of unique repositories."""
+    for repository, by_bot, by_human in [("foo/bar", 90, 10), ("foo/baz", 10, 90)]:
+        save_knowledge(
+            PullRequest,
+            repository,
+            {
+                "1": _pull_request("Automatic update of dependency foo", 0, "sesheta", by_bot, ["bot"]),
+                "2": _pull_request("Fix bug", 0, "foo", by_human),
+            },
+        )
+        save_knowledge(Issue, repository, {"1": _issue("Fix bug", 0)})
+
+    metrics = KebechetSliSloMetrics(["foo/bar", "foo/baz", "foo/bar"], is_local=True)
+    overall, per_repository = metrics._get_sli_slo_for_all_managers()
+
+    assert overall["overall_repositories"] == 2
+    assert overall["update"]["total_source_code_lines_changed_by_bot"] == 100
+    assert overall["update"]["percent_source_code_changes_by_bot"] == 0.5
+    assert per_repository["foo/bar"]["update"]["percent_by_bot"] == 0.9
+    assert per_repository["foo/baz"]["update"]["percent_by_bot"] == 0.1
+
+
+def test_update_manager_daily_metrics_are_backfilled_and_merged(save_knowledge):
+    """Test that metrics of every day in the range are stored and merged for all of the days at once."""
+    update = "Automatic update of dependency foo"
+    save_knowledge(
+        PullRequest,
+        "foo/bar",
+        {
+            "1": _pull_request(update, 0, "sesheta", labels=["bot"]),
+            "2": _pull_request(update, 0, labels=["bot"]),
+            "3": _pull_request(update, 1, "foo", labels=["bot"]),
+            "4": _pull_request(update, 3, "sesheta", labels=["bot"]),
+        },
+    )
+    save_knowledge(PullRequest, "foo/baz", {"1": _pull_request(update, 1, "sesheta", labels=["bot"])})
+
+    for repository in ["foo/bar", "foo/baz"]:
+        KebechetMetrics(repository, is_local=True).update_manager_daily_metrics(
+            since=date(2021, 1, 1), until=date(2021, 1, 3)
+        )
+
+    ks = KnowledgeStorage(is_local=True)
+    first = ks.load_data(get_daily_metrics_path("foo/bar", "update_manager", "2021-01-01"), as_json=True)["daily"]
+    assert (first["created_pull_requests"], first["merged_by_kebechet_bot"], first["rejected"]) == (2, 1, 1)
+    # days without update pull requests and days out of the range are not stored
+    assert not get_daily_metrics_path("foo/bar", "update_manager", "2021-01-03").exists()
+    assert not get_daily_metrics_path("foo/bar", "update_manager", "2021-01-04").exists()
+
+    days = [date(2021, 1, 1), date(2021, 1, 2), date(2021, 1, 3)]
+    KebechetMetrics.merge_kebechet_metrics(days=days, is_local=True)
+
+    overall = {
+        day: ks.load_data(Path(f"./{get_merge_path()}/overall_kebechet_update_manager_{day}.json"), as_json=True)
+        for day in days
+    }
+    assert [stats["created_pull_requests"] for stats in overall.values()] == [2, 2, 0]
+    assert [stats["merged_by_kebechet_bot"] for stats in overall.values()] == [1, 1, 0]
+    assert [stats["merged_by_other"] for stats in overall.values()] == [0, 1, 0]
+    assert [stats["median_ttm"] for stats in overall.values()] == [3600.0, 3600.0, None]
+
+
+def test_usage_timestamps_of_all_managers(save_knowledge):
+    """Test that every Kebechet request is one usage row, repositories without the requests have no rows."""
+    save_knowledge(PullRequest, "foo/bar", {"1": _pull_request("Fix bug", 0)})
+    save_knowledge(
+        Issue,
+        "foo/bar",
+        {"1": _issue("New patch release", 1), "2": _issue("Kebechet update", 2), "3": _issue("Fix bug", 3)},
+    )
+    save_knowledge(Issue, "foo/baz", {"1": _issue("Fix bug", 0)})
+
+    usage = KebechetSliSloMetrics(["foo/bar", "foo/baz"], is_local=True)._get_usage_counts_for_all_managers()
+
+    assert list(usage.columns) == ["repository_name", "manager_name", "timestamp"]
+    assert sorted(usage.itertuples(index=False, name=None), key=lambda row: row[2]) == [
+        ("foo/bar", "advise", START),
+        ("foo/bar", "version", START + DAY),
+        ("foo/bar", "update", START + 2 * DAY),
+    ]
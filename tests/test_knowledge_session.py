@@ -0,0 +1,61 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of knowledge session."""
+
+from srcopsmetrics.entities.issue import Issue
+from srcopsmetrics.knowledge_session import KnowledgeSession
+
+
+def test_memoize_computes_value_once():
+    """Test that memoized value is computed only once per repository and key."""
+    session = KnowledgeSession(is_local=True)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert session.memoize("foo/bar", "key", compute) == 1
+    assert session.memoize("foo/bar", "key", compute) == 1
+    assert session.memoize("foo/baz", "key", compute) == 2
+
+
+def test_least_recently_used_repository_is_evicted():
+    """Test that only the most recently used repositories are kept."""
+    session = KnowledgeSession(is_local=True, max_repositories=2)
+    for repository in ("a", "b", "a", "c"):
+        session.memoize(repository, "key", lambda: repository)
+
+    assert session.memoize("a", "key", lambda: "recomputed") == "a"
+    assert session.memoize("b", "key", lambda: "recomputed") == "recomputed"
+
+    session.clear()
+    assert session.memoize("a", "key", lambda: "recomputed") == "recomputed"
+
+
+def test_knowledge_is_loaded_once(knowledge_path, monkeypatch):
+    """Test that knowledge of entity is loaded once per session."""
+    loads = []
+    monkeypatch.setattr(Issue, "load_previous_knowledge", lambda self, **kwargs: loads.append(kwargs) or loads)
+    session = KnowledgeSession(is_local=True)
+
+    session.load_knowledge(Issue, "foo/bar")
+    session.load_knowledge(Issue, "foo/bar")
+    session.load_knowledge(Issue, "foo/bar", since="2021-01-01")
+
+    assert loads == [{"is_local": True, "since": None}, {"is_local": True, "since": "2021-01-01"}]
@@ -0,0 +1,158 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of incremental processing of knowledge."""
+
+import json
+
+import pytest
+
+from srcopsmetrics.entities.issue import Issue
+from srcopsmetrics.entities.pull_request import PullRequest
+from srcopsmetrics.entities.tools import serialization
+from srcopsmetrics.processing import ContributorInteractions, Processing
+
+START = 1609459200  # 2021-01-01
+
+VIEWS = [
+    "process_issues_creators",
+    "process_issues_closers",
+    "process_issue_interactions",
+    "process_issue_labels_to_issue_closers",
+    "process_issue_labels_to_issue_creators",
+]
+
+
+def _issue(created_by: str, closed_by: str = None, labels: tuple = (), interactions: dict = None):
+    return {
+        "created_by": created_by,
+        "created_at": START,
+        "closed_by": closed_by,
+        "closed_at": START + 3600 if closed_by else None,
+        "labels": list(labels),
+        "interactions": interactions or {},
+    }
+
+
+def _pull_request(created_by: str, merged: bool, referenced_issues: tuple = ()):
+    return {
+        "created_by": created_by,
+        "created_at": START,
+        "merged_at": START + 3600 if merged else None,
+        "referenced_issues": list(referenced_issues),
+    }
+
+
+def _process(view: str, issues: dict, pull_requests: dict):
+    processed = Processing.__dict__[view].func(Processing(issues=issues, pull_requests=pull_requests))
+    return serialization.loads(serialization.dumps(processed))
+
+
+def _stored(view: str):
+    return getattr(Processing(issues={}, pull_requests={}), view)()
+
+
+@pytest.fixture
+def project(knowledge_path, monkeypatch):
+    """Process knowledge of a project."""
+    monkeypatch.setenv("PROJECT", "foo/bar")
+    monkeypatch.delenv("PROCESS_KNOWLEDGE", raising=False)
+    return "foo/bar"
+
+
+def test_update_generates_views_from_stored_knowledge(project, save_knowledge):
+    """Test that views not processed before are generated from all of the stored knowledge, not the new entities."""
+    issues = {
+        "1": _issue("alice", "bob", ["bug"], {"bob": 3}),
+        "2": _issue("bob", labels=["question"], interactions={"alice": 2}),
+        "3": _issue("carol", "alice", ["bug"]),
+    }
+    pull_requests = {"1": _pull_request("bob", True, ["1"]), "2": _pull_request("carol", False, ["2"])}
+    save_knowledge(Issue, project, issues)
+    save_knowledge(PullRequest, project, pull_requests)
+
+    Processing(issues={"3": issues["3"]}, pull_requests={"2": pull_requests["2"]}).update()
+
+    for view in VIEWS:
+        assert _stored(view) == _process(view, issues, pull_requests), view
+
+
+def test_update_folds_new_entities(project, save_knowledge):
+    """Test that views processed before are updated the same as if they were processed from all of the knowledge."""
+    issues = {"1": _issue("alice", "bob", ["bug"], {"bob": 3})}
+    pull_requests = {"1": _pull_request("bob", True, ["1"])}
+    save_knowledge(Issue, project, issues)
+    save_knowledge(PullRequest, project, pull_requests)
+    Processing(issues=issues, pull_requests=pull_requests).update()
+
+    new_issues = {"2": _issue("bob", "alice", ["bug", "question"], {"alice": 2, "carol": 1})}
+    new_pull_requests = {"2": _pull_request("alice", True, ["2"])}
+    issues.update(new_issues)
+    pull_requests.update(new_pull_requests)
+    save_knowledge(Issue, project, issues)
+    save_knowledge(PullRequest, project, pull_requests)
+    Processing(issues=new_issues, pull_requests=new_pull_requests).update()
+
+    for view in VIEWS:
+        assert _stored(view) == _process(view, issues, pull_requests), view
+
+
+def test_contributor_interactions_round_trip():
+    """Test that only non-zero interactions of known contributors are kept and serialized."""
+    interactions = ContributorInteractions(["alice", "bob", "carol", "bob"])
+    interactions.add("alice", "bob", 3)
+    interactions.add("alice", "bob", 2)
+    interactions.add("bob", "carol", 1)
+    interactions.add("carol", "sesheta", 4)
+
+    data = json.loads(json.dumps(interactions.to_dict()))
+    loaded = ContributorInteractions.from_dict(data)
+
+    assert data["contributors"] == loaded.contributors == ["alice", "bob", "carol"]
+    assert interactions.nnz() == loaded.nnz() == 2
+    assert loaded["alice"] == {"bob": 5}
+    assert loaded["carol"] == {}
+    with pytest.raises(KeyError):
+        loaded["sesheta"]
+
+
+def test_contributors_data_interactions():
+    """Test that interactions of reviewers are sparse and the matrix does not collide with contributor logins."""
+    review = {"author": "bob", "words_count": 3, "submitted_at": START + 3600, "state": "APPROVED"}
+    pull_requests = {
+        "1": {
+            "created_by": "interactions",
+            "created_at": START,
+            "size": "S",
+            "reviews": {"1": review},
+            "interactions": {"bob": 3, "sesheta": 1},
+        },
+        "2": {
+            "created_by": "bob",
+            "created_at": START,
+            "size": "S",
+            "reviews": {"1": dict(review, author="interactions")},
+            "interactions": {"interactions": 2},
+        },
+    }
+
+    data = Processing(issues={}, pull_requests=pull_requests).process_contributors_data(["interactions", "bob"])
+
+    assert data["bob"]["interactions"] == {"interactions": 2}
+    assert data["interactions"]["interactions"] == {"bob": 3}
+    loaded = ContributorInteractions.from_dict(json.loads(json.dumps(data["contributors_interactions"])))
+    assert loaded.nnz() == 2
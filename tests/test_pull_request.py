@@ -0,0 +1,119 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of pull request knowledge."""
+
+import pandas as pd
+
+from srcopsmetrics.entities.pull_request import PullRequest, get_pull_request_files
+from srcopsmetrics.kebechet_metrics import KebechetMetrics
+
+START = 1609459200  # 2021-01-01
+
+
+def _pull_request(changes: dict):
+    return {
+        "title": "Foo",
+        "body": None,
+        "size": "S",
+        "labels": [],
+        "created_by": "foo",
+        "created_at": START,
+        "closed_at": None,
+        "closed_by": None,
+        "merged_at": None,
+        "merged_by": None,
+        "commits_number": 1,
+        "changed_files": list(changes),
+        "changed_files_number": len(changes),
+        "changed_files_changes": changes,
+        "interactions": {},
+        "reviews": {},
+        "commits": [],
+        "files": list(changes),
+        "first_review_at": None,
+        "first_approve_at": None,
+    }
+
+
+def _save(entities: dict) -> PullRequest:
+    entity = PullRequest(repository_name="foo/bar")
+    entity.previous_knowledge = entity.load_previous_knowledge(is_local=True)
+    entity.stored_entities = entities
+    entity.save_knowledge(is_local=True)
+    return entity
+
+
+def _files(entity: PullRequest) -> set:
+    return set(entity.load_files(is_local=True).itertuples(index=False, name=None))
+
+
+def test_get_pull_request_files():
+    """Test that every file changed by a pull request is one row of the table."""
+    pull_requests = pd.DataFrame.from_dict(
+        {1: {"changed_files_changes": {"Pipfile": 1, "Pipfile.lock": 10}}, 2: {"changed_files_changes": {}}},
+        orient="index",
+    )
+
+    assert get_pull_request_files(pull_requests).values.tolist() == [[1, "Pipfile", 1], [1, "Pipfile.lock", 10]]
+    assert get_pull_request_files(None).empty
+
+
+def test_files_table_round_trip(save_knowledge):
+    """Test that files of pull requests collected before the table existed are added to it with the new ones."""
+    save_knowledge(PullRequest, "foo/bar", {"1": _pull_request({"Pipfile.lock": 10})})
+    entity = PullRequest(repository_name="foo/bar")
+
+    # table is derived from the knowledge until it is stored
+    assert _files(entity) == {(1, "Pipfile.lock", 10)}
+
+    _save({"2": _pull_request({"Pipfile.lock": 5, "README.md": 1})})
+    assert entity.files_path.exists()
+    assert _files(entity) == {(1, "Pipfile.lock", 10), (2, "Pipfile.lock", 5), (2, "README.md", 1)}
+
+    _save({"2": _pull_request({"Pipfile.lock": 7})})
+    assert _files(entity) == {(1, "Pipfile.lock", 10), (2, "Pipfile.lock", 7)}
+
+
+def test_files_table_is_not_saved_without_knowledge(knowledge_path, monkeypatch):
+    """Test that the table of files does not get ahead of knowledge which could not be saved."""
+
+    def from_dict(*args, **kwargs):
+        raise ValueError("boom")
+
+    monkeypatch.setattr("srcopsmetrics.entities.interface.pd.DataFrame.from_dict", from_dict)
+    entity = _save({"1": _pull_request({"Pipfile.lock": 10})})
+
+    assert not entity.file_path.exists()
+    assert not entity.files_path.exists()
+
+
+def test_file_changes(save_knowledge):
+    """Test that changes of a single file are selected for every pull request that changed it."""
+    save_knowledge(
+        PullRequest,
+        "foo/bar",
+        {
+            "1": _pull_request({"Pipfile.lock": 10, "Pipfile": 1}),
+            "2": _pull_request({"README.md": 3}),
+            "3": _pull_request({"Pipfile.lock": 5}),
+        },
+    )
+
+    changes = KebechetMetrics("foo/bar", is_local=True).get_file_changes("Pipfile.lock")
+
+    assert changes.to_dict() == {1: 10, 3: 5}
@@ -0,0 +1,96 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of Release entity."""
+
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from srcopsmetrics.entities import release as release_module
+from srcopsmetrics.entities.release import Release
+
+
+def _tag(name: str, sha: str, pull_requests=()):
+    tag = MagicMock()
+    tag.name = name
+    tag.commit.sha = sha
+    tag.commit.get_pulls.return_value = list(pull_requests)
+    return tag
+
+
+def _pull_request(merge_commit_sha: str):
+    pull_request = MagicMock()
+    pull_request.merge_commit_sha = merge_commit_sha
+    pull_request.merged_at = 1
+    return pull_request
+
+
+def _release(tags, pull_requests=()):
+    repository = MagicMock()
+    repository.full_name = "foo/bar"
+    repository.get_releases.return_value = []
+    repository.get_tags.return_value = tags
+    repository.get_pulls.return_value = list(pull_requests)
+
+    entity = Release(repository=repository)
+    entity.previous_knowledge = pd.DataFrame()
+    return entity
+
+
+def test_few_tags_are_looked_up_per_commit():
+    """Test that closed pull requests are not listed for a few tags."""
+    pull_request = _pull_request("other")
+    tag = _tag("v1.0.0", "a", [pull_request])
+    entity = _release([tag])
+
+    entity.analyse()
+
+    assert entity.get_commit_pull_request(tag.commit) is pull_request
+    entity.repository.get_pulls.assert_not_called()
+
+
+def test_many_tags_stop_listing_once_resolved(monkeypatch):
+    """Test that listing of closed pull requests stops at the tagged commit."""
+    monkeypatch.setattr(release_module, "BULK_LOOKUP_MIN_TAGS", 2)
+    tags = [_tag("v1.0.0", "a"), _tag("v2.0.0", "b")]
+    listed = []
+
+    def get_pulls(state):
+        for pull_request in [_pull_request("b"), _pull_request("a"), _pull_request("c")]:
+            listed.append(pull_request.merge_commit_sha)
+            yield pull_request
+
+    entity = _release(tags)
+    entity.repository.get_pulls.side_effect = get_pulls
+    entity.analyse()
+
+    assert entity.get_commit_pull_request(tags[1].commit).merge_commit_sha == "b"
+    assert entity.get_commit_pull_request(tags[0].commit).merge_commit_sha == "a"
+    assert listed == ["b", "a"]
+    tags[0].commit.get_pulls.assert_not_called()
+
+
+def test_not_merge_commit_falls_back_to_commit_pull_requests(monkeypatch):
+    """Test that a tag not matching any merge commit is looked up by its commit."""
+    monkeypatch.setattr(release_module, "BULK_LOOKUP_MIN_TAGS", 1)
+    pull_request = _pull_request("rebased")
+    tag = _tag("v1.0.0", "a", [pull_request])
+    entity = _release([tag], [_pull_request("c")])
+    entity.analyse()
+
+    assert entity.get_commit_pull_request(tag.commit) is pull_request
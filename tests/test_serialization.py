@@ -0,0 +1,59 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of json serialization."""
+
+import json
+import os
+
+import pytest
+
+from srcopsmetrics.entities.tools import serialization
+from srcopsmetrics.enums import JsonBackendEnum
+
+
+@pytest.mark.parametrize("backend", [JsonBackendEnum.JSON, JsonBackendEnum.ORJSON])
+def test_loads_dumps_round_trip(monkeypatch, backend):
+    """Test that documents are decoded the same way by any backend."""
+    monkeypatch.setenv("MI_JSON_BACKEND", backend.value)
+    document = {"partitions": ["2021-01"], "median_ttm": None, "count": 3, "ratio": 0.5}
+
+    assert serialization.loads(serialization.dumps(document)) == document
+    assert serialization.dumps(document) == json.dumps(document)
+
+
+def test_orjson_falls_back_to_json(monkeypatch):
+    """Test that json is used if orjson is not installed."""
+    monkeypatch.setenv("MI_JSON_BACKEND", JsonBackendEnum.ORJSON.value)
+    monkeypatch.setattr(serialization, "orjson", None)
+
+    assert serialization.get_json_backend() == JsonBackendEnum.JSON
+    assert serialization.loads('{"value": NaN}')["value"] != 0
+
+
+def test_json_backend_is_restored(monkeypatch):
+    """Test that codec set for a block of code is reset to the previous one."""
+    monkeypatch.setenv("MI_JSON_BACKEND", JsonBackendEnum.JSON.value)
+    with serialization.use_json_backend(JsonBackendEnum.ORJSON):
+        assert os.environ["MI_JSON_BACKEND"] == JsonBackendEnum.ORJSON.value
+    assert os.environ["MI_JSON_BACKEND"] == JsonBackendEnum.JSON.value
+
+    monkeypatch.delenv("MI_JSON_BACKEND")
+    with pytest.raises(ValueError):
+        with serialization.use_json_backend(JsonBackendEnum.ORJSON):
+            raise ValueError("boom")
+    assert "MI_JSON_BACKEND" not in os.environ
@@ -0,0 +1,167 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of knowledge storage."""
+
+import pandas as pd
+
+from srcopsmetrics.entities.issue import Issue
+from srcopsmetrics.entities.tools.storage import KnowledgeCheckpoint, StoredEntities, repair_timestamps
+
+DAY = 24 * 3600
+
+
+def _issue(created_at: int):
+    return {
+        "title": "Foo",
+        "body": "Bar",
+        "created_by": "foo",
+        "created_at": created_at,
+        "closed_by": None,
+        "closed_at": None,
+        "labels": {},
+        "interactions": {},
+        "commenters_number": 0,
+        "comments_number": 0,
+        "comments": [],
+        "cross_references": [],
+        "cross_references_number": 0,
+    }
+
+
+def _save_issues(ids, partitioned: bool, monkeypatch):
+    monkeypatch.setenv("MI_PARTITION_KNOWLEDGE", str(partitioned))
+    entity = Issue(repository_name="foo/bar")
+    entity.previous_knowledge = entity.load_previous_knowledge(is_local=True)
+    entity.stored_entities = {str(i): _issue(1700000000 + i * DAY) for i in ids}
+    entity.save_knowledge(is_local=True)
+
+
+def test_stored_entities_spill_records(tmp_path):
+    """Test that records spilled in batches are all read back."""
+    stored = StoredEntities(tmp_path / "Issue.jsonl.gz", batch_size=2)
+    for i in range(5):
+        stored[str(i)] = {"title": f"issue {i}", "created_at": i}
+
+    assert len(stored) == 5
+    assert stored["0"] == {"title": "issue 0", "created_at": 0}
+    assert "4" in stored and "5" not in stored
+    assert stored.to_dict() == {str(i): {"title": f"issue {i}", "created_at": i} for i in range(5)}
+
+
+def test_stored_entities_spill_scalars(tmp_path):
+    """Test that entities which are not records (e.g. fork timestamps) are spilled."""
+    stored = StoredEntities(tmp_path / "Fork.jsonl.gz", batch_size=1)
+    stored["foo"] = 1609459200
+    stored["bar"] = 1609545600
+
+    assert stored.flush() == 1
+    assert stored.to_dict() == {"foo": 1609459200, "bar": 1609545600}
+
+
+def test_stored_entities_adopt_spill_file(tmp_path):
+    """Test that entities spilled by interrupted analysis are adopted."""
+    stored = StoredEntities(tmp_path / "Issue.jsonl.gz")
+    stored["1"] = {"title": "foo"}
+    stored.flush()
+
+    resumed = StoredEntities(tmp_path / "Issue.jsonl.gz")
+    assert list(resumed) == ["1"]
+
+    resumed.clear()
+    assert len(resumed) == 0
+    assert not (tmp_path / "Issue.jsonl.gz").exists()
+
+
+def test_checkpoint_load(knowledge_path):
+    """Test that checkpointed entities are loaded as knowledge indexed by id."""
+    checkpoint = KnowledgeCheckpoint("Issue", "foo/bar")
+    stored = checkpoint.get_stored_entities(batch_size=1)
+    stored["1"] = {"title": "foo"}
+    stored["2"] = {"title": "bar"}
+    stored["1"] = {"title": "baz"}
+    stored.flush()
+
+    df = checkpoint.load()
+    assert sorted(df.index) == [1, 2]
+    assert df.loc[1, "title"] == "baz"
+
+    checkpoint.remove()
+    assert not checkpoint.exists()
+
+
+def test_mixed_timestamp_units_are_repaired_by_compaction(knowledge_path):
+    """Test that timestamps in seconds saved next to timestamps in milliseconds are repaired by compaction."""
+    entity = Issue(repository_name="foo/bar")
+    entity.file_path.write_text(
+        '{"created_at":1700000000,"id":1}\n{"created_at":1700000000000,"id":2}\n{"created_at":null,"id":3}\n'
+    )
+
+    entity.compact_knowledge(is_local=True)
+    df = entity.load_previous_knowledge(is_local=True)
+
+    assert df.loc[1, "created_at"] == pd.Timestamp("2023-11-14 22:13:20")
+    assert df.loc[2, "created_at"] == pd.Timestamp("2023-11-14 22:13:20")
+    assert pd.isna(df.loc[3, "created_at"])
+
+
+def test_only_given_date_columns_are_repaired():
+    """Test that dates of columns which are not dates of the entity are left as loaded."""
+    df = pd.DataFrame({"created_at": pd.to_datetime([1700000], unit="ms"), "other_at": pd.to_datetime([1], unit="s")})
+
+    repair_timestamps(df, ["created_at", "closed_at"])
+
+    assert df.loc[0, "created_at"] == pd.Timestamp("1970-01-20 16:13:20")
+    assert df.loc[0, "other_at"] == pd.Timestamp("1970-01-01 00:00:01")
+
+
+def test_saved_knowledge_keeps_date_window(knowledge_path, monkeypatch):
+    """Test that entities saved next to previous knowledge are loaded by their date."""
+    _save_issues(range(0, 10), partitioned=False, monkeypatch=monkeypatch)
+    _save_issues(range(10, 20), partitioned=False, monkeypatch=monkeypatch)
+
+    entity = Issue(repository_name="foo/bar")
+    df = entity.load_previous_knowledge(is_local=True, since="2023-11-25")
+
+    assert sorted(df.index) == list(range(11, 20))
+
+
+def test_knowledge_layout_follows_partitioning(knowledge_path, monkeypatch):
+    """Test that knowledge is loaded from the layout it is saved to."""
+    _save_issues(range(0, 40), partitioned=True, monkeypatch=monkeypatch)
+    entity = Issue(repository_name="foo/bar")
+    assert entity.partitions_path.exists() and not entity.file_path.exists()
+
+    # partitions are loaded until the knowledge is saved as a single file
+    _save_issues(range(40, 50), partitioned=False, monkeypatch=monkeypatch)
+    assert entity.file_path.exists()
+    assert sorted(entity.load_previous_knowledge(is_local=True).index) == list(range(50))
+
+    _save_issues(range(50, 60), partitioned=False, monkeypatch=monkeypatch)
+    assert sorted(entity.load_previous_knowledge(is_local=True).index) == list(range(60))
+    assert sorted(entity.load_previous_knowledge(is_local=True, since="2023-12-30").index) == list(range(46, 60))
+
+
+def test_partitioned_save_removes_single_file(knowledge_path, monkeypatch):
+    """Test that knowledge saved as a single file is not loaded again once it is saved partitioned."""
+    _save_issues(range(0, 10), partitioned=False, monkeypatch=monkeypatch)
+    _save_issues(range(10, 20), partitioned=True, monkeypatch=monkeypatch)
+    entity = Issue(repository_name="foo/bar")
+    assert not entity.file_path.exists()
+
+    _save_issues(range(20, 30), partitioned=False, monkeypatch=monkeypatch)
+    assert sorted(entity.load_previous_knowledge(is_local=True).index) == list(range(30))
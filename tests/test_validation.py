@@ -0,0 +1,85 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of compiled entity schema validation."""
+
+import pytest
+from voluptuous.error import MultipleInvalid
+from voluptuous.schema_builder import Schema
+from voluptuous.validators import Any
+
+from srcopsmetrics.entities.issue import Issue
+from srcopsmetrics.entities.pull_request import PullRequest
+from srcopsmetrics.entities.tools.validation import compile_schema, validate_entities
+from srcopsmetrics.enums import ValidationModeEnum
+
+SCHEMA = Schema(
+    {
+        "title": str,
+        "closed_at": Any(None, int),
+        "labels": {str: {"color": str}},
+        "comments": [{"body": str}],
+    }
+)
+
+
+@pytest.mark.parametrize(
+    "value,valid",
+    [
+        ({"title": "foo", "closed_at": None, "labels": {}, "comments": []}, True),
+        ({"title": "foo", "closed_at": 1, "labels": {"bug": {"color": "red"}}, "comments": [{"body": "x"}]}, True),
+        ({"title": 1, "closed_at": None, "labels": {}, "comments": []}, False),
+        ({"title": "foo", "closed_at": "1", "labels": {}, "comments": []}, False),
+        ({"title": "foo", "closed_at": None, "labels": {"bug": {"color": 1}}, "comments": []}, False),
+        ({"title": "foo", "closed_at": None, "labels": {}, "comments": [{"body": None}]}, False),
+        ({"title": "foo", "unknown": 1}, False),
+    ],
+)
+def test_compiled_schema_agrees_with_voluptuous(value, valid):
+    """Test that compiled schema accepts exactly the values accepted by voluptuous."""
+    try:
+        SCHEMA(value)
+        expected = True
+    except MultipleInvalid:
+        expected = False
+
+    assert expected == valid
+    assert compile_schema(SCHEMA)(value) == valid
+
+
+@pytest.mark.parametrize("entity", [Issue, PullRequest])
+def test_entity_schemas_are_compiled(entity):
+    """Test that entity schemas are compiled, accept an empty entity and reject invalid values like voluptuous."""
+    check = compile_schema(entity.entity_schema)
+    # keys of entity schemas are not required
+    entity.entity_schema({})
+    assert check({}) is True
+
+    with pytest.raises(MultipleInvalid):
+        entity.entity_schema({"created_at": "yesterday"})
+    assert check({"created_at": "yesterday"}) is False
+
+
+def test_validate_entities_modes():
+    """Test that invalid entities raise unless validation is skipped."""
+    entities = {"1": {"title": 1, "closed_at": None, "labels": {}, "comments": []}}
+
+    with pytest.raises(MultipleInvalid):
+        validate_entities(SCHEMA, entities, mode=ValidationModeEnum.FULL)
+    with pytest.raises(MultipleInvalid):
+        validate_entities(SCHEMA, entities, mode=ValidationModeEnum.SAMPLE)
+    validate_entities(SCHEMA, entities, mode=ValidationModeEnum.SKIP)